@@ -0,0 +1,162 @@
+import mmap
+import os
+import struct
+from array import array
+
+from lightup.grille_compacte import AMPOULE, GrilleCompacte
+
+# Format d'une archive:
+#   en-tête        signature, version
+#   enregistrements  H, L, drapeaux, puis H * L octets de GrilleCompacte et, si
+#                  la solution est présente, un bit par case (ampoules)
+#   index          un décalage (8 octets) par grille, dans l'ordre des numéros
+#   fin            nombre de grilles, position de l'index, signature
+SIGNATURE = b'LUPK'
+VERSION = 1
+ENTETE = struct.Struct('<4sH10x')
+ENREGISTREMENT = struct.Struct('<IIB3x')
+FIN = struct.Struct('<QQ4s')
+DECALAGE = struct.Struct('<Q')
+AVEC_SOLUTION = 1
+
+# Positions des bits à 1 de chaque octet, pour décoder les solutions sans boucle par case
+BITS = [tuple(b for b in range(8) if octet >> b & 1) for octet in range(256)]
+
+def _lire_fin(octets, nom_fichier):
+    """(nombre de grilles, position de l'index, position après la fin) de la dernière fermeture.
+
+    Si l'écriture suivante a été interrompue, les enregistrements qu'elle a
+    ajoutés après cette fin n'ont pas d'index: ils sont ignorés.
+    """
+    if len(octets) < ENTETE.size + FIN.size:
+        raise ValueError(f"Archive '{nom_fichier}' trop courte")
+    signature, version = ENTETE.unpack_from(octets)
+    if signature != SIGNATURE:
+        raise ValueError(f"'{nom_fichier}' n'est pas une archive de grilles")
+    if version != VERSION:
+        raise ValueError(f"Version d'archive non supportée: {version}")
+    trouvee = _chercher_fin(octets, len(octets))
+    if trouvee is None:
+        raise ValueError(f"'{nom_fichier}' n'est pas une archive de grilles complète")
+    return trouvee
+
+def _chercher_fin(octets, limite):
+    """Dernière fin cohérente (signature, index juste avant elle) qui se termine avant limite, ou None"""
+    while True:
+        k = octets.rfind(SIGNATURE, ENTETE.size, limite)
+        if k < 0:
+            return None
+        fin = k + len(SIGNATURE)
+        if fin >= ENTETE.size + FIN.size:
+            nombre, position_index, _ = FIN.unpack_from(octets, fin - FIN.size)
+            if ENTETE.size <= position_index and position_index + DECALAGE.size * nombre + FIN.size == fin:
+                return nombre, position_index, fin
+        limite = fin - 1
+
+class EcrivainArchive:
+    """Ajoute des grilles (et leur solution) à la fin d'une archive.
+
+    Les décalages sont gardés en mémoire (8 octets par grille). Une archive
+    existante n'est pas modifiée avant fermer: les nouveaux enregistrements
+    suivent son ancienne fin, puis fermer écrit l'index complet et la
+    nouvelle fin (l'ancien index reste dans le fichier, 8 octets par grille
+    à chaque réouverture). Si l'écriture est interrompue, l'archive se relit
+    telle qu'à sa dernière fermeture.
+    """
+
+    def __init__(self, nom_fichier):
+        self.nom_fichier = nom_fichier
+        self.decalages = array('Q')
+        if os.path.exists(nom_fichier) and os.path.getsize(nom_fichier) > 0:
+            self.fichier = open(nom_fichier, 'r+b')
+            with mmap.mmap(self.fichier.fileno(), 0, access=mmap.ACCESS_READ) as projection:
+                nombre, position_index, fin = _lire_fin(projection, nom_fichier)
+                self.decalages.frombytes(projection[position_index:position_index + DECALAGE.size * nombre])
+            # Enregistrements d'une écriture interrompue (sans index) après la dernière fin
+            self.fichier.truncate(fin)
+            self.fichier.seek(fin)
+        else:
+            self.fichier = open(nom_fichier, 'wb')
+            self.fichier.write(ENTETE.pack(SIGNATURE, VERSION))
+
+    def ajouter(self, grille, ampoules=None):
+        """Ajoute une grille (texte ou GrilleCompacte) et les cases de ses ampoules; retourne son numéro"""
+        if not isinstance(grille, GrilleCompacte):
+            grille = GrilleCompacte.depuis_liste(grille)
+        self.decalages.append(self.fichier.tell())
+        self.fichier.write(ENREGISTREMENT.pack(grille.H, grille.L, 0 if ampoules is None else AVEC_SOLUTION))
+        self.fichier.write(grille.cases)
+        if ampoules is not None:
+            bits = bytearray((grille.H * grille.L + 7) // 8)
+            for c in ampoules:
+                bits[c >> 3] |= 1 << (c & 7)
+            self.fichier.write(bits)
+        return len(self.decalages) - 1
+
+    def fermer(self):
+        position_index = self.fichier.tell()
+        self.fichier.write(self.decalages.tobytes())
+        self.fichier.write(FIN.pack(len(self.decalages), position_index, SIGNATURE))
+        self.fichier.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fermer()
+
+class LecteurArchive:
+    """Accès direct à la grille n d'une archive projetée en mémoire.
+
+    Seuls l'entrée n de l'index et l'enregistrement correspondant sont lus:
+    le temps d'accès ne dépend pas de la taille de l'archive. Les grilles
+    rendues sont des copies (la taille d'une grille, pas de l'archive).
+    """
+
+    def __init__(self, nom_fichier):
+        with open(nom_fichier, 'rb') as f:
+            self.projection = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.nombre, self.position_index, _ = _lire_fin(self.projection, nom_fichier)
+
+    def __len__(self):
+        return self.nombre
+
+    def _enregistrement(self, n):
+        if not 0 <= n < self.nombre:
+            raise IndexError(f"Grille {n} absente (l'archive en contient {self.nombre})")
+        decalage, = DECALAGE.unpack_from(self.projection, self.position_index + 8 * n)
+        H, L, drapeaux = ENREGISTREMENT.unpack_from(self.projection, decalage)
+        return H, L, drapeaux, decalage + ENREGISTREMENT.size
+
+    def grille(self, n):
+        """GrilleCompacte de la grille n"""
+        H, L, _, debut = self._enregistrement(n)
+        return GrilleCompacte(H, L, bytearray(self.projection[debut:debut + H * L]))
+
+    def ampoules(self, n):
+        """Cases des ampoules de la solution de la grille n, ou None si elle n'a pas été enregistrée"""
+        H, L, drapeaux, debut = self._enregistrement(n)
+        if not drapeaux & AVEC_SOLUTION:
+            return None
+        debut += H * L
+        bits = self.projection[debut:debut + (H * L + 7) // 8]
+        return [k * 8 + b for k, octet in enumerate(bits) if octet for b in BITS[octet]]
+
+    def solution(self, n):
+        """GrilleCompacte de la grille n avec ses ampoules, ou None"""
+        ampoules = self.ampoules(n)
+        if ampoules is None:
+            return None
+        solution = self.grille(n)
+        for c in ampoules:
+            solution.cases[c] = AMPOULE
+        return solution
+
+    def fermer(self):
+        self.projection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fermer()
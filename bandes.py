@@ -0,0 +1,420 @@
+import multiprocessing
+import os
+import resource
+import time
+
+from dimacs import mur_chiffre
+from lightup.encodages import generer_clauses
+from lightup.index_grille import IndexGrille, est_mur
+from solveur_incremental import SolveurIncremental
+
+COTES = ('haut', 'bas')
+
+def role_fantome(au_dela, bord):
+    """Rôle de la case fantôme face à la case de bord d'une bande: 'traversante', 'mur' ou None"""
+    if est_mur(au_dela):
+        return None
+    if not est_mur(bord):
+        return 'traversante'
+    return 'mur' if mur_chiffre(bord) else None
+
+def cout_coupe(grille, r):
+    """Nombre de cases d'interface si l'on coupe entre les lignes r - 1 et r"""
+    return sum(1 for j in range(len(grille[0]))
+               if role_fantome(grille[r - 1][j], grille[r][j]) or role_fantome(grille[r][j], grille[r - 1][j]))
+
+def choisir_coupes(grille, hauteur_bande=40):
+    """Lignes de coupe (début de chaque bande, puis H): la moins coûteuse autour de chaque multiple de hauteur_bande"""
+    H = len(grille)
+    coupes = [0]
+    fenetre = max(1, hauteur_bande // 4)
+    while H - coupes[-1] > hauteur_bande + fenetre:
+        cible = coupes[-1] + hauteur_bande
+        candidates = range(max(coupes[-1] + 2, cible - fenetre), min(H - 1, cible + fenetre) + 1)
+        coupes.append(min(candidates, key=lambda r: cout_coupe(grille, r)))
+    coupes.append(H)
+    return coupes
+
+class Bande:
+    """Lignes debut .. fin - 1 d'une grille, avec une ligne fantôme de chaque côté coupé.
+
+    Une case fantôme (la case juste au-delà de la coupe) a l'un de deux rôles:
+      'traversante'  la colonne continue de part et d'autre de la coupe: la
+                     case fantôme est vraie si le segment de colonne, de
+                     l'autre côté, contient une ampoule;
+      'mur'          la case de bord est un mur chiffré: la case fantôme est
+                     vraie s'il y a une ampoule sur cette case de l'autre bande.
+    Les clauses sont celles de generer_clauses sur la grille étendue, moins
+    celles qui relient deux cases fantômes d'une même ligne ou exigent leur
+    éclairage. fantomes[cote][j] et sorties[cote][j] sont les variables que la
+    bande voisine de ce côté doit lire et fixer (et inversement).
+    """
+
+    def __init__(self, grille, debut, fin):
+        self.debut = debut
+        self.fin = fin
+        H = len(grille)
+        L = len(grille[0])
+        lignes = [list(ligne) for ligne in grille[debut:fin]]
+        self.decalage = 0
+        roles = {}
+        if debut > 0:
+            roles['haut'] = [role_fantome(grille[debut - 1][j], grille[debut][j]) for j in range(L)]
+            lignes.insert(0, ['.' if role else '#' for role in roles['haut']])
+            self.decalage = 1
+        if fin < H:
+            roles['bas'] = [role_fantome(grille[fin][j], grille[fin - 1][j]) for j in range(L)]
+            lignes.append(['.' if role else '#' for role in roles['bas']])
+        self.grille = lignes
+        self.roles = roles
+        # Rôles vus depuis la bande voisine: ses cases fantômes sont nos sorties
+        self.roles_voisins = {}
+        if debut > 0:
+            self.roles_voisins['haut'] = [role_fantome(grille[debut][j], grille[debut - 1][j]) for j in range(L)]
+        if fin < H:
+            self.roles_voisins['bas'] = [role_fantome(grille[fin - 1][j], grille[fin][j]) for j in range(L)]
+        self._numeroter()
+
+    def _ligne_fantome(self, cote):
+        return 0 if cote == 'haut' else len(self.grille) - 1
+
+    def _numeroter(self):
+        """Variables des cases (même numérotation que generer_clauses) et des sorties"""
+        H, L = len(self.grille), len(self.grille[0])
+        self.var_map = {}
+        for i in range(H):
+            for j in range(L):
+                if not est_mur(self.grille[i][j]):
+                    self.var_map[(i, j)] = len(self.var_map) + 1
+        self.nb_vars = len(self.var_map)
+
+        self.fantomes = {cote: {j: self.var_map[(self._ligne_fantome(cote), j)]
+                                for j, role in enumerate(roles) if role} for cote, roles in self.roles.items()}
+        self.sorties = {}
+        self.definitions = {}  # variable de sortie -> littéraux dont elle est la disjonction
+        for cote, roles in self.roles_voisins.items():
+            bord = self.decalage if cote == 'haut' else self.decalage + self.fin - self.debut - 1
+            pas = 1 if cote == 'haut' else -1
+            self.sorties[cote] = {}
+            for j, role in enumerate(roles):
+                if role == 'mur':
+                    self.sorties[cote][j] = self.var_map[(bord, j)]
+                elif role == 'traversante':
+                    # Ampoule dans la partie du segment de colonne vue depuis la coupe
+                    partie, i = [], bord
+                    while 0 <= i < H and not est_mur(self.grille[i][j]):
+                        partie.append(self.var_map[(i, j)])
+                        i += pas
+                    self.nb_vars += 1
+                    self.sorties[cote][j] = self.nb_vars
+                    self.definitions[self.nb_vars] = partie
+
+    def clauses(self):
+        """Clauses de la bande, ou None si un mur chiffré est impossible"""
+        var_map, clauses = generer_clauses(self.grille)
+        if var_map is None:
+            return None
+        fantomes = {cote: set(vars_fantomes.values()) for cote, vars_fantomes in self.fantomes.items()}
+        tous = set().union(*fantomes.values())
+
+        # Éclairage des cases fantômes: clause [g] + cases visibles, dans l'ordre de generer_clauses.
+        # Chacune n'est retirée qu'une fois (un mur chiffré peut produire la même clause unitaire [g])
+        index = IndexGrille(self.grille)
+        eclairage_fantome = set()
+        for cote, vars_fantomes in self.fantomes.items():
+            for j, g in vars_fantomes.items():
+                c = index.case(self._ligne_fantome(cote), j)
+                eclairage_fantome.add(tuple([g] + [var_map[index.position(c2)] for c2 in index.visibles(c)]))
+
+        gardees = []
+        for clause in clauses:
+            if clause[0] in tous and tuple(clause) in eclairage_fantome:
+                eclairage_fantome.discard(tuple(clause))
+                continue
+            if len(clause) == 2 and any(-clause[0] in f and -clause[1] in f for f in fantomes.values()):
+                continue
+            gardees.append(clause)
+
+        for sortie, partie in self.definitions.items():
+            gardees.append([-sortie] + partie)
+            gardees.extend([-v, sortie] for v in partie)
+        return gardees
+
+    def interface(self, cote):
+        """Variables que cette bande partage avec sa voisine du côté donné"""
+        return sorted(set(self.fantomes.get(cote, {}).values()) | set(self.sorties.get(cote, {}).values()))
+
+    def ampoules(self, modele):
+        """Ampoules (i, j) de la grille d'origine dans un modèle de la bande"""
+        vraies = set(modele)
+        return [(i - self.decalage + self.debut, j) for (i, j), v in self.var_map.items()
+                if v in vraies and self.decalage <= i < self.decalage + self.fin - self.debut]
+
+def hypotheses_coupe(bande, cote, voisine, modele_voisine):
+    """Fixe l'interface de la bande sur les valeurs de la voisine (de l'autre côté de la coupe).
+
+    Retourne un dictionnaire littéral de la bande -> variable correspondante de la voisine
+    (le littéral est positif si cette variable est vraie dans son modèle).
+    """
+    vraies = set(modele_voisine)
+    oppose = 'bas' if cote == 'haut' else 'haut'
+    paires = [(g, voisine.sorties[oppose][j]) for j, g in bande.fantomes.get(cote, {}).items()]
+    paires += [(s, voisine.fantomes[oppose][j]) for j, s in bande.sorties.get(cote, {}).items()]
+    return {(v if w in vraies else -v): w for v, w in paires}
+
+class ResolveurBandes:
+    """Solveurs incrémentaux de quelques bandes, encodées une seule fois.
+
+    Les clauses de blocage sont ajoutées au fil de l'eau: une nouvelle
+    résolution de la même bande ne coûte que l'appel au solveur.
+    """
+
+    def __init__(self, bandes):
+        self.bandes = bandes
+        self.solveurs = {}
+
+    def resoudre(self, k, blocages=(), hypotheses=None):
+        """Résout la bande k sous hypothèses (dictionnaire côté -> littéraux imposés par la voisine).
+
+        Retourne (statut, modèle, échec). En cas d'échec, échec vaut
+        (côté, noyaux) pour le premier côté dont les hypothèses suffisent
+        seules à l'impossibilité, noyaux étant des sous-ensembles disjoints
+        d'hypothèses en cause, ou (None, None) si seule la combinaison des
+        deux côtés échoue. Un noyau vide signifie que la bande est impossible.
+        """
+        if k not in self.solveurs:
+            clauses = self.bandes[k].clauses()
+            self.solveurs[k] = SolveurIncremental(clauses if clauses is not None else [[]])
+        solveur = self.solveurs[k]
+        solveur.ajouter_clauses(blocages)
+        hypotheses = hypotheses or {}
+
+        resultat = solveur.resoudre([h for cote in COTES for h in hypotheses.get(cote, ())])
+        if resultat:
+            return 'SAT', [v for v in solveur.modele() if v > 0], None
+        if resultat is None:
+            return 'INCONNU', None, None
+        if not solveur.noyau():
+            return 'UNSAT', None, (None, [[]])
+        for cote in COTES:
+            # Noyaux disjoints: chaque noyau trouvé est relâché avant de chercher le suivant
+            restantes, noyaux = list(hypotheses.get(cote, ())), []
+            while restantes and solveur.resoudre(restantes) is False:
+                noyau = solveur.noyau()
+                noyaux.append(noyau)
+                if not noyau:
+                    break
+                restantes = [h for h in restantes if h not in set(noyau)]
+            if noyaux:
+                return 'UNSAT', None, (cote, noyaux)
+        return 'UNSAT', None, (None, None)
+
+    def fermer(self):
+        for solveur in self.solveurs.values():
+            solveur.fermer()
+
+def _boucle_travailleur(connexion, bandes):
+    """Processus gardant en mémoire les solveurs de ses bandes, à l'écoute des demandes de résolution"""
+    resolveur = ResolveurBandes(bandes)
+    try:
+        for k, blocages, hypotheses in iter(connexion.recv, None):
+            connexion.send(resolveur.resoudre(k, blocages, hypotheses))
+    finally:
+        resolveur.fermer()
+
+class _Travailleurs:
+    """Bandes réparties entre des processus persistants (k modulo le nombre de processus)"""
+
+    def __init__(self, bandes, processus=None):
+        self.nombre = min(len(bandes), processus or os.cpu_count() or 1)
+        self.connexions, self.processus = [], []
+        if self.nombre == 1:
+            self.local = ResolveurBandes(bandes)
+            return
+        for _ in range(self.nombre):
+            parent, enfant = multiprocessing.Pipe()
+            travailleur = multiprocessing.Process(target=_boucle_travailleur, args=(enfant, bandes), daemon=True)
+            travailleur.start()
+            self.connexions.append(parent)
+            self.processus.append(travailleur)
+
+    def resoudre(self, taches):
+        """Résout une liste de (k, blocages, hypothèses): les bandes de processus différents en parallèle"""
+        if self.nombre == 1:
+            return [self.local.resoudre(*tache) for tache in taches]
+        for tache in taches:
+            self.connexions[tache[0] % self.nombre].send(tache)
+        return [self.connexions[tache[0] % self.nombre].recv() for tache in taches]
+
+    def fermer(self):
+        if self.nombre == 1:
+            self.local.fermer()
+            return
+        for connexion in self.connexions:
+            connexion.send(None)
+        for travailleur in self.processus:
+            travailleur.join(timeout=1)
+            if travailleur.is_alive():
+                travailleur.kill()
+
+def transposer(grille):
+    return [list(colonne) for colonne in zip(*grille)]
+
+class _Recollage:
+    """État du recollement: modèles des bandes et clauses de blocage prouvées"""
+
+    def __init__(self, bandes, travailleurs):
+        self.bandes = bandes
+        self.travailleurs = travailleurs
+        self.modeles = [None] * len(bandes)
+        self.nouveaux_blocages = [[] for _ in bandes]  # pas encore envoyés au solveur de la bande
+        self.rapport = {'bandes': len(bandes), 'tours': 0, 'resolutions': 0, 'blocages': 0, 'balayage': False}
+
+    def hypotheses(self, k, cotes):
+        correspondances = {}
+        if 'haut' in cotes and k > 0:
+            correspondances['haut'] = hypotheses_coupe(self.bandes[k], 'haut', self.bandes[k - 1], self.modeles[k - 1])
+        if 'bas' in cotes and k + 1 < len(self.bandes):
+            correspondances['bas'] = hypotheses_coupe(self.bandes[k], 'bas', self.bandes[k + 1], self.modeles[k + 1])
+        return correspondances
+
+    def resoudre(self, indices, cotes):
+        """Résout les bandes indiquées, interfaces fixées du côté des voisines données"""
+        correspondances = [self.hypotheses(k, cotes) for k in indices]
+        taches = []
+        for k, corr in zip(indices, correspondances):
+            taches.append((k, self.nouveaux_blocages[k], {cote: list(c) for cote, c in corr.items()}))
+            self.nouveaux_blocages[k] = []
+        self.rapport['resolutions'] += len(taches)
+        resultats = []
+        for k, corr, (statut, modele, echec) in zip(indices, correspondances, self.travailleurs.resoudre(taches)):
+            if statut == 'SAT':
+                self.modeles[k] = modele
+            resultats.append((k, statut, echec, corr))
+        return resultats
+
+    def bloquer(self, k, cote, noyaux, correspondances):
+        """La voisine de k du côté donné ne peut plus reprendre les valeurs des noyaux (clauses prouvées)"""
+        voisine = k - 1 if cote == 'haut' else k + 1
+        for noyau in noyaux:
+            self.nouveaux_blocages[voisine].append([-correspondances[cote][h] if h > 0 else correspondances[cote][h]
+                                                    for h in noyau])
+        self.rapport['blocages'] += len(noyaux)
+        return voisine
+
+    def tour_parallele(self, a_resoudre):
+        """Bandes paires libres puis impaires fixées des deux côtés: 'SAT', 'UNSAT', 'INCONNU', 'ENCORE' ou 'BALAYAGE'"""
+        n = len(self.bandes)
+        for k, statut, _, _ in self.resoudre([k for k in range(0, n, 2) if k in a_resoudre], ()):
+            if statut != 'SAT':
+                return statut
+            a_resoudre.discard(k)
+        a_revoir = set()
+        for k, statut, echec, correspondances in self.resoudre(
+                [k for k in range(1, n, 2) if k in a_resoudre], ('haut', 'bas')):
+            if statut == 'INCONNU':
+                return statut
+            if statut == 'SAT':
+                a_resoudre.discard(k)
+                continue
+            cote, noyaux = echec
+            if noyaux is None:
+                return 'BALAYAGE'  # Seule la combinaison des deux voisines échoue
+            if not all(noyaux):
+                return 'UNSAT'
+            voisine = self.bloquer(k, cote, noyaux, correspondances)
+            a_revoir.update({voisine - 1, voisine, voisine + 1} & set(range(n)))
+        a_resoudre.update(a_revoir)
+        return 'ENCORE' if a_revoir else 'SAT'
+
+    def balayage(self):
+        """Résolution de haut en bas, chaque bande fixée par celle du dessus, avec retour arrière"""
+        self.rapport['balayage'] = True
+        k = 0
+        while k < len(self.bandes):
+            _, statut, echec, correspondances = self.resoudre([k], ('haut',))[0]
+            if statut == 'SAT':
+                k += 1
+            elif statut == 'INCONNU' or not all(echec[1]):
+                return statut
+            else:
+                k = self.bloquer(k, echec[0], echec[1], correspondances)
+        return 'SAT'
+
+def resoudre_par_bandes(grille, hauteur_bande=40, processus=None, max_tours=20):
+    """Résout une grande grille par bandes horizontales recollées.
+
+    Chaque bande est encodée une seule fois, dans un processus qui garde son
+    solveur incrémental. Les bandes paires sont résolues librement (en
+    parallèle), puis les bandes impaires avec leurs interfaces fixées par
+    leurs deux voisines. Quand une bande impaire échoue à cause d'un seul
+    côté, ses noyaux insatisfiables donnent des clauses de blocage prouvées
+    pour la voisine de ce côté, qui est résolue à nouveau. Si seule la
+    combinaison des deux côtés échoue (ou après max_tours), on termine par un
+    balayage de haut en bas avec retour arrière, complet. Les clauses de
+    blocage découlent toutes des contraintes d'une bande: une bande
+    impossible prouve que la grille l'est. processus=1 fait tout dans le
+    processus courant. Une grille plus large que haute est découpée en
+    colonnes (transposée).
+
+    Retourne (statut, ampoules, rapport) où rapport contient le nombre de
+    bandes, de tours, de résolutions et de clauses de blocage.
+    """
+    transposee = len(grille[0]) > len(grille)
+    if transposee:
+        grille = transposer(grille)
+    debut = time.perf_counter()
+    coupes = choisir_coupes(grille, hauteur_bande)
+    bandes = [Bande(grille, a, b) for a, b in zip(coupes[:-1], coupes[1:])]
+
+    travailleurs = _Travailleurs(bandes, processus)
+    recollage = _Recollage(bandes, travailleurs)
+    recollage.rapport['coupes'] = coupes[1:-1]
+    try:
+        a_resoudre = set(range(len(bandes)))
+        statut = 'ENCORE'
+        while statut == 'ENCORE' and recollage.rapport['tours'] < max_tours:
+            recollage.rapport['tours'] += 1
+            statut = recollage.tour_parallele(a_resoudre)
+        if statut in ('ENCORE', 'BALAYAGE'):
+            statut = recollage.balayage()
+    finally:
+        travailleurs.fermer()
+
+    ampoules = None
+    if statut == 'SAT':
+        ampoules = [pos for bande, modele in zip(bandes, recollage.modeles) for pos in bande.ampoules(modele)]
+        if transposee:
+            ampoules = [(j, i) for i, j in ampoules]
+    recollage.rapport['temps'] = time.perf_counter() - debut
+    return statut, ampoules, recollage.rapport
+
+def _pic_resolution(connexion, bande):
+    """Pic de mémoire résidente (Ko) d'un processus neuf qui encode et résout une bande"""
+    ResolveurBandes([bande]).resoudre(0)
+    connexion.send(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+
+def comparer_memoire(grille, hauteur_bande=40):
+    """Pic de mémoire résidente (Ko) de la plus grosse bande contre celui de la résolution monolithique"""
+    if len(grille[0]) > len(grille):
+        grille = transposer(grille)
+    coupes = choisir_coupes(grille, hauteur_bande)
+    pics = []
+    for bande in [Bande(grille, a, b) for a, b in zip(coupes[:-1], coupes[1:])] + [Bande(grille, 0, len(grille))]:
+        parent, enfant = multiprocessing.Pipe()
+        mesure = multiprocessing.Process(target=_pic_resolution, args=(enfant, bande))
+        mesure.start()
+        pics.append(parent.recv())
+        mesure.join()
+    return {'bandes': max(pics[:-1]), 'monolithique': pics[-1]}
+
+if __name__ == "__main__":
+    import sys
+    from lightup.grille_compacte import lire_grille
+
+    grille = lire_grille(sys.argv[1])
+    hauteur_bande = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+    statut, ampoules, rapport = resoudre_par_bandes(grille, hauteur_bande)
+    print(f"{statut}: {rapport}")
+    memoire = comparer_memoire(grille, hauteur_bande)
+    print(f"Pic mémoire: {memoire['bandes'] / 1024:.1f} Mo par bande, {memoire['monolithique'] / 1024:.1f} Mo en monolithique")
@@ -0,0 +1,307 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import dimacs
+from genere_grille import NIVEAUX, generer_grille_plantee, grille_est_valide, normaliser_murs, reparer_grille, tirer_grille
+from lightup import instrumentation
+
+TAILLES = [7, 15, 30, 60, 100, 200]
+ETAPES = ['generer_dimacs', 'appeler_sat_solver', 'interpreter_solution', 'verifier_solution']
+
+def generer_corpus(tailles=TAILLES, niveaux=None, par_case=1, graine=0, plantees=False):
+    """Génère un corpus reproductible: par_case grilles par (taille, difficulté).
+
+    Avec plantees, les grilles sont construites autour d'une solution et donc
+    toutes solvables (les grilles aléatoires sont presque toujours UNSAT).
+    """
+    rng = random.Random(graine)
+    corpus = []
+    for taille in tailles:
+        for difficulte in niveaux or list(NIVEAUX):
+            for k in range(par_case):
+                if plantees:
+                    grille = generer_grille_plantee(taille, taille, difficulte, rng)
+                else:
+                    grille = tirer_grille(taille, taille, difficulte, rng)
+                    normaliser_murs(grille)
+                corpus.append({
+                    'id': f"{taille}x{taille}-{difficulte}-{k}",
+                    'taille': taille,
+                    'difficulte': difficulte,
+                    'grille': grille,
+                    'plantee': plantees,
+                })
+    return corpus
+
+def _chrono(fonction, *args):
+    """Exécute fonction en silence, retourne (résultat, secondes)"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        debut = time.perf_counter()
+        resultat = fonction(*args)
+        duree = time.perf_counter() - debut
+    return resultat, duree
+
+def _pic_memoire(fonction, *args):
+    """Pic d'allocation Python (octets) pendant l'appel"""
+    tracemalloc.start()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            fonction(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def mesurer_instance(instance, repetitions=1, memoire=True, avec_solveur=True, renforcer=False):
+    """Mesure chaque étape du pipeline sur une grille (à lancer dans un dossier de travail)"""
+    grille = instance['grille']
+    temps = {etape: None for etape in ETAPES}
+    pics = {etape: None for etape in ETAPES}
+
+    for _ in range(repetitions):
+        encodage, duree = _chrono(dimacs.generer_dimacs, grille, renforcer)
+        var_map, clauses = encodage
+        temps['generer_dimacs'] = min(duree, temps['generer_dimacs'] or duree)
+    if memoire:
+        pics['generer_dimacs'] = _pic_memoire(dimacs.generer_dimacs, grille, renforcer)
+
+    resultat = {
+        'id': instance['id'],
+        'taille': instance['taille'],
+        'difficulte': instance['difficulte'],
+        'valide': var_map is not None,
+        'nb_variables': len(var_map) if var_map else 0,
+        'nb_clauses': len(clauses) if clauses else 0,
+        'nb_litteraux': sum(len(c) for c in clauses) if clauses else 0,
+        'statut': 'INVALIDE' if var_map is None else 'NON_RESOLU',
+        'temps': temps,
+        'pic_memoire': pics,
+    }
+    if var_map is None or not avec_solveur:
+        return resultat
+
+    for _ in range(repetitions):
+        solution, duree = _chrono(dimacs.appeler_sat_solver)
+        temps['appeler_sat_solver'] = min(duree, temps['appeler_sat_solver'] or duree)
+    # Les statistiques du solveur (conflits, décisions...) sont relevées sur un appel à part
+    instrumentation.activer()
+    instrumentation.reinitialiser()
+    _chrono(dimacs.appeler_sat_solver)
+    resultat['solveur'] = (instrumentation.rapport()['solveur'] or [{}])[-1]
+    instrumentation.activer(False)
+    if memoire:
+        pics['appeler_sat_solver'] = _pic_memoire(dimacs.appeler_sat_solver)
+
+    if solution is None:
+        resultat['statut'] = 'UNSAT'
+        return resultat
+    resultat['statut'] = 'SAT'
+
+    for _ in range(repetitions):
+        solution_grille, duree = _chrono(dimacs.interpreter_solution, solution, grille, var_map)
+        temps['interpreter_solution'] = min(duree, temps['interpreter_solution'] or duree)
+    if memoire:
+        pics['interpreter_solution'] = _pic_memoire(dimacs.interpreter_solution, solution, grille, var_map)
+
+    for _ in range(repetitions):
+        valide, duree = _chrono(dimacs.verifier_solution, solution_grille)
+        temps['verifier_solution'] = min(duree, temps['verifier_solution'] or duree)
+    if memoire:
+        pics['verifier_solution'] = _pic_memoire(dimacs.verifier_solution, solution_grille)
+    resultat['solution_valide'] = valide
+
+    return resultat
+
+def lancer_benchmark(corpus, repetitions=1, memoire=True, renforcer=False):
+    """Mesure tout le corpus dans un dossier temporaire (les fichiers output.cnf/solution.txt y sont écrits)"""
+    avec_solveur = shutil.which("minisat") is not None
+    if not avec_solveur:
+        print("MiniSAT introuvable: seule l'étape generer_dimacs est mesurée.")
+
+    dossier_initial = os.getcwd()
+    resultats = []
+    with tempfile.TemporaryDirectory() as dossier:
+        os.chdir(dossier)
+        try:
+            for instance in corpus:
+                resultat = mesurer_instance(instance, repetitions, memoire, avec_solveur, renforcer)
+                resultats.append(resultat)
+                total = sum(t for t in resultat['temps'].values() if t)
+                print(f"{resultat['id']:>24}  {resultat['statut']:>10}  "
+                      f"{resultat['nb_clauses']:>9} clauses  {total:8.3f} s")
+        finally:
+            os.chdir(dossier_initial)
+
+    return {
+        'meta': {
+            'date': time.strftime("%Y-%m-%dT%H:%M:%S"),
+            'python': platform.python_version(),
+            'plateforme': platform.platform(),
+            'repetitions': repetitions,
+            'solveur': avec_solveur,
+            'renforcer': renforcer,
+        },
+        'resultats': resultats,
+    }
+
+def comparer_renforcement(corpus, repetitions=1):
+    """Mesure le corpus sans puis avec les clauses impliquées (--renforcer).
+
+    Retourne, par difficulté, la moyenne des conflits MiniSAT et du temps de
+    résolution dans les deux cas, sur les grilles valides.
+    """
+    sans = lancer_benchmark(corpus, repetitions, memoire=False)['resultats']
+    avec = lancer_benchmark(corpus, repetitions, memoire=False, renforcer=True)['resultats']
+    bilan = {}
+    for a, b in zip(sans, avec):
+        if not a['valide']:
+            continue
+        ligne = bilan.setdefault(a['difficulte'], {'grilles': 0, 'conflits': [0, 0], 'temps': [0.0, 0.0]})
+        ligne['grilles'] += 1
+        for k, r in enumerate((a, b)):
+            ligne['conflits'][k] += r.get('solveur', {}).get('conflits') or 0
+            ligne['temps'][k] += r['temps']['appeler_sat_solver'] or 0.0
+    for ligne in bilan.values():
+        ligne['conflits'] = [c / ligne['grilles'] for c in ligne['conflits']]
+        ligne['temps'] = [t / ligne['grilles'] for t in ligne['temps']]
+    return bilan
+
+def comparer_reparation(tailles, niveaux=None, tirages=20, graine=0):
+    """Taux d'acceptation par appel SAT du générateur, sans puis avec réparation locale.
+
+    Sans réparation, les grilles aux murs impossibles sont jetées et chaque
+    grille restante coûte un appel SAT (jetée si UNSAT); avec, les murs sont
+    normalisés puis la grille est réparée (reparer_grille). Les mêmes tirages
+    sont utilisés dans les deux cas. Retourne, par taille et difficulté, les
+    appels SAT et les grilles acceptées [sans, avec].
+    """
+    bilan = {}
+    for taille in tailles:
+        for difficulte in niveaux or list(NIVEAUX):
+            rng = random.Random(graine)
+            ligne = bilan.setdefault(f"{taille}x{taille}-{difficulte}", {'appels': [0, 0], 'acceptees': [0, 0]})
+            for _ in range(tirages):
+                grille = tirer_grille(taille, taille, difficulte, rng)
+                for k, reparer in enumerate((False, True)):
+                    essai = [ligne_grille[:] for ligne_grille in grille]
+                    if reparer:
+                        normaliser_murs(essai)
+                    elif not grille_est_valide(essai):
+                        continue
+                    if sum(case == '.' for l in essai for case in l) < taille * taille * 0.3:
+                        continue
+                    statut, appels, _ = reparer_grille(essai, None if reparer else 0)
+                    ligne['appels'][k] += appels
+                    ligne['acceptees'][k] += statut == 'SAT'
+    return bilan
+
+def comparer(ancien, nouveau, seuil=1.10, plancher=0.01):
+    """Compare deux fichiers de résultats et liste les régressions (ratio de temps > seuil).
+
+    Les étapes plus rapides que plancher secondes dans les deux fichiers sont
+    ignorées pour ne pas signaler du bruit de mesure.
+    """
+    with open(ancien) as f:
+        avant = {r['id']: r for r in json.load(f)['resultats']}
+    with open(nouveau) as f:
+        apres = {r['id']: r for r in json.load(f)['resultats']}
+
+    regressions = []
+    for id_instance in sorted(avant.keys() & apres.keys()):
+        a, b = avant[id_instance], apres[id_instance]
+        for etape in ETAPES:
+            t_a, t_b = a['temps'].get(etape), b['temps'].get(etape)
+            if t_a is None or t_b is None or max(t_a, t_b) < plancher:
+                continue
+            ratio = t_b / t_a if t_a > 0 else float('inf')
+            if ratio > seuil:
+                regressions.append((id_instance, etape, t_a, t_b, ratio))
+        for compteur in ('nb_clauses', 'nb_litteraux'):
+            if b.get(compteur, 0) > a.get(compteur, 0) * seuil:
+                regressions.append((id_instance, compteur, a[compteur], b[compteur], b[compteur] / max(a[compteur], 1)))
+    return regressions
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark du pipeline Light Up (encodage, résolution, interprétation, vérification)")
+    parser.add_argument('--tailles', type=int, nargs='+', default=TAILLES)
+    parser.add_argument('--niveaux', nargs='+', choices=list(NIVEAUX), default=list(NIVEAUX))
+    parser.add_argument('--par-case', type=int, default=1, help="grilles par couple (taille, difficulté)")
+    parser.add_argument('--graine', type=int, default=0)
+    parser.add_argument('--repetitions', type=int, default=1, help="le meilleur temps est conservé")
+    parser.add_argument('--sans-memoire', action='store_true', help="ne pas mesurer le pic mémoire")
+    parser.add_argument('--sortie', default='benchmark.json')
+    parser.add_argument('--comparer', nargs=2, metavar=('ANCIEN', 'NOUVEAU'))
+    parser.add_argument('--seuil', type=float, default=1.10)
+    parser.add_argument('--plantees', action='store_true', help="grilles solvables construites autour d'une solution")
+    parser.add_argument('--renforcer', action='store_true', help="ajouter les clauses impliquées à l'encodage")
+    parser.add_argument('--comparer-renforcement', action='store_true',
+                        help="conflits et temps de résolution moyens sans/avec --renforcer, par difficulté")
+    parser.add_argument('--entrainer-encodage', nargs='?', const='politique_encodage.json', metavar='FICHIER',
+                        help="apprendre la politique de choix d'encodage (grilles tirées et plantées, sauf --plantees), "
+                             "l'évaluer sur le corpus de la graine suivante et l'écrire dans FICHIER")
+    parser.add_argument('--comparer-reparation', action='store_true',
+                        help="taux d'acceptation par appel SAT du générateur sans/avec réparation (--par-case tirages)")
+    args = parser.parse_args()
+
+    if args.comparer:
+        regressions = comparer(*args.comparer, seuil=args.seuil)
+        for id_instance, etape, avant, apres, ratio in regressions:
+            print(f"RÉGRESSION {id_instance} {etape}: {avant:.4g} -> {apres:.4g} (x{ratio:.2f})")
+        print(f"{len(regressions)} régression(s) au-delà de x{args.seuil}")
+        sys.exit(1 if regressions else 0)
+
+    if args.comparer_reparation:
+        bilan = comparer_reparation(args.tailles, args.niveaux, args.par_case, args.graine)
+        print(f"{'grilles':>16}  {'appels sans':>11}  {'acceptées':>9}  {'taux':>6}  {'appels avec':>11}  {'acceptées':>9}  {'taux':>6}")
+        for nom, ligne in bilan.items():
+            taux = [a / n if n else 0.0 for a, n in zip(ligne['acceptees'], ligne['appels'])]
+            print(f"{nom:>16}  {ligne['appels'][0]:>11}  {ligne['acceptees'][0]:>9}  {taux[0]:>6.3f}  "
+                  f"{ligne['appels'][1]:>11}  {ligne['acceptees'][1]:>9}  {taux[1]:>6.3f}")
+        with open(args.sortie, 'w') as f:
+            json.dump(bilan, f, indent=2)
+        sys.exit(0)
+
+    if args.entrainer_encodage:
+        from lightup import selection_encodage
+        corpus = {graine: [instance for plantees in ([True] if args.plantees else [False, True])
+                           for instance in generer_corpus(args.tailles, args.niveaux, args.par_case, graine, plantees)]
+                  for graine in (args.graine, args.graine + 1)}
+        politique = selection_encodage.entrainer(selection_encodage.mesurer(corpus[args.graine], repetitions=args.repetitions))
+        print("\n".join(politique.decrire()))
+        politique.sauvegarder(args.entrainer_encodage)
+        bilan = selection_encodage.evaluer(politique, selection_encodage.mesurer(corpus[args.graine + 1],
+                                                                                   repetitions=args.repetitions))
+        print(f"\nÉvaluation sur la graine {args.graine + 1} (temps totaux en ms):")
+        print(f"{'grilles':>26}  {'politique':>9}  " + "  ".join(f"{e:>19}" for e in selection_encodage.ENCODAGES) +
+              f"  {'ratio':>6}")
+        for nom, ligne in bilan.items():
+            print(f"{nom:>26}  {ligne['politique'] * 1000:>9.1f}  " +
+                  "  ".join(f"{t * 1000:>19.1f}" for t in ligne['fixes'].values()) + f"  {ligne['ratio']:>6.3f}")
+        print(f"Politique écrite dans '{args.entrainer_encodage}'")
+        sys.exit(0)
+
+    corpus = generer_corpus(args.tailles, args.niveaux, args.par_case, args.graine, args.plantees)
+    if args.comparer_renforcement:
+        bilan = comparer_renforcement(corpus, args.repetitions)
+        print(f"{'difficulté':>10}  {'grilles':>7}  {'conflits sans':>13}  {'conflits avec':>13}  {'temps sans':>10}  {'temps avec':>10}")
+        for niveau, ligne in bilan.items():
+            print(f"{niveau:>10}  {ligne['grilles']:>7}  {ligne['conflits'][0]:>13.1f}  {ligne['conflits'][1]:>13.1f}  "
+                  f"{ligne['temps'][0]:>9.3f}s  {ligne['temps'][1]:>9.3f}s")
+        with open(args.sortie, 'w') as f:
+            json.dump(bilan, f, indent=2)
+        sys.exit(0)
+    resultats = lancer_benchmark(corpus, args.repetitions, not args.sans_memoire, args.renforcer)
+    resultats['meta'].update({'graine': args.graine, 'tailles': args.tailles, 'niveaux': args.niveaux,
+                              'plantees': args.plantees})
+    with open(args.sortie, 'w') as f:
+        json.dump(resultats, f, indent=2)
+    print(f"Résultats écrits dans '{args.sortie}'")
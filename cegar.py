@@ -0,0 +1,95 @@
+import time
+from itertools import combinations
+
+from lightup.encodages import generer_clauses
+from lightup.index_grille import IndexGrille
+from lightup.solveurs import ResultatSolveur
+from lightup.symetries import clauses_symetries
+from solveur_incremental import SolveurIncremental
+
+def clauses_alignement_eager(index):
+    """Nombre de clauses d'alignement de l'encodage complet (chaque paire d'un segment, depuis ses deux cases)"""
+    total = 0
+    for s in range(index.nb_segments):
+        m = index.debut_segment[s + 1] - index.debut_segment[s]
+        total += m * (m - 1)
+    return total
+
+def alignements_violes(index, var_case, ampoules, segment_entier=False):
+    """Clauses d'alignement violées par les ampoules (cases).
+
+    Une clause [-a, -b] par paire d'ampoules d'un même segment; avec
+    segment_entier, toutes les paires du segment fautif sont ajoutées
+    (moins d'itérations, plus de clauses).
+    """
+    comptes = index.segments_allumes(ampoules)
+    fautifs = {}
+    for c in ampoules:
+        for s in (index.seg_ligne[c], index.seg_colonne[c]):
+            if comptes[s] > 1:
+                fautifs.setdefault(s, []).append(c)
+    clauses = []
+    for s, cases in fautifs.items():
+        if segment_entier:
+            cases = index.membres_segment(s)
+        clauses.extend([-var_case[a], -var_case[b]] for a, b in combinations(cases, 2))
+    return clauses
+
+def resoudre_cegar(grille, budget=None, briser_symetries=True, segment_entier=False):
+    """Résolution avec génération paresseuse des clauses d'alignement (boucle CEGAR).
+
+    Le solveur incrémental part des clauses d'éclairage et des murs chiffrés
+    (et des symétries); chaque modèle est vérifié sur l'index des segments
+    et seules les clauses d'alignement violées sont ajoutées avant de
+    relancer la résolution, jusqu'à un modèle valide ou UNSAT. Une
+    relaxation insatisfiable suffit à conclure: la grille est UNSAT.
+    budget (secondes) est vérifié entre deux itérations.
+
+    Retourne un ResultatSolveur avec en plus: ampoules (cases (i, j)),
+    iterations, clauses_initiales, clauses_ajoutees et clauses_eager (taille
+    de l'encodage complet équivalent).
+    """
+    debut = time.perf_counter()
+    index = IndexGrille(grille)
+    var_map, clauses = generer_clauses(grille, index, alignement=False)
+    if var_map is None:
+        resultat = ResultatSolveur('UNSAT')
+        resultat.ampoules, resultat.iterations = None, 0
+        resultat.clauses_initiales = resultat.clauses_ajoutees = resultat.clauses_eager = 0
+        return resultat
+    if briser_symetries:
+        clauses.extend(clauses_symetries(grille, var_map)[0])
+
+    var_case = [0] * (index.H * index.L)
+    case_var = [0] * (len(var_map) + 1)
+    for (i, j), v in var_map.items():
+        var_case[i * index.L + j] = v
+        case_var[v] = i * index.L + j
+
+    iterations = ajoutees = 0
+    ampoules = None
+    with SolveurIncremental(clauses) as solveur:
+        while True:
+            iterations += 1
+            reponse = solveur.resoudre()
+            if reponse is not True:
+                statut = 'UNSAT' if reponse is False else 'INCONNU'
+                break
+            ampoules = [case_var[v] for v in solveur.modele() if 0 < v <= len(var_map)]
+            violees = alignements_violes(index, var_case, ampoules, segment_entier)
+            if not violees:
+                statut = 'SAT'
+                break
+            solveur.ajouter_clauses(violees)
+            ajoutees += len(violees)
+            if budget is not None and time.perf_counter() - debut > budget:
+                statut = 'INCONNU'
+                break
+
+    resultat = ResultatSolveur(statut, temps=time.perf_counter() - debut)
+    resultat.ampoules = [index.position(c) for c in ampoules] if statut == 'SAT' else None
+    resultat.iterations = iterations
+    resultat.clauses_initiales = len(clauses)
+    resultat.clauses_ajoutees = ajoutees
+    resultat.clauses_eager = len(clauses) + clauses_alignement_eager(index)
+    return resultat
@@ -0,0 +1,224 @@
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+
+from lightup.solveurs import ResultatSolveur, analyser_stats_minisat, lire_modele
+
+def lire_cnf(nom_fichier):
+    """Lit un fichier DIMACS: (nombre de variables, clauses)"""
+    nb_vars, clauses = 0, []
+    with open(nom_fichier) as f:
+        for ligne in f:
+            if ligne.startswith('p cnf'):
+                nb_vars = int(ligne.split()[2])
+            elif ligne.strip() and not ligne.startswith('c'):
+                clauses.append([int(x) for x in ligne.split()[:-1]])
+    return nb_vars, clauses
+
+class Propagateur:
+    """Propagation unitaire sur une liste de clauses, pour l'anticipation (lookahead)"""
+
+    def __init__(self, nb_vars, clauses):
+        self.nb_vars = nb_vars
+        self.clauses = clauses
+        self.occurrences = {}  # littéral -> indices des clauses qui le contiennent
+        for k, clause in enumerate(clauses):
+            for l in clause:
+                self.occurrences.setdefault(l, []).append(k)
+
+    def propager(self, hypotheses):
+        """Valeurs déduites des hypothèses: ensemble des littéraux vrais, ou None en cas de conflit"""
+        vrais = set()
+        a_traiter = list(hypotheses)
+        while a_traiter:
+            l = a_traiter.pop()
+            if l in vrais:
+                continue
+            if -l in vrais:
+                return None
+            vrais.add(l)
+            # Seules les clauses où -l apparaît peuvent devenir unitaires
+            for k in self.occurrences.get(-l, ()):
+                libre = None
+                for l2 in self.clauses[k]:
+                    if l2 in vrais:
+                        break
+                    if -l2 not in vrais:
+                        if libre is not None:
+                            break
+                        libre = l2
+                else:
+                    if libre is None:
+                        return None
+                    a_traiter.append(libre)
+        return vrais
+
+    def candidats(self, nombre):
+        """Variables de découpage plausibles: cases des longs segments (beaucoup de clauses binaires
+        négatives) et voisines des murs #2/#3 (clauses positives courtes)"""
+        scores = {}
+        for clause in self.clauses:
+            if len(clause) == 2 and clause[0] < 0 and clause[1] < 0:
+                for l in clause:
+                    scores[-l] = scores.get(-l, 0) + 1
+            elif 2 <= len(clause) <= 3 and all(l > 0 for l in clause):
+                for l in clause:
+                    scores[l] = scores.get(l, 0) + 2
+        return sorted(scores, key=lambda v: -scores[v])[:nombre]
+
+def choisir_variable(propagateur, hypotheses, candidats):
+    """Anticipation: variable dont les deux branches propagent le plus.
+
+    Retourne (variable, hypothèses enrichies des littéraux forcés) ou
+    (None, None) si le nœud est en conflit. Un littéral dont la propagation
+    échoue force le littéral opposé (littéral raté).
+    """
+    hypotheses = list(hypotheses)
+    base = propagateur.propager(hypotheses)
+    if base is None:
+        return None, None
+    meilleure, meilleur_score = None, -1
+    for v in candidats:
+        if v in base or -v in base:
+            continue
+        positif = propagateur.propager(hypotheses + [v])
+        negatif = propagateur.propager(hypotheses + [-v])
+        if positif is None and negatif is None:
+            return None, None
+        if positif is None or negatif is None:
+            force = -v if positif is None else v
+            hypotheses.append(force)
+            base = propagateur.propager(hypotheses)
+            if base is None:
+                return None, None
+            continue
+        score = (len(positif) - len(base) + 1) * (len(negatif) - len(base) + 1)
+        if score > meilleur_score:
+            meilleure, meilleur_score = v, score
+    return meilleure, hypotheses
+
+def generer_cubes(nb_vars, clauses, profondeur=4, nb_candidats=40):
+    """Découpe le problème en au plus 2**profondeur cubes (listes de littéraux à supposer)"""
+    propagateur = Propagateur(nb_vars, clauses)
+    candidats = propagateur.candidats(nb_candidats)
+    cubes = []
+
+    def decouper(hypotheses, niveau):
+        variable, hypotheses = choisir_variable(propagateur, hypotheses, candidats)
+        if hypotheses is None:
+            return  # Cube réfuté par propagation
+        if variable is None or niveau == profondeur:
+            cubes.append(hypotheses)
+            return
+        decouper(hypotheses + [variable], niveau + 1)
+        decouper(hypotheses + [-variable], niveau + 1)
+
+    decouper([], 0)
+    return cubes
+
+def _ecrire_cube(contenu, nb_vars, nb_clauses, cube, nom):
+    with open(nom, 'w') as f:
+        f.write(f"p cnf {nb_vars} {nb_clauses + len(cube)}\n")
+        f.write(contenu)
+        for l in cube:
+            f.write(f"{l} 0\n")
+
+def resoudre_cubes(nom_fichier="output.cnf", profondeur=None, processus=None, budget=None):
+    """Cube-and-conquer: découpe par anticipation puis résout les cubes.
+
+    Avec pysat, les cubes sont des hypothèses successives d'un même solveur
+    incrémental: la formule n'est lue qu'une fois et les clauses apprises
+    servent aux cubes suivants. Sans pysat, chaque cube est ajouté en
+    clauses unitaires à une copie du CNF, et au plus `processus` MiniSAT
+    tournent en même temps; dès qu'un cube est SAT les autres sont tués.
+    UNSAT seulement si tous les cubes le sont. Retourne un ResultatSolveur
+    dont l'attribut cubes donne le nombre de cubes générés (la profondeur
+    par défaut vise 4 cubes par processus).
+    """
+    debut = time.perf_counter()
+    processus = processus or os.cpu_count() or 1
+    if profondeur is None:
+        profondeur = max(1, (4 * processus - 1).bit_length())
+    nb_vars, clauses = lire_cnf(nom_fichier)
+    cubes = generer_cubes(nb_vars, clauses, profondeur)
+    try:
+        resultat = _resoudre_cubes_pysat(clauses, cubes, budget, debut)
+    except ImportError:
+        resultat = _resoudre_cubes_minisat(nb_vars, clauses, cubes, processus, budget, debut)
+    resultat.cubes = len(cubes)
+    return resultat
+
+def _resoudre_cubes_pysat(clauses, cubes, budget, debut):
+    """Cubes résolus sous hypothèses par un seul solveur pysat (ImportError sans python-sat)"""
+    from threading import Timer
+
+    from lightup.solveurs import creer_pysat, stats_pysat
+
+    solveur = creer_pysat(clauses)
+    minuterie = None
+    if budget is not None:
+        minuterie = Timer(max(0.0, budget - (time.perf_counter() - debut)), solveur.interrupt)
+        minuterie.start()
+    try:
+        statut, modele = 'UNSAT', None
+        for cube in cubes:
+            reponse = solveur.solve_limited(assumptions=cube, expect_interrupt=budget is not None)
+            if reponse is None:
+                statut = 'INCONNU'
+                break
+            if reponse:
+                statut, modele = 'SAT', solveur.get_model()
+                break
+            if not solveur.get_core():
+                break  # Réfuté sans hypothèse: les autres cubes le sont aussi
+        return ResultatSolveur(statut, modele, stats_pysat(solveur), time.perf_counter() - debut)
+    finally:
+        if minuterie is not None:
+            minuterie.cancel()
+        solveur.delete()
+
+def _resoudre_cubes_minisat(nb_vars, clauses, cubes, processus, budget, debut):
+    """Un MiniSAT par cube (CNF complet + clauses unitaires), au plus processus à la fois"""
+    contenu = "".join(" ".join(map(str, clause)) + " 0\n" for clause in clauses)
+
+    dossier = tempfile.mkdtemp(prefix="cubes_")
+    en_cours = []
+    resultat = None
+    incomplet = False  # Un MiniSAT s'est arrêté sans répondre
+    try:
+        a_lancer = list(enumerate(cubes))
+        while resultat is None and (a_lancer or en_cours):
+            while a_lancer and len(en_cours) < processus:
+                k, cube = a_lancer.pop(0)
+                nom_cnf = os.path.join(dossier, f"{k}.cnf")
+                nom_sortie = os.path.join(dossier, f"{k}.out")
+                _ecrire_cube(contenu, nb_vars, len(clauses), cube, nom_cnf)
+                en_cours.append((subprocess.Popen(["minisat", nom_cnf, nom_sortie], stdout=subprocess.PIPE,
+                                                  stderr=subprocess.DEVNULL, text=True), nom_sortie))
+            for course in list(en_cours):
+                code = course[0].poll()
+                if code is None:
+                    continue
+                en_cours.remove(course)
+                if code == 10:
+                    sortie = course[0].stdout.read()
+                    statut, modele = lire_modele(course[1])
+                    resultat = ResultatSolveur(statut, modele, analyser_stats_minisat(sortie),
+                                               time.perf_counter() - debut, sortie)
+                    break
+                incomplet = incomplet or code != 20
+            if resultat is None and budget is not None and time.perf_counter() - debut > budget:
+                resultat = ResultatSolveur('INCONNU', temps=time.perf_counter() - debut)
+            elif resultat is None:
+                time.sleep(0.002)
+    finally:
+        for processus_minisat, _ in en_cours:
+            processus_minisat.kill()
+            processus_minisat.wait()
+        shutil.rmtree(dossier, ignore_errors=True)
+
+    if resultat is None:
+        resultat = ResultatSolveur('INCONNU' if incomplet else 'UNSAT', temps=time.perf_counter() - debut)
+    return resultat
@@ -0,0 +1,295 @@
+from lightup.index_grille import IndexGrille
+
+NIVEAUX_MESURES = {1: 'facile', 2: 'moyen', 3: 'difficile'}
+
+def _bits(masque):
+    """Cases (numéros) des bits à 1 d'un masque"""
+    while masque:
+        bit = masque & -masque
+        yield bit.bit_length() - 1
+        masque ^= bit
+
+def _nb_bits(masque):
+    return bin(masque).count('1')
+
+class MoteurDeduction:
+    """Déductions par niveaux sur une grille, sans solveur SAT.
+
+    Un état est un triplet d'entiers utilisés comme ensembles de cases (bit
+    c pour la case c): ampoules, cases interdites, cases éclairées. Copier
+    un état ou appliquer une règle à une case coûte quelques opérations sur
+    des entiers.
+
+    Niveau 1: règles simples jusqu'au point fixe (une ampoule interdit les
+    cases qu'elle voit, mur chiffré satisfait ou saturé, case sombre dont il
+    ne reste qu'un éclaireur possible, règle diagonale). Niveau 2:
+    anticipation par contradiction (une hypothèse dont la propagation
+    échoue fixe la valeur opposée). Niveau 3: recherche (branchement sur les
+    éclaireurs d'une case sombre, niveau 1 à chaque nœud).
+    """
+
+    def __init__(self, grille, index=None):
+        self.index = index = index or IndexGrille(grille)
+        L = index.L
+        segments = []  # segment -> masque de ses cases
+        for s in range(index.nb_segments):
+            masque = 0
+            for c in index.membres_segment(s):
+                masque |= 1 << c
+            segments.append(masque)
+        n = index.H * L
+        self.libres = 0
+        self.vue = [0] * n  # case -> masque des cases qu'elle voit
+        self.eclaire = [0] * n  # case -> masque des cases qu'une ampoule y éclaire
+        for c in range(n):
+            if not index.mur[c]:
+                self.libres |= 1 << c
+                self.eclaire[c] = segments[index.seg_ligne[c]] | segments[index.seg_colonne[c]]
+                self.vue[c] = self.eclaire[c] ^ 1 << c
+        self.murs = []  # (chiffre, masque des voisins, bits des voisins)
+        for k, c in enumerate(index.murs_chiffres):
+            bits = [1 << v for v in index.voisins_mur(k)]
+            self.murs.append((index.chiffre[c], sum(bits), bits))
+
+        # Règle diagonale: une ampoule en diagonale d'un mur vide les deux
+        # voisins du mur qu'elle touche; si les autres ne suffisent plus au
+        # chiffre, la case diagonale est interdite (forme seule)
+        self.diagonales = 0
+        for k, c in enumerate(index.murs_chiffres):
+            voisins = set(index.voisins_mur(k))
+            i, j = index.position(c)
+            for di, dj in ((-1, -1), (-1, 1), (1, -1), (1, 1)):
+                i2, j2 = i + di, j + dj
+                if 0 <= i2 < index.H and 0 <= j2 < L and not index.mur[i2 * L + j2]:
+                    if index.chiffre[c] > len(voisins - {i * L + j2, i2 * L + j}):
+                        self.diagonales |= 1 << (i2 * L + j2)
+
+    # Niveau 1
+
+    def placer(self, etat, c):
+        """État avec une ampoule en c (sans propagation), ou None si contradiction"""
+        if etat is None:
+            return None
+        ampoules, interdites, eclairees = etat
+        bit = 1 << c
+        if ampoules & bit:
+            return etat
+        if interdites & bit or self.vue[c] & ampoules:
+            return None
+        return ampoules | bit, interdites | self.vue[c], eclairees | self.eclaire[c]
+
+    def interdire(self, etat, c):
+        """État avec la case c interdite (sans propagation), ou None si contradiction"""
+        if etat is None or etat[0] >> c & 1:
+            return None
+        return etat[0], etat[1] | 1 << c, etat[2]
+
+    def propager(self, etat, depuis=None):
+        """Applique les règles simples jusqu'au point fixe; None si la grille est impossible.
+
+        Avec depuis (état avant la dernière hypothèse), seuls les murs et les
+        cases sombres touchés par les cases changées sont réexaminés.
+        """
+        if etat is None:
+            return None
+        zone = self.libres if depuis is None else (etat[0] ^ depuis[0]) | (etat[1] ^ depuis[1])
+        eclaire = self.eclaire
+        while zone:
+            avant = etat
+            for chiffre, masque, bits in self.murs:
+                if not masque & zone:
+                    continue
+                ampoules, interdites, eclairees = etat
+                inconnues = masque & ~(ampoules | interdites)
+                nb_ampoules = sum(1 for bit in bits if ampoules & bit)
+                if not inconnues:
+                    if nb_ampoules != chiffre:
+                        return None
+                    continue
+                nb_inconnues = _nb_bits(inconnues)
+                if nb_ampoules > chiffre or nb_ampoules + nb_inconnues < chiffre:
+                    return None
+                if nb_ampoules == chiffre:
+                    etat = ampoules, interdites | inconnues, eclairees
+                elif nb_ampoules + nb_inconnues == chiffre:
+                    for c in _bits(inconnues):
+                        etat = self.placer(etat, c)
+                    if etat is None:
+                        return None
+            zone |= (etat[0] ^ avant[0]) | (etat[1] ^ avant[1])
+            sombres = self.libres & ~etat[2]
+            while sombres:
+                bit = sombres & -sombres
+                sombres ^= bit
+                c = bit.bit_length() - 1
+                if not eclaire[c] & zone or etat[2] & bit:
+                    continue  # Éclaireurs inchangés, ou éclairée entre-temps
+                candidats = eclaire[c] & ~etat[1]
+                if not candidats:
+                    return None
+                if not candidats & (candidats - 1):
+                    etat = self.placer(etat, candidats.bit_length() - 1)
+                    if etat is None:
+                        return None
+            zone = (etat[0] ^ avant[0]) | (etat[1] ^ avant[1])
+        return etat
+
+    def depart(self):
+        """État après les règles simples sur la grille vide, ou None si impossible"""
+        # propager ne regarde que les murs qui ont des voisins libres
+        if self.index.mur_impossible():
+            return None
+        return self.propager((0, self.diagonales, 0))
+
+    def inconnues(self, etat):
+        """Masque des cases encore indéterminées"""
+        return self.libres & ~(etat[0] | etat[1])
+
+    # Niveau 2
+
+    def anticiper(self, etat):
+        """Anticipation par contradiction jusqu'au point fixe: (état ou None si impossible, cases fixées).
+
+        Une case dont l'ampoule (ou son absence) mène à une contradiction reçoit
+        la valeur opposée, propagée au niveau 1. Une hypothèse déjà obtenue
+        par un essai réussi du même passage ne peut pas échouer (la
+        propagation est monotone): elle n'est pas réessayée.
+        """
+        fixees = 0
+        progres = True
+        while progres:
+            progres = False
+            deja = [0, 0]  # Ampoules et interdictions obtenues par les essais réussis du passage
+            for c in _bits(self.inconnues(etat)):
+                if not self.inconnues(etat) >> c & 1:
+                    continue  # Fixée par une déduction de ce passage
+                for hypothese, opposee in ((0, self.interdire), (1, self.placer)):
+                    if deja[hypothese] >> c & 1:
+                        continue
+                    essai = self.propager(self.placer(etat, c) if hypothese == 0 else self.interdire(etat, c), etat)
+                    if essai is not None:
+                        deja[0] |= essai[0]
+                        deja[1] |= essai[1]
+                        continue
+                    etat = self.propager(opposee(etat, c), etat)
+                    fixees += 1
+                    if etat is None:
+                        return None, fixees
+                    progres = True
+                    deja = [0, 0]
+                    break
+        return etat, fixees
+
+    # Niveau 3
+
+    def chercher(self, etat, max_noeuds, compteur):
+        """Recherche en profondeur (niveau 1 à chaque nœud): état résolu ou None.
+
+        compteur[0] compte les nœuds; au-delà de max_noeuds la recherche est
+        interrompue par OverflowError.
+        """
+        compteur[0] += 1
+        if compteur[0] > max_noeuds:
+            raise OverflowError
+        if not self.inconnues(etat):
+            return etat
+        # Case sombre qui a le moins d'éclaireurs possibles
+        cible = min(_bits(self.libres & ~etat[2]), key=lambda c: _nb_bits(self.eclaire[c] & ~etat[1]))
+        for m in _bits(self.eclaire[cible] & ~etat[1]):
+            essai = self.propager(self.placer(etat, m), etat)
+            if essai is not None:
+                trouve = self.chercher(essai, max_noeuds, compteur)
+                if trouve is not None:
+                    return trouve
+            # Cet éclaireur est exclu pour les branches suivantes
+            etat = self.propager(self.interdire(etat, m), etat)
+            if etat is None:
+                return None
+        return None
+
+    def ampoules(self, etat):
+        """Cases (i, j) des ampoules de l'état"""
+        return [self.index.position(c) for c in _bits(etat[0])]
+
+class Note:
+    """Difficulté mesurée d'une grille.
+
+    niveau: niveau le plus élevé nécessaire (1 règles simples, 2
+    anticipation, 3 recherche); etapes: cases fixées à chaque niveau (nœuds
+    de recherche pour le niveau 3); statut: 'SAT', 'UNSAT' ou 'INCONNU'
+    (recherche interrompue); ampoules: cases (i, j) de la solution trouvée.
+    """
+    __slots__ = ('niveau', 'etapes', 'statut', 'ampoules')
+
+    def __init__(self, niveau, etapes, statut, ampoules=None):
+        self.niveau = niveau
+        self.etapes = etapes
+        self.statut = statut
+        self.ampoules = ampoules
+
+    @property
+    def unique(self):
+        """Solution obtenue sans recherche, donc unique"""
+        return self.statut == 'SAT' and self.niveau < 3
+
+    @property
+    def score(self):
+        """Clé de tri: niveau, puis étapes à ce niveau"""
+        return self.niveau, self.etapes[self.niveau - 1]
+
+    def difficulte(self):
+        """'facile', 'moyen' ou 'difficile' d'après le niveau nécessaire"""
+        return NIVEAUX_MESURES[self.niveau]
+
+    def vers_dict(self):
+        return {'niveau': self.niveau, 'etapes': list(self.etapes), 'statut': self.statut,
+                'difficulte': self.difficulte()}
+
+def noter(grille, max_noeuds=10000, index=None):
+    """Note une grille (texte ou GrilleCompacte) par le niveau de déduction nécessaire.
+
+    Les niveaux 1 et 2 suffisent souvent à conclure (solution unique ou
+    impossibilité) sans solveur SAT; le niveau 3 est une recherche bornée à
+    max_noeuds nœuds (statut INCONNU au-delà, et dès le niveau 3 si
+    max_noeuds vaut 0).
+    """
+    moteur = MoteurDeduction(grille, index)
+    etat = moteur.depart()
+    if etat is None:
+        return Note(1, [0, 0, 0], 'UNSAT')
+    etapes = [_nb_bits(etat[0] | etat[1]), 0, 0]
+    if not moteur.inconnues(etat):
+        return Note(1, etapes, 'SAT', moteur.ampoules(etat))
+
+    etat, etapes[1] = moteur.anticiper(etat)
+    if etat is None:
+        return Note(2, etapes, 'UNSAT')
+    if not moteur.inconnues(etat):
+        return Note(2, etapes, 'SAT', moteur.ampoules(etat))
+
+    compteur = [0]
+    try:
+        solution = moteur.chercher(etat, max_noeuds, compteur)
+    except OverflowError:
+        solution = False
+    etapes[2] = min(compteur[0], max_noeuds)
+    if solution is False:
+        return Note(3, etapes, 'INCONNU')
+    if solution is None:
+        return Note(3, etapes, 'UNSAT')
+    return Note(3, etapes, 'SAT', moteur.ampoules(solution))
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    from lightup.grille_compacte import lire_grille
+
+    if len(sys.argv) < 2:
+        print("usage: python3 difficulte.py GRILLE...")
+        sys.exit(2)
+    debut = time.perf_counter()
+    for nom_fichier in sys.argv[1:]:
+        note = noter(lire_grille(nom_fichier))
+        print(f"{nom_fichier}: niveau {note.niveau} ({note.difficulte()}), étapes {note.etapes}, {note.statut}")
+    print(f"{len(sys.argv) - 1} grille(s) notée(s) en {time.perf_counter() - debut:.3f} s")
@@ -1,10 +1,14 @@
+import time
 from itertools import combinations
 
-def lire_grille(nom_fichier):
-    """Lit une grille à partir d'un fichier"""
-    with open(nom_fichier, 'r') as f:
-        lignes = [ligne.strip().split() for ligne in f.readlines()]
-    return lignes
+from lightup import instrumentation
+from lightup.grille_compacte import lire_grille
+from lightup.index_grille import IndexGrille
+from lightup.renforcement import clauses_impliquees
+from lightup.solveurs import resoudre_cnf
+from lightup.symetries import clauses_symetries, detecter_symetries
+from lightup.verification import decrire_erreur, lister_erreurs_solution
+from pretraitement import pretraiter as pretraiter_cnf
 
 def est_dans_grille(i, j, H, L):
     """Vérifie si les coordonnées sont dans la grille"""
@@ -23,155 +27,206 @@ def mur_chiffre(cellule):
     """Vérifie si la cellule est un mur avec un chiffre"""
     return cellule.startswith('#') and len(cellule) > 1
 
-def generer_dimacs(grille):
-    """Génère le problème SAT au format DIMACS"""
-    H = len(grille)
-    L = len(grille[0])
+def generer_dimacs(grille, renforcer=False, briser_symetries=False):
+    """Génère le problème SAT au format DIMACS (renforcer: ajoute les clauses impliquées).
+
+    briser_symetries ajoute des clauses lex-leader si la grille est symétrique
+    (rotations, réflexions): une solution par classe symétrique est gardée.
+    Désactivé par défaut, pour que le CNF et la numérotation des variables
+    restent ceux de l'encodage; la ligne de commande l'active.
+    Retourne (var_map, clauses), (None, None) si la grille est invalide.
+    """
+    return _generer_dimacs(grille, renforcer, briser_symetries, False)[:2]
+
+def generer_dimacs_pretraite(grille, renforcer=False, briser_symetries=False):
+    """Comme generer_dimacs, avec le CNF simplifié avant l'écriture (voir pretraitement.py).
+
+    Retourne (var_map, clauses, table): table.reconstruire() ramène le modèle
+    de MiniSAT aux variables de var_map. Les clauses retournées restent celles
+    de l'encodage. (None, None, None) si la grille est invalide.
+    """
+    return _generer_dimacs(grille, renforcer, briser_symetries, True)
+
+def _generer_dimacs(grille, renforcer, briser_symetries, pretraiter):
+    index = IndexGrille(grille)
+    L = index.L
     clauses = []
     var_map = {}
-    var_id = 1
+    var_case = [0] * (index.H * L)
 
     print("\n=== PHASE 1: Création des variables ===")
-    # Création d'une variable pour chaque case blanche
-    for i in range(H):
-        for j in range(L):
-            if case_est_blanche(grille[i][j]):
-                var_map[(i, j)] = var_id
-                print(f"Case blanche en ({i},{j}) → variable {var_id}")
-                var_id += 1
+    with instrumentation.chrono("phase1_variables"):
+        # Création d'une variable pour chaque case blanche
+        for c in range(index.H * L):
+            if not index.mur[c]:
+                var_case[c] = len(var_map) + 1
+                i, j = divmod(c, L)
+                var_map[(i, j)] = var_case[c]
+                print(f"Case blanche en ({i},{j}) → variable {var_case[c]}")
+        var_id = len(var_map) + 1
 
     print("\n=== PHASE 2: Contraintes d'alignement ===")
-    # Pour chaque paire de cases blanches alignées sans mur entre elles,
-    # interdire d'avoir des ampoules sur les deux cases
-    for (i, j), v1 in var_map.items():
-        for di, dj in [(-1,0),(1,0),(0,-1),(0,1)]:
-            ni, nj = i+di, j+dj
-            while est_dans_grille(ni, nj, H, L):
-                if not case_est_blanche(grille[ni][nj]):
-                    break  # On s'arrête aux murs
-                v2 = var_map[(ni, nj)]
-                clauses.append([-v1, -v2])
-                print(f"Interdiction ampoules alignées: ({i},{j}) var{v1} et ({ni},{nj}) var{v2}")
-                ni += di
-                nj += dj
+    with instrumentation.chrono("phase2_alignement"):
+        # Pour chaque paire de cases blanches d'un même segment,
+        # interdire d'avoir des ampoules sur les deux cases
+        for (i, j), v1 in var_map.items():
+            for direction in index.directions(i * L + j):
+                for c2 in direction:
+                    ni, nj = divmod(c2, L)
+                    v2 = var_case[c2]
+                    clauses.append([-v1, -v2])
+                    print(f"Interdiction ampoules alignées: ({i},{j}) var{v1} et ({ni},{nj}) var{v2}")
 
     print("\n=== PHASE 3: Contraintes d'éclairage ===")
-    # Chaque case blanche doit être éclairée par au moins une ampoule
-    # (soit elle contient une ampoule, soit une ampoule l'éclaire)
-    for (i, j), v in var_map.items():
-        sources = [v]  # L'ampoule peut être sur cette case
-        for di, dj in [(-1,0),(1,0),(0,-1),(0,1)]:
-            ni, nj = i+di, j+dj
-            while est_dans_grille(ni, nj, H, L):
-                if not case_est_blanche(grille[ni][nj]):
-                    break  # On s'arrête aux murs
-                sources.append(var_map[(ni, nj)])  # Ou une ampoule depuis cette direction
-                ni += di
-                nj += dj
-        clauses.append(sources)
-        print(f"Case ({i},{j}) var{v} doit être éclairée par: {sources}")
+    with instrumentation.chrono("phase3_eclairage"):
+        # Chaque case blanche doit être éclairée par au moins une ampoule
+        # (soit elle contient une ampoule, soit une ampoule de ses segments l'éclaire)
+        for (i, j), v in var_map.items():
+            sources = [v] + [var_case[c2] for c2 in index.visibles(i * L + j)]
+            clauses.append(sources)
+            print(f"Case ({i},{j}) var{v} doit être éclairée par: {sources}")
 
     print("\n=== PHASE 4: Contraintes des murs chiffrés ===")
-    # Pour chaque mur avec un chiffre, exactement N cases adjacentes doivent avoir une ampoule
-    for i in range(H):
-        for j in range(L):
-            if mur_chiffre(grille[i][j]):
-                chiffre = int(grille[i][j][1:])
-                # Ne considérer que les cases blanches adjacentes
-                cases_voisines = [(ni,nj) for ni,nj in voisins(i,j,H,L) if (ni,nj) in var_map]
-                vars_voisins = [var_map[pos] for pos in cases_voisines]
-                
-                print(f"\nMur #{chiffre} en ({i},{j})")
-                print(f"Cases voisines: {cases_voisines}")
-                print(f"Variables voisines: {vars_voisins}")
-
-                if chiffre > len(vars_voisins):
-                    print(f"ERREUR: Mur #{chiffre} nécessite {chiffre} voisins mais seulement {len(vars_voisins)} disponibles")
-                    return None
-
-                # Pour implémenter "exactement N ampoules", nous avons besoin de:
-                # 1. "Au moins N ampoules" ET
-                # 2. "Au plus N ampoules"
-
-                # 1. Au moins 'chiffre' ampoules
-                if chiffre > 0:
-                    # Toutes les combinaisons de (len(vars_voisins) - chiffre + 1) variables ne peuvent pas être toutes fausses
-                    for comb in combinations(vars_voisins, len(vars_voisins) - chiffre + 1):
-                        # Pour chaque combinaison, au moins une variable doit être vraie
-                        clause = list(comb)
-                        clauses.append(clause)
-                        print(f"Clause 'au moins {chiffre}': {clause}")
-
-                # 2. Au plus 'chiffre' ampoules
-                if chiffre < len(vars_voisins):
-                    # Toutes les combinaisons de (chiffre + 1) variables ne peuvent pas être toutes vraies
-                    for comb in combinations(vars_voisins, chiffre + 1):
-                        # Pour chaque combinaison, au moins une variable doit être fausse
-                        clause = [-v for v in comb]
-                        clauses.append(clause)
-                        print(f"Clause 'au plus {chiffre}': {clause}")
-
-                # Si chiffre est 0, on ajoute une clause pour chaque variable
-                # indiquant qu'elle doit être fausse
-                if chiffre == 0:
-                    for v in vars_voisins:
-                        clauses.append([-v])
-                        print(f"Clause 'exactement 0': {[-v]}")
+    with instrumentation.chrono("phase4_murs"):
+        # Pour chaque mur avec un chiffre, exactement N cases adjacentes doivent avoir une ampoule
+        for k, c in enumerate(index.murs_chiffres):
+            i, j = divmod(c, L)
+            chiffre = index.chiffre[c]
+            # Ne considérer que les cases blanches adjacentes
+            cases_voisines = [divmod(c2, L) for c2 in index.voisins_mur(k)]
+            vars_voisins = [var_case[c2] for c2 in index.voisins_mur(k)]
+        
+            print(f"\nMur #{chiffre} en ({i},{j})")
+            print(f"Cases voisines: {cases_voisines}")
+            print(f"Variables voisines: {vars_voisins}")
+
+            if chiffre > len(vars_voisins):
+                print(f"ERREUR: Mur #{chiffre} nécessite {chiffre} voisins mais seulement {len(vars_voisins)} disponibles")
+                return None, None, None
+
+            # Pour implémenter "exactement N ampoules", nous avons besoin de:
+            # 1. "Au moins N ampoules" ET
+            # 2. "Au plus N ampoules"
+
+            # 1. Au moins 'chiffre' ampoules
+            if chiffre > 0:
+                # Toutes les combinaisons de (len(vars_voisins) - chiffre + 1) variables ne peuvent pas être toutes fausses
+                for comb in combinations(vars_voisins, len(vars_voisins) - chiffre + 1):
+                    # Pour chaque combinaison, au moins une variable doit être vraie
+                    clause = list(comb)
+                    clauses.append(clause)
+                    print(f"Clause 'au moins {chiffre}': {clause}")
+
+            # 2. Au plus 'chiffre' ampoules
+            if chiffre < len(vars_voisins):
+                # Toutes les combinaisons de (chiffre + 1) variables ne peuvent pas être toutes vraies
+                for comb in combinations(vars_voisins, chiffre + 1):
+                    # Pour chaque combinaison, au moins une variable doit être fausse
+                    clause = [-v for v in comb]
+                    clauses.append(clause)
+                    print(f"Clause 'au plus {chiffre}': {clause}")
+
+            # Si chiffre est 0, on ajoute une clause pour chaque variable
+            # indiquant qu'elle doit être fausse
+            if chiffre == 0:
+                for v in vars_voisins:
+                    clauses.append([-v])
+                    print(f"Clause 'exactement 0': {[-v]}")
+
+    if renforcer:
+        print("\n=== PHASE 4b: Clauses impliquées (règles du jeu) ===")
+        with instrumentation.chrono("phase4b_renforcement"):
+            impliquees = clauses_impliquees(grille, var_map, index)
+            clauses.extend(impliquees)
+            instrumentation.compter("clauses_impliquees", len(impliquees))
+            print(f"{len(impliquees)} clauses impliquées ajoutées")
+
+    nb_aux = 0
+    if briser_symetries:
+        print("\n=== PHASE 4c: Symétries de la grille ===")
+        with instrumentation.chrono("phase4c_symetries"):
+            symetries = detecter_symetries(grille)
+            symetriques, nb_aux = clauses_symetries(grille, var_map, symetries)
+            clauses.extend(symetriques)
+            instrumentation.compter("clauses_symetries", len(symetriques))
+            print(f"Symétries: {', '.join(symetries) or 'aucune'}")
+            print(f"{len(symetriques)} clauses lex-leader, {nb_aux} variables auxiliaires")
+
+    nb_vars = var_id - 1 + nb_aux
+    a_ecrire, table = clauses, None
+    if pretraiter:
+        print("\n=== PHASE 4d: Prétraitement du CNF ===")
+        with instrumentation.chrono("phase4d_pretraitement"):
+            a_ecrire, table, stats = pretraiter_cnf(clauses, nb_vars)
+            for nom, valeur in stats.items():
+                instrumentation.compter(f"pretraitement_{nom}", valeur)
+            print(f"Doublons: {stats['doublons']}, tautologies: {stats['tautologies']}, "
+                  f"satisfaites par propagation: {stats['satisfaites']}, subsumées: {stats['subsumees']}")
+            print(f"Variables fixées: {stats['variables_fixees']}")
+            print(f"Clauses: {stats['clauses_avant']} -> {stats['clauses_apres']}, "
+                  f"littéraux: {stats['litteraux_avant']} -> {stats['litteraux_apres']}, "
+                  f"variables: {stats['variables_avant']} -> {stats['variables_apres']}")
+            nb_vars = stats['variables_apres']
 
     print("\n=== PHASE 5: Génération du fichier DIMACS ===")
-    nb_vars = var_id - 1
-    nb_clauses = len(clauses)
+    with instrumentation.chrono("phase5_dimacs"):
+        nb_clauses = len(a_ecrire)
+
+        with instrumentation.chrono("ecriture_cnf"), open("output.cnf", "w") as f:
+            f.write(f"p cnf {nb_vars} {nb_clauses}\n")
+            for clause in a_ecrire:
+                f.write(" ".join(map(str, clause)) + " 0\n")
+        instrumentation.compter("variables", nb_vars)
+        instrumentation.compter("clauses", nb_clauses)
 
-    with open("output.cnf", "w") as f:
-        f.write(f"p cnf {nb_vars} {nb_clauses}\n")
-        for clause in clauses:
-            f.write(" ".join(map(str, clause)) + " 0\n")
+        print(f"Fichier généré: {nb_vars} variables, {nb_clauses} clauses")
+        print("Clauses générées:")
+        for i, clause in enumerate(a_ecrire, 1):
+            print(f"{i}: {clause}")
 
-    print(f"Fichier généré: {nb_vars} variables, {nb_clauses} clauses")
-    print("Clauses générées:")
-    for i, clause in enumerate(clauses, 1):
-        print(f"{i}: {clause}")
+    return var_map, clauses, table  # Retourne var_map pour l'utiliser plus tard
 
-    return var_map, clauses  # Retourne var_map pour l'utiliser plus tard
+def appeler_sat_solver(nom_fichier="output.cnf", strategie="simple", budget=None, grille=None, var_map=None):
+    """Appelle un solveur SAT externe (MiniSAT par défaut) et retourne le résultat
 
-def appeler_sat_solver(nom_fichier="output.cnf"):
-    """Appelle un solveur SAT externe (MiniSAT par défaut) et retourne le résultat"""
+    strategie: "simple" (MiniSAT seul), "portfolio" (plusieurs solveurs en
+    parallèle, le premier qui répond gagne) ou "cubes" (cube-and-conquer:
+    cubes résolus en parallèle); budget en secondes. Avec la grille et le
+    var_map du CNF, le portfolio fait aussi courir les autres encodages.
+    """
     try:
-        import subprocess
-        # Vérifiez que MiniSAT est installé
-        print("Exécution de MiniSAT avec la commande: minisat", nom_fichier, "solution.txt")
-        result = subprocess.run(["minisat", nom_fichier, "solution.txt"], 
-                              stdout=subprocess.PIPE, stderr=subprocess.PIPE, 
-                              text=True, check=False)
+        if strategie == "portfolio":
+            import portfolio
+            print("Exécution du portfolio de solveurs sur", nom_fichier)
+            resultat = portfolio.resoudre_portfolio(nom_fichier, budget=budget, grille=grille, var_map=var_map)
+            print("Configuration gagnante:", resultat.configuration)
+        elif strategie == "cubes":
+            import cubes
+            print("Exécution en cube-and-conquer sur", nom_fichier)
+            resultat = cubes.resoudre_cubes(nom_fichier, budget=budget)
+            print("Nombre de cubes:", resultat.cubes)
+        else:
+            # Vérifiez que MiniSAT est installé
+            print("Exécution de MiniSAT avec la commande: minisat", nom_fichier, "solution.txt")
+            resultat = resoudre_cnf(nom_fichier, "solution.txt", timeout=budget)
         
-        print("Retour standard de MiniSAT:", result.stdout)
-        print("Erreur standard de MiniSAT:", result.stderr)
+        print("Retour standard de MiniSAT:", resultat.sortie)
+        print("Erreur standard de MiniSAT:", resultat.erreurs)
         
         # Vérifiez si le problème est satisfiable
-        if "UNSATISFIABLE" in result.stdout or "UNSAT" in result.stderr:
+        if resultat.statut == 'UNSAT':
             print("Le problème n'a pas de solution.")
             return None
-            
-        # Lire la solution
-        print("Lecture du fichier solution.txt")
-        with open("solution.txt", "r") as f:
-            lines = f.readlines()
-            if len(lines) > 0:
-                if lines[0].strip() == "SAT":
-                    if len(lines) > 1:
-                        solution = lines[1].strip().split()
-                        variables_vraies = [int(x) for x in solution if int(x) > 0]
-                        print(f"Variables vraies dans la solution: {variables_vraies}")
-                        return [int(x) for x in solution if x != "0"]
-                    else:
-                        print("Attention: Fichier solution sans valeurs")
-                        return []
-                else:
-                    print("Format de solution inattendu:", lines)
-                    return None
-            else:
-                print("Fichier solution vide")
-                return None
+        if resultat.statut != 'SAT':
+            print("Aucune réponse du solveur (budget dépassé ou format de solution inattendu)")
+            return None
+        
+        if not resultat.modele:
+            print("Attention: Fichier solution sans valeurs")
+            return []
+        variables_vraies = [x for x in resultat.modele if x > 0]
+        print(f"Variables vraies dans la solution: {variables_vraies}")
+        return resultat.modele
     except FileNotFoundError:
         print("Erreur: MiniSAT n'est pas installé ou n'est pas dans le PATH.")
         print("Veuillez installer MiniSAT (apt-get install minisat) ou un autre solveur SAT compatible.")
@@ -209,26 +264,18 @@ def interpreter_solution(solution, grille, var_map):
                 i, j = coord_map[var]
                 solution_grille[i][j] = 'A'  # 'A' pour ampoule
                 print(f"Placement d'une ampoule en ({i},{j}) [var{var}]")
-            else:
+            elif var <= len(var_map):  # Au-delà: variables auxiliaires (symétries)
                 print(f"ATTENTION: Variable {var} non trouvée dans le mapping")
     
-    # Marquer les cases éclairées
+    # Marquer les cases éclairées: toute case d'un segment contenant une ampoule
+    index = IndexGrille(solution_grille)
+    ampoules = [index.case(*coord_map[var]) for var in solution if var > 0 and var in coord_map]
+    comptes = index.segments_allumes(ampoules)
     for i in range(H):
         for j in range(L):
-            if solution_grille[i][j] == 'A':
-                # Marquer la case de l'ampoule comme éclairée
-                # Éclairer dans les 4 directions
-                for di, dj in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-                    ni, nj = i + di, j + dj
-                    while est_dans_grille(ni, nj, H, L):
-                        # S'arrêter aux murs
-                        if solution_grille[ni][nj].startswith('#'):
-                            break
-                        # Marquer comme éclairé si ce n'est pas une ampoule
-                        if solution_grille[ni][nj] != 'A':
-                            solution_grille[ni][nj] = '*'
-                        ni += di
-                        nj += dj
+            c = i * L + j
+            if not index.mur[c] and solution_grille[i][j] != 'A' and index.eclairee(c, comptes):
+                solution_grille[i][j] = '*'
     
     return solution_grille
 
@@ -239,47 +286,10 @@ def afficher_grille(grille):
 
 def verifier_solution(solution_grille):
     """Vérifie si la solution est valide"""
-    H = len(solution_grille)
-    L = len(solution_grille[0])
-    
-    est_valide = True
-    
-    # Vérifier que toutes les cases blanches sont éclairées
-    for i in range(H):
-        for j in range(L):
-            if solution_grille[i][j] == ' ':  # Case blanche non éclairée
-                print(f"ERREUR: Case ({i},{j}) non éclairée")
-                est_valide = False
-    
-    # Vérifier que les ampoules ne s'éclairent pas entre elles
-    for i in range(H):
-        for j in range(L):
-            if solution_grille[i][j] == 'A':
-                # Vérifier dans les 4 directions
-                for di, dj in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-                    ni, nj = i + di, j + dj
-                    while est_dans_grille(ni, nj, H, L):
-                        # S'arrêter aux murs
-                        if solution_grille[ni][nj].startswith('#'):
-                            break
-                        if solution_grille[ni][nj] == 'A':  # Une autre ampoule est visible
-                            print(f"ERREUR: Ampoules ({i},{j}) et ({ni},{nj}) s'éclairent mutuellement")
-                            est_valide = False
-                        ni += di
-                        nj += dj
-    
-    # Vérifier les contraintes de murs chiffrés
-    for i in range(H):
-        for j in range(L):
-            if solution_grille[i][j].startswith('#') and len(solution_grille[i][j]) > 1:
-                chiffre = int(solution_grille[i][j][1:])
-                ampoules_adjacentes = sum(1 for ni, nj in voisins(i, j, H, L) 
-                                       if est_dans_grille(ni, nj, H, L) and solution_grille[ni][nj] == 'A')
-                if ampoules_adjacentes != chiffre:
-                    print(f"ERREUR: Mur ({i},{j}) avec chiffre {chiffre} a {ampoules_adjacentes} ampoules adjacentes")
-                    est_valide = False
-    
-    return est_valide
+    erreurs = lister_erreurs_solution(solution_grille)
+    for erreur in erreurs:
+        print(f"ERREUR: {decrire_erreur(erreur)}")
+    return not erreurs
 
 def afficher_etat_solver(grille, solution=None, var_map=None):
     """Affiche l'état du solveur pour le débogage"""
@@ -353,15 +363,30 @@ def visualiser_contraintes(grille, var_map, clauses):
                 
                 print(description)
 
-def resoudre_light_up(nom_fichier):
+def resoudre_light_up(nom_fichier, strategie="simple", budget=None, renforcer=False, briser_symetries=False,
+                      pretraiter=False):
     """Fonction principale pour résoudre un puzzle Light Up"""
     print("=== LECTURE DE LA GRILLE ===")
     grille = lire_grille(nom_fichier)
     print("Grille initiale:")
     afficher_grille(grille)
     
+    if strategie == "locale":
+        resoudre_light_up_locale(grille, budget)
+        return
+    if strategie == "bandes":
+        resoudre_light_up_bandes(grille)
+        return
+    if strategie == "cegar":
+        resoudre_light_up_cegar(grille, budget, briser_symetries)
+        return
+    
     print("\n=== GÉNÉRATION DU PROBLÈME SAT ===")
-    var_map, clauses = generer_dimacs(grille)
+    table = None
+    if pretraiter:
+        var_map, clauses, table = generer_dimacs_pretraite(grille, renforcer, briser_symetries)
+    else:
+        var_map, clauses = generer_dimacs(grille, renforcer, briser_symetries)
     
     if var_map is None:
         print("Impossible de générer le problème SAT. La grille est probablement invalide.")
@@ -371,19 +396,26 @@ def resoudre_light_up(nom_fichier):
     # visualiser_contraintes(grille, var_map, clauses)
     
     print("\n=== APPEL DU SOLVEUR SAT ===")
-    solution = appeler_sat_solver()
+    # Les modèles des autres encodages ne passent pas par la table du prétraitement
+    solution = appeler_sat_solver(strategie=strategie, budget=budget, grille=None if pretraiter else grille,
+                                  var_map=None if pretraiter else var_map)
+    if solution is not None and pretraiter:
+        solution = table.reconstruire(solution)
     
     if solution is not None:
         print("\n=== SOLUTION TROUVÉE ===")
         print(f"Solution brute de MiniSAT: {solution}")
         afficher_etat_solver(grille, solution, var_map)
         
-        solution_grille = interpreter_solution(solution, grille, var_map)
+        with instrumentation.chrono("interpretation"):
+            solution_grille = interpreter_solution(solution, grille, var_map)
         print("Grille solution:")
         afficher_grille(solution_grille)
         
         print("\n=== VÉRIFICATION DE LA SOLUTION ===")
-        if verifier_solution(solution_grille):
+        with instrumentation.chrono("verification"):
+            valide = verifier_solution(solution_grille)
+        if valide:
             print("La solution est VALIDE !")
         else:
             print("La solution est INVALIDE !")
@@ -393,11 +425,162 @@ def resoudre_light_up(nom_fichier):
     else:
         print("Aucune solution n'a été trouvée.")
 
+def resoudre_light_up_locale(grille, budget=None):
+    """Résout une grille supposée solvable par recherche locale, sans passer par DIMACS.
+
+    Sans budget, la recherche abandonne après recherche_locale.BUDGET_DEFAUT secondes.
+    """
+    from recherche_locale import BUDGET_DEFAUT, grille_solution, resoudre_recherche_locale
+
+    if budget is None:
+        budget = BUDGET_DEFAUT
+
+    print("\n=== RECHERCHE LOCALE ===")
+    debut = time.perf_counter()
+    with instrumentation.chrono("recherche_locale"):
+        ampoules, nb_bascules = resoudre_recherche_locale(grille, budget=budget)
+    print(f"{nb_bascules} bascules en {time.perf_counter() - debut:.2f} s")
+    instrumentation.compter("bascules", nb_bascules)
+    
+    if ampoules is None:
+        print("Budget épuisé: aucune solution trouvée par la recherche locale.")
+        return
+    
+    print("\n=== SOLUTION TROUVÉE ===")
+    solution_grille = grille_solution(grille, ampoules)
+    print("Grille solution:")
+    afficher_grille(solution_grille)
+    
+    print("\n=== VÉRIFICATION DE LA SOLUTION ===")
+    with instrumentation.chrono("verification"):
+        valide = verifier_solution(solution_grille)
+    print("La solution est VALIDE !" if valide else "La solution est INVALIDE !")
+
+def resoudre_light_up_bandes(grille, hauteur_bande=40):
+    """Résout une très grande grille par bandes encodées séparément puis recollées"""
+    from bandes import comparer_memoire, resoudre_par_bandes
+    from recherche_locale import grille_solution
+
+    print("\n=== RÉSOLUTION PAR BANDES ===")
+    with instrumentation.chrono("bandes"):
+        statut, ampoules, rapport = resoudre_par_bandes(grille, hauteur_bande)
+    print(f"{rapport['bandes']} bandes, {rapport['tours']} tours, {rapport['resolutions']} résolutions, "
+          f"{rapport['blocages']} clauses de blocage en {rapport['temps']:.2f} s")
+    memoire = comparer_memoire(grille, hauteur_bande)
+    print(f"Pic mémoire: {memoire['bandes'] / 1024:.1f} Mo pour la plus grosse bande, "
+          f"{memoire['monolithique'] / 1024:.1f} Mo en monolithique")
+    
+    if statut != 'SAT':
+        print("Aucune solution n'a été trouvée.")
+        return
+    
+    print("\n=== SOLUTION TROUVÉE ===")
+    solution_grille = grille_solution(grille, ampoules)
+    print("Grille solution:")
+    afficher_grille(solution_grille)
+    
+    print("\n=== VÉRIFICATION DE LA SOLUTION ===")
+    with instrumentation.chrono("verification"):
+        valide = verifier_solution(solution_grille)
+    print("La solution est VALIDE !" if valide else "La solution est INVALIDE !")
+
+def resoudre_light_up_cegar(grille, budget=None, briser_symetries=False):
+    """Résout une grille en ajoutant les clauses d'alignement à la demande (voir cegar.py)"""
+    from cegar import resoudre_cegar
+    from recherche_locale import grille_solution
+
+    print("\n=== RÉSOLUTION CEGAR (alignement paresseux) ===")
+    with instrumentation.chrono("cegar"):
+        resultat = resoudre_cegar(grille, budget, briser_symetries)
+    print(f"{resultat.iterations} itérations en {resultat.temps:.2f} s")
+    print(f"Clauses: {resultat.clauses_initiales} au départ + {resultat.clauses_ajoutees} d'alignement ajoutées, "
+          f"contre {resultat.clauses_eager} pour l'encodage complet")
+    instrumentation.compter("iterations_cegar", resultat.iterations)
+    instrumentation.compter("clauses_ajoutees", resultat.clauses_ajoutees)
+    
+    if resultat.statut != 'SAT':
+        print("Le problème n'a pas de solution." if resultat.statut == 'UNSAT' else "Aucune solution n'a été trouvée.")
+        return
+    
+    print("\n=== SOLUTION TROUVÉE ===")
+    solution_grille = grille_solution(grille, resultat.ampoules)
+    print("Grille solution:")
+    afficher_grille(solution_grille)
+    
+    print("\n=== VÉRIFICATION DE LA SOLUTION ===")
+    with instrumentation.chrono("verification"):
+        valide = verifier_solution(solution_grille)
+    print("La solution est VALIDE !" if valide else "La solution est INVALIDE !")
+
 if __name__ == "__main__":
     import sys
-    if len(sys.argv) > 1:
-        nom_fichier = sys.argv[1]
+    args = sys.argv[1:]
+    
+    # --stats [fichier.json]: mesure le temps de chaque étape et les statistiques du solveur
+    fichier_stats = None
+    if '--stats' in args:
+        position = args.index('--stats')
+        args.pop(position)
+        instrumentation.activer()
+        fichier_stats = args.pop(position) if position < len(args) and args[position].endswith('.json') else ""
+    
+    # --portfolio: plusieurs solveurs en course; --budget SECONDES: temps maximal de résolution
+    strategie = "simple"
+    if '--portfolio' in args:
+        args.remove('--portfolio')
+        strategie = "portfolio"
+    # --journal-portfolio [FICHIER.jsonl]: ajoute chaque course du portfolio au journal (portfolio.jsonl par défaut)
+    if '--journal-portfolio' in args:
+        import portfolio
+        position = args.index('--journal-portfolio')
+        args.pop(position)
+        portfolio.journaliser(args.pop(position) if position < len(args) and args[position].endswith('.jsonl')
+                              else portfolio.FICHIER_JOURNAL)
+    # --cubes: cube-and-conquer (cubes choisis par anticipation, résolus en parallèle)
+    if '--cubes' in args:
+        args.remove('--cubes')
+        strategie = "cubes"
+    # --locale: recherche locale directement sur la grille (grandes grilles solvables)
+    if '--locale' in args:
+        args.remove('--locale')
+        strategie = "locale"
+    # --bandes: découpage en bandes résolues en parallèle puis recollées (très grandes grilles)
+    if '--bandes' in args:
+        args.remove('--bandes')
+        strategie = "bandes"
+    # --cegar: clauses d'alignement ajoutées à la demande, résolution incrémentale
+    if '--cegar' in args:
+        args.remove('--cegar')
+        strategie = "cegar"
+    # --renforcer: ajoute les clauses impliquées par les règles du jeu
+    renforcer = '--renforcer' in args
+    if renforcer:
+        args.remove('--renforcer')
+    # --sans-symetries: pas de clauses lex-leader pour les grilles symétriques
+    briser_symetries = '--sans-symetries' not in args
+    if not briser_symetries:
+        args.remove('--sans-symetries')
+    # --pretraiter: doublons, subsomption et propagation unitaire avant l'écriture du CNF
+    pretraiter = '--pretraiter' in args
+    if pretraiter:
+        args.remove('--pretraiter')
+    budget = None
+    if '--budget' in args:
+        position = args.index('--budget')
+        args.pop(position)
+        budget = float(args.pop(position))
+    
+    if args:
+        nom_fichier = args[0]
     else:
         nom_fichier = input("Entrez le nom du fichier de grille: ")
     
-    resoudre_light_up(nom_fichier)
\ No newline at end of file
+    with instrumentation.chrono("total"):
+        resoudre_light_up(nom_fichier, strategie, budget, renforcer, briser_symetries, pretraiter)
+    
+    if fichier_stats is not None:
+        print()
+        instrumentation.afficher_rapport()
+        if fichier_stats:
+            instrumentation.exporter_json(fichier_stats)
+            print(f"Mesures exportées dans '{fichier_stats}'")
\ No newline at end of file
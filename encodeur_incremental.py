@@ -0,0 +1,226 @@
+from itertools import combinations
+
+from lightup.index_grille import IndexGrille, est_mur
+from solveur_incremental import SolveurIncremental, grille_puzzle
+
+class EncodeurIncremental:
+    """Encodage d'une grille maintenu à jour case par case (mode édition).
+
+    La variable de la case c = i * L + j est toujours c + 1, que la case soit
+    un mur ou non, pour que les modifications ne renumérotent rien. Chaque
+    groupe de contraintes (segment, éclairage d'une case, mur, mur chiffré)
+    est gardé par un littéral d'activation: ses clauses sont (-a ∨ clause) et
+    a est passé en hypothèse. Modifier une case retire uniquement les groupes
+    touchés (clause unitaire -a) et ajoute leurs remplaçants.
+    """
+
+    def __init__(self, grille):
+        self.grille = grille_puzzle(grille)
+        self.H = len(self.grille)
+        self.L = len(self.grille[0])
+        self.solveur = SolveurIncremental()
+        self.solveur.nb_vars = self.H * self.L
+        self.groupes = {}  # clé du groupe -> littéral d'activation
+        self.nb_groupes_retires = 0
+        self._construire()
+
+    def _construire(self):
+        """Encode toute la grille (construction initiale ou compactage)"""
+        index = IndexGrille(self.grille)
+        self.segments_ligne = [[] for _ in range(self.H)]
+        self.segments_colonne = [[] for _ in range(self.L)]
+        self.segment_de = {}
+        for s in range(index.nb_segments):
+            membres = tuple(index.membres_segment(s))
+            horizontal = s < index.nb_segments_lignes
+            if horizontal:
+                self.segments_ligne[membres[0] // self.L].append(membres)
+            else:
+                self.segments_colonne[membres[0] % self.L].append(membres)
+            self._ajouter_segment(membres, horizontal)
+
+        for c in range(self.H * self.L):
+            if index.mur[c]:
+                self._ajouter_groupe(('mur', c), [[-(c + 1)]])
+                if index.chiffre[c] >= 0:
+                    self._ajouter_mur_chiffre(c)
+            else:
+                self._ajouter_eclairage(c)
+
+    def _ajouter_groupe(self, cle, clauses):
+        a = self.solveur.nouvelle_variable()
+        for clause in clauses:
+            self.solveur.ajouter_clause([-a] + clause)
+        self.groupes[cle] = a
+
+    def _retirer_groupe(self, cle):
+        a = self.groupes.pop(cle, None)
+        if a is not None:
+            self.solveur.ajouter_clause([-a])
+            self.nb_groupes_retires += 1
+
+    def _ajouter_segment(self, membres, horizontal):
+        for c in membres:
+            ligne, colonne = self.segment_de.get(c, (None, None))
+            self.segment_de[c] = (membres, colonne) if horizontal else (ligne, membres)
+        self._ajouter_groupe(('segment', membres), [[-(c1 + 1), -(c2 + 1)] for c1, c2 in combinations(membres, 2)])
+
+    def _ajouter_eclairage(self, c):
+        ligne, colonne = self.segment_de[c]
+        sources = sorted(set(ligne) | set(colonne))
+        self._ajouter_groupe(('eclairage', c), [[c2 + 1 for c2 in sources]])
+
+    def _voisins_libres(self, c):
+        i, j = divmod(c, self.L)
+        return [ni * self.L + nj for ni, nj in ((i - 1, j), (i + 1, j), (i, j - 1), (i, j + 1))
+                if 0 <= ni < self.H and 0 <= nj < self.L and not est_mur(self.grille[ni][nj])]
+
+    def _ajouter_mur_chiffre(self, c):
+        i, j = divmod(c, self.L)
+        chiffre = int(self.grille[i][j][1:])
+        vars_voisins = [c2 + 1 for c2 in self._voisins_libres(c)]
+        if chiffre > len(vars_voisins):
+            clauses = [[]]  # Mur impossible: le groupe actif rend la grille insatisfiable
+        else:
+            clauses = [list(comb) for comb in combinations(vars_voisins, len(vars_voisins) - chiffre + 1)] if chiffre > 0 else []
+            clauses += [[-v for v in comb] for comb in combinations(vars_voisins, chiffre + 1)]
+        self._ajouter_groupe(('chiffre', c), clauses)
+
+    def _segments(self, cases):
+        """Segments (tuples de cases) d'une ligne ou colonne donnée sous forme de liste de cases"""
+        segments, courant = [], []
+        for c in cases:
+            if est_mur(self.grille[c // self.L][c % self.L]):
+                if courant:
+                    segments.append(tuple(courant))
+                courant = []
+            else:
+                courant.append(c)
+        if courant:
+            segments.append(tuple(courant))
+        return segments
+
+    def modifier(self, i, j, cellule):
+        """Applique la modification d'une case et ne ré-encode que les contraintes touchées"""
+        cellule = '.' if cellule in ('A', '*') else cellule
+        ancienne = self.grille[i][j]
+        if cellule == ancienne:
+            return
+        self.grille[i][j] = cellule
+        c = i * self.L + j
+
+        # Segments de la ligne i et de la colonne j qui ont changé
+        touchees = set()
+        for anciens, cases, horizontal in ((self.segments_ligne[i], range(i * self.L, i * self.L + self.L), True),
+                                           (self.segments_colonne[j], range(j, self.H * self.L, self.L), False)):
+            nouveaux = self._segments(cases)
+            for membres in set(anciens) - set(nouveaux):
+                self._retirer_groupe(('segment', membres))
+                touchees.update(membres)
+            for membres in set(nouveaux) - set(anciens):
+                self._ajouter_segment(membres, horizontal)
+                touchees.update(membres)
+            anciens[:] = nouveaux
+
+        # La case elle-même: mur, mur chiffré ou case libre
+        self._retirer_groupe(('mur', c))
+        self._retirer_groupe(('chiffre', c))
+        if est_mur(cellule):
+            self.segment_de.pop(c, None)
+            self._retirer_groupe(('eclairage', c))
+            self._ajouter_groupe(('mur', c), [[-(c + 1)]])
+            if len(cellule) > 1:
+                self._ajouter_mur_chiffre(c)
+            touchees.discard(c)
+
+        # Éclairage des cases des segments modifiés
+        for c2 in touchees:
+            self._retirer_groupe(('eclairage', c2))
+            if not est_mur(self.grille[c2 // self.L][c2 % self.L]):
+                self._ajouter_eclairage(c2)
+
+        # Murs chiffrés voisins: leur ensemble de cases libres a changé
+        for ni, nj in ((i - 1, j), (i + 1, j), (i, j - 1), (i, j + 1)):
+            if 0 <= ni < self.H and 0 <= nj < self.L and ('chiffre', ni * self.L + nj) in self.groupes:
+                self._retirer_groupe(('chiffre', ni * self.L + nj))
+                self._ajouter_mur_chiffre(ni * self.L + nj)
+
+        # Trop de groupes retirés: on repart d'un solveur neuf
+        if self.nb_groupes_retires > len(self.groupes) * 2:
+            self.compacter()
+
+    def compacter(self):
+        """Reconstruit le solveur sans les groupes retirés"""
+        self.solveur.fermer()
+        self.solveur = SolveurIncremental()
+        self.solveur.nb_vars = self.H * self.L
+        self.groupes = {}
+        self.nb_groupes_retires = 0
+        self._construire()
+
+    def resoudre(self, hypotheses=()):
+        """Résout avec les groupes actifs: True, False ou None (aucun solveur)"""
+        return self.solveur.resoudre(list(self.groupes.values()) + list(hypotheses))
+
+    def ampoules(self):
+        """Cases (i, j) des ampoules du dernier modèle"""
+        modele = self.solveur.modele() or []
+        return [divmod(v - 1, self.L) for v in modele if 0 < v <= self.H * self.L]
+
+    def verifier(self):
+        """Solvabilité et unicité: 'aucune', 'unique', 'multiple' ou None (aucun solveur).
+
+        Les ampoules de la première solution trouvée restent dans self.solution.
+        """
+        self.solution = []
+        resultat = self.resoudre()
+        if not resultat:
+            return None if resultat is None else 'aucune'
+        self.solution = self.ampoules()
+
+        # Une autre solution doit différer sur au moins une case libre
+        modele = set(v for v in self.solveur.modele() if v > 0)
+        libres = [c + 1 for c in range(self.H * self.L) if not est_mur(self.grille[c // self.L][c % self.L])]
+        t = self.solveur.nouvelle_variable()
+        self.solveur.ajouter_clause([-t] + [-v if v in modele else v for v in libres])
+        autre = self.resoudre([t])
+        self.solveur.ajouter_clause([-t])
+        self.nb_groupes_retires += 1
+        return 'multiple' if autre else 'unique'
+
+    def expliquer(self):
+        """Noyau insatisfiable réduit, en cases de la grille.
+
+        Les contraintes de segments et de murs restent toujours actives; seuls
+        les murs chiffrés ('chiffre', c) et l'éclairage des cases
+        ('eclairage', c) sont candidats. Retourne la liste triée des clés d'un
+        sous-ensemble qui suffit à rendre la grille impossible (minimal par
+        suppression si le solveur fournit des noyaux), ou None si la grille a
+        une solution.
+        """
+        dures = [a for cle, a in self.groupes.items() if cle[0] in ('segment', 'mur')]
+        cle_de = {a: cle for cle, a in self.groupes.items() if cle[0] in ('chiffre', 'eclairage')}
+        if self.solveur.resoudre(dures + list(cle_de)):
+            return None
+        noyau = [a for a in self.solveur.noyau() if a in cle_de]
+
+        # Suppression une à une: une contrainte inutile à l'impossibilité est retirée
+        for a in list(noyau):
+            if a not in noyau:
+                continue
+            essai = [b for b in noyau if b != a]
+            if self.solveur.resoudre(dures + essai) is False:
+                restants = set(self.solveur.noyau())
+                noyau = [b for b in essai if b in restants]
+        return sorted(cle_de[a] for a in noyau)
+
+    def decrire_explication(self, explication):
+        """Phrases lisibles pour le résultat de expliquer()"""
+        phrases = []
+        for genre, c in explication:
+            i, j = divmod(c, self.L)
+            if genre == 'chiffre':
+                phrases.append(f"le mur {self.grille[i][j]} en ({i},{j}) exige {self.grille[i][j][1:]} ampoule(s) adjacente(s)")
+            else:
+                phrases.append(f"la case ({i},{j}) doit être éclairée")
+        return phrases
@@ -0,0 +1,94 @@
+from itertools import combinations
+
+from lightup.encodages import generer_clauses
+from lightup.index_grille import IndexGrille
+from solveur_incremental import SolveurIncremental
+
+class GabaritMurs:
+    """Disposition de murs encodée une seule fois, numérotations essayées par hypothèses.
+
+    La partie structurelle (segments, éclairage, alignement) de la grille
+    sans ses chiffres est ajoutée définitivement au solveur incrémental.
+    Chaque couple (mur, chiffre N) a un littéral sélecteur s dont les clauses
+    "exactement N voisines" sont gardées (-s ∨ clause), créées à la première
+    utilisation. Essayer une numérotation revient à résoudre sous les
+    hypothèses des sélecteurs choisis: ni nouveau CNF ni nouveau processus.
+    """
+
+    def __init__(self, grille):
+        self.H = len(grille)
+        self.L = len(grille[0])
+        self.murs = [['#' if cellule.startswith('#') else '.' for cellule in ligne] for ligne in grille]
+        self.index = IndexGrille(self.murs)
+        self.var_map, clauses = generer_clauses(self.murs, self.index)
+        self.solveur = SolveurIncremental(clauses)
+        self.solveur.nb_vars = max(self.solveur.nb_vars, len(self.var_map))
+        self.selecteurs = {}  # (i, j, chiffre) -> littéral
+        self.mur_de = {}  # littéral -> (i, j)
+        self.nb_resolutions = 0
+        self._noyau = None
+
+    def voisins_libres(self, i, j):
+        """Variables des cases non-murs adjacentes au mur (i, j)"""
+        return [self.var_map[(ni, nj)] for ni, nj in ((i - 1, j), (i + 1, j), (i, j - 1), (i, j + 1))
+                if (ni, nj) in self.var_map]
+
+    def selecteur(self, i, j, chiffre):
+        """Littéral qui active "exactement chiffre ampoules autour du mur (i, j)" (None si impossible)"""
+        cle = (i, j, chiffre)
+        if cle not in self.selecteurs:
+            vars_voisins = self.voisins_libres(i, j)
+            if chiffre > len(vars_voisins):
+                return None
+            s = self.solveur.nouvelle_variable()
+            clauses = [list(comb) for comb in combinations(vars_voisins, len(vars_voisins) - chiffre + 1)] if chiffre > 0 else []
+            clauses += [[-v for v in comb] for comb in combinations(vars_voisins, chiffre + 1)]
+            for clause in clauses:
+                self.solveur.ajouter_clause([-s] + clause)
+            self.selecteurs[cle] = s
+            self.mur_de[s] = (i, j)
+        return self.selecteurs[cle]
+
+    def resoudre(self, chiffres):
+        """Teste une numérotation {(i, j): N}: True, False ou None (aucun solveur).
+
+        Après un échec, noyau() donne les murs en cause.
+        """
+        hypotheses = []
+        self._noyau = None
+        for (i, j), chiffre in chiffres.items():
+            s = self.selecteur(i, j, chiffre)
+            if s is None:
+                self._noyau = [(i, j)]
+                return False
+            hypotheses.append(s)
+        self.nb_resolutions += 1
+        resultat = self.solveur.resoudre(hypotheses)
+        if resultat is False:
+            self._noyau = sorted(self.mur_de[s] for s in self.solveur.noyau() if s in self.mur_de)
+        return resultat
+
+    def noyau(self):
+        """Murs dont les chiffres suffisent à rendre la dernière numérotation impossible"""
+        return self._noyau
+
+    def ampoules(self):
+        """Cases (i, j) des ampoules du dernier modèle"""
+        coord_map = {v: k for k, v in self.var_map.items()}
+        return [coord_map[v] for v in self.solveur.modele() or [] if v > 0 and v in coord_map]
+
+    def grille(self, chiffres):
+        """Grille texte de la disposition avec la numérotation {(i, j): N}"""
+        grille = [ligne[:] for ligne in self.murs]
+        for (i, j), chiffre in chiffres.items():
+            grille[i][j] = f"#{chiffre}"
+        return grille
+
+    def fermer(self):
+        self.solveur.fermer()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.fermer()
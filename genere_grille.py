@@ -1,8 +1,18 @@
+import importlib.util
 import random
-import subprocess
 import tempfile
 import os
-from itertools import combinations
+from collections import deque
+
+from archive_grilles import EcrivainArchive
+from difficulte import noter
+from encodeur_incremental import EncodeurIncremental
+from gabarit_murs import GabaritMurs
+from lightup.encodages import generer_clauses
+from lightup.grille_compacte import BLANCHE, MUR, MUR_CHIFFRE, GrilleCompacte
+from lightup.index_grille import IndexGrille
+from lightup.solveurs import ResultatSolveur, resoudre_cnf
+from lightup.symetries import clauses_symetries
 
 def voisins(i, j, n, m):
     dirs = [(-1, 0), (1, 0), (0, -1), (0, 1)]
@@ -24,67 +34,17 @@ def valider_mur_chiffre(grille, i, j, chiffre, n, m):
     return chiffre <= cases_blanches_voisines
 
 def generer_dimacs_silent(grille):
-    H = len(grille)
-    L = len(grille[0])
-    clauses = []
-    var_map = {}
-    var_id = 1
-
-    for i in range(H):
-        for j in range(L):
-            if case_est_blanche(grille[i][j]):
-                var_map[(i, j)] = var_id
-                var_id += 1
-
-    for (i, j), v1 in var_map.items():
-        for di, dj in [(-1,0),(1,0),(0,-1),(0,1)]:
-            ni, nj = i+di, j+dj
-            while 0 <= ni < H and 0 <= nj < L:
-                if not case_est_blanche(grille[ni][nj]):
-                    break
-                v2 = var_map[(ni, nj)]
-                clauses.append([-v1, -v2])
-                ni += di
-                nj += dj
-
-    for (i, j), v in var_map.items():
-        sources = [v]
-        for di, dj in [(-1,0),(1,0),(0,-1),(0,1)]:
-            ni, nj = i+di, j+dj
-            while 0 <= ni < H and 0 <= nj < L:
-                if not case_est_blanche(grille[ni][nj]):
-                    break
-                sources.append(var_map[(ni, nj)])
-                ni += di
-                nj += dj
-        clauses.append(sources)
-
-    for i in range(H):
-        for j in range(L):
-            if mur_chiffre(grille[i][j]):
-                chiffre = int(grille[i][j][1:])
-                cases_voisines = [(ni,nj) for ni,nj in voisins(i,j,H,L) if (ni,nj) in var_map]
-                vars_voisins = [var_map[pos] for pos in cases_voisines]
-                
-                if chiffre > len(vars_voisins):
-                    return None, None
-
-                if chiffre > 0:
-                    for comb in combinations(vars_voisins, len(vars_voisins) - chiffre + 1):
-                        clauses.append(list(comb))
-
-                if chiffre < len(vars_voisins):
-                    for comb in combinations(vars_voisins, chiffre + 1):
-                        clauses.append([-v for v in comb])
-
-                if chiffre == 0:
-                    for v in vars_voisins:
-                        clauses.append([-v])
+    # Test de satisfiabilité seulement: les symétries de la grille peuvent être brisées
+    var_map, clauses = generer_clauses(grille)
+    if var_map is None:
+        return None, None
+    symetriques, nb_aux = clauses_symetries(grille, var_map)
+    clauses.extend(symetriques)
 
     fd, nom_fichier = tempfile.mkstemp(suffix='.cnf')
     os.close(fd)
     
-    nb_vars = var_id - 1
+    nb_vars = len(var_map) + nb_aux
     nb_clauses = len(clauses)
 
     with open(nom_fichier, 'w') as f:
@@ -94,128 +54,414 @@ def generer_dimacs_silent(grille):
 
     return var_map, nom_fichier
 
-def tester_grille_avec_sat(grille):
+def tester_grille_avec_sat(grille, budget=5):
+    # Retourne un ResultatSolveur (statut 'SAT', 'UNSAT' ou 'INCONNU' si le budget
+    # en secondes est dépassé), ou None si MiniSAT n'est pas installé
+    var_map, nom_fichier = generer_dimacs_silent(grille)
+    
+    if var_map is None:
+        return ResultatSolveur('UNSAT')
+    
+    fd, out_file = tempfile.mkstemp(suffix='.out')
+    os.close(fd)
+    
     try:
-        var_map, nom_fichier = generer_dimacs_silent(grille)
-        
-        if var_map is None:
-            return False
-        
-        out_file = tempfile.mktemp(suffix='.out')
-        
-        result = subprocess.run(["minisat", nom_fichier, out_file], 
-                              stdout=subprocess.DEVNULL, 
-                              stderr=subprocess.DEVNULL, 
-                              check=False, 
-                              timeout=5)
-        
-        try:
-            if os.path.exists(nom_fichier):
-                os.remove(nom_fichier)
-        except:
-            pass
-        
-        if result.returncode != 10:
+        return resoudre_cnf(nom_fichier, out_file, timeout=budget)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        return ResultatSolveur('INCONNU', erreurs=str(e))
+    finally:
+        for nom in (nom_fichier, out_file):
             try:
-                if os.path.exists(out_file):
-                    os.remove(out_file)
-            except:
+                os.remove(nom)
+            except OSError:
                 pass
-            return False
-            
-        try:
-            with open(out_file, "r") as f:
-                lines = f.readlines()
-                if os.path.exists(out_file):
-                    os.remove(out_file)
-                
-                if len(lines) > 0 and lines[0].strip() == "SAT":
-                    return True
+
+class BudgetAdaptatif:
+    # Budget de résolution proportionnel à la taille de la grille, ajusté sur
+    # les temps de résolution observés (réponses définitives seulement)
+
+    def __init__(self, base=1.0, minimum=0.2, maximum=120.0, marge=4.0, fenetre=200):
+        self.base = base  # secondes pour une grille 10x10 sans observation
+        self.minimum = minimum
+        self.maximum = maximum
+        self.marge = marge
+        self.observations = deque(maxlen=fenetre)  # secondes par case
+
+    def budget(self, n, m):
+        cases = n * m
+        if len(self.observations) < 5:
+            estimation = self.base * max(1.0, cases / 100)
+        else:
+            par_case = sorted(self.observations)[int(0.95 * (len(self.observations) - 1))]
+            estimation = par_case * cases * self.marge
+        return min(self.maximum, max(self.minimum, estimation))
+
+    def observer(self, n, m, resultat):
+        if resultat is not None and resultat.statut in ('SAT', 'UNSAT') and resultat.temps > 0:
+            self.observations.append(resultat.temps / (n * m))
+
+def tester_grille_adaptatif(grille, budgets, essais=3):
+    # Relance les réponses INCONNU avec un budget quadruplé plutôt que de les classer
+    n, m = len(grille), len(grille[0])
+    budget = budgets.budget(n, m)
+    for essai in range(essais):
+        resultat = tester_grille_avec_sat(grille, budget)
+        if resultat is None or resultat.statut != 'INCONNU':
+            budgets.observer(n, m, resultat)
+            return resultat
+        if budget >= budgets.maximum:
+            break
+        budget = min(budgets.maximum, budget * 4)
+    return resultat
+
+NIVEAUX = {
+    'facile':    {'p_mur': 0.15, 'p_mur_numerote': 0.40},
+    'moyen':     {'p_mur': 0.20, 'p_mur_numerote': 0.50},
+    'difficile': {'p_mur': 0.25, 'p_mur_numerote': 0.65},
+}
+
+def tirer_grille(n, m, difficulte='moyen', rng=random):
+    p_mur = NIVEAUX[difficulte]['p_mur']
+    p_mur_numerote = NIVEAUX[difficulte]['p_mur_numerote']
+
+    grille = []
+    for i in range(n):
+        ligne = []
+        for j in range(m):
+            r = rng.random()
+            if r < p_mur:
+                if rng.random() < p_mur_numerote:
+                    chiffre = rng.randint(0, 4)
+                    ligne.append(f"#{chiffre}")
                 else:
+                    ligne.append('#')
+            else:
+                ligne.append('.')
+        grille.append(ligne)
+    return grille
+
+def normaliser_murs(grille):
+    # Répare les murs refusés par valider_mur_chiffre: chaque chiffre trop grand
+    # est ramené au nombre de cases blanches voisines. Retourne le nombre de murs modifiés.
+    n = len(grille)
+    m = len(grille[0])
+    modifies = 0
+    for i in range(n):
+        for j in range(m):
+            if mur_chiffre(grille[i][j]):
+                blanches = sum(1 for ni, nj in voisins(i, j, n, m) if grille[ni][nj] == '.')
+                if int(grille[i][j][1:]) > blanches:
+                    grille[i][j] = f"#{blanches}"
+                    modifies += 1
+    return modifies
+
+def grille_est_valide(grille):
+    n = len(grille)
+    m = len(grille[0])
+    for i in range(n):
+        for j in range(m):
+            if mur_chiffre(grille[i][j]):
+                chiffre = int(grille[i][j][1:])
+                if not valider_mur_chiffre(grille, i, j, chiffre, n, m):
                     return False
-        except:
-            return False
-                
-    except subprocess.TimeoutExpired:
-        return False
-    except FileNotFoundError:
-        return None
-    except Exception as e:
-        return False
+    return True
 
-def generer_grille_light_up(n, m, difficulte='moyen', max_tentatives=1000, forcer_fausse=False):
-    niveaux = {
-        'facile':    {'p_mur': 0.15, 'p_mur_numerote': 0.40},
-        'moyen':     {'p_mur': 0.20, 'p_mur_numerote': 0.50},
-        'difficile': {'p_mur': 0.25, 'p_mur_numerote': 0.65},
-    }
+STRATEGIES = ('reparation', 'gabarit', 'tirage')
 
-    if difficulte not in niveaux:
+def generer_grille_light_up(n, m, difficulte='moyen', max_tentatives=1000, forcer_fausse=False, budgets=None,
+                            strategie='reparation'):
+    # strategie: 'reparation' (grilles tirées réparées, voir reparer_grille),
+    # 'gabarit' (une disposition de murs, plusieurs numérotations, voir
+    # generer_grille_gabarit) ou 'tirage' (grilles UNSAT jetées, MiniSAT).
+    # Les deux premières demandent python-sat, sinon retour au tirage.
+    if difficulte not in NIVEAUX:
         raise ValueError("Difficulté invalide. Choisir parmi 'facile', 'moyen' ou 'difficile'.")
 
-    p_mur = niveaux[difficulte]['p_mur']
-    p_mur_numerote = niveaux[difficulte]['p_mur_numerote']
-
     if forcer_fausse:
         print(f"Génération d'une grille UNSOLVABLE {n}x{m} de difficulté '{difficulte}'...")
-    else:
-        print(f"Génération d'une grille {n}x{m} de difficulté '{difficulte}'...")
+        return generer_grille_insoluble(n, m, difficulte)[0]
+    
+    print(f"Génération d'une grille {n}x{m} de difficulté '{difficulte}'...")
     print("Cela peut prendre quelques secondes...")
     
+    if strategie not in STRATEGIES:
+        raise ValueError(f"Stratégie invalide. Choisir parmi {', '.join(STRATEGIES)}.")
+    if strategie != 'tirage' and importlib.util.find_spec('pysat') is not None:
+        if strategie == 'gabarit':
+            grille, appels = generer_grille_gabarit(n, m, difficulte)
+        else:
+            grille, appels = generer_grille_reparee(n, m, difficulte, max_tentatives)
+        if grille is not None:
+            print(f"✓ Grille valide générée en {appels} appel(s) SAT ({strategie})")
+            return grille
+    
+    budgets = budgets or BudgetAdaptatif()
+    inconnues = 0
+    
     for tentative in range(max_tentatives):
-        grille = []
-        for i in range(n):
-            ligne = []
-            for j in range(m):
-                r = random.random()
-                if r < p_mur:
-                    if random.random() < p_mur_numerote:
-                        chiffre = random.randint(0, 4)
-                        ligne.append(f"#{chiffre}")
-                    else:
-                        ligne.append('#')
-                else:
-                    ligne.append('.')
-            grille.append(ligne)
+        grille = tirer_grille(n, m, difficulte)
         
-        grille_valide = True
-        for i in range(n):
-            for j in range(m):
-                if mur_chiffre(grille[i][j]):
-                    chiffre = int(grille[i][j][1:])
-                    if not valider_mur_chiffre(grille, i, j, chiffre, n, m):
-                        grille_valide = False
-                        break
-            if not grille_valide:
-                break
+        if not grille_est_valide(grille):
+            continue
         
-        if not grille_valide:
+        nb_cases_blanches = sum(1 for ligne in grille for case in ligne if case == '.')
+        if nb_cases_blanches < (n * m) * 0.3:
+            continue
+        
+        # Les niveaux de déduction sans recherche concluent souvent seuls (grille
+        # impossible, ou solution unique): seules les autres grilles vont au solveur
+        note = noter(grille, max_noeuds=0)
+        if note.statut == 'UNSAT':
             continue
+        if note.statut == 'SAT':
+            print(f"Tentative {tentative + 1}/{max_tentatives}... ✓ Grille valide générée (par déduction)!")
+            return grille
+        
+        resultat = tester_grille_adaptatif(grille, budgets)
+        
+        # Une grille dont la résolution n'a pas abouti n'est jamais classée
+        if resultat is not None and resultat.statut == 'INCONNU':
+            inconnues += 1
+            continue
+        
+        if resultat is None:
+            print(f"Tentative {tentative + 1}/{max_tentatives}... ✓ Grille valide générée!")
+            return grille
+        elif resultat.statut == 'SAT':
+            print(f"Tentative {tentative + 1}/{max_tentatives}... ✓ Grille valide générée!")
+            return grille
+    
+    if inconnues:
+        print(f"\n{inconnues} grille(s) écartée(s) faute de réponse dans le budget")
+    print(f"\n⚠️  {max_tentatives} tentatives échouées, on continue...")
+    return generer_grille_light_up(n, m, difficulte, max_tentatives, budgets=budgets, strategie='tirage')
+
+def reparer_grille(grille, max_reparations=None):
+    # Réparation locale d'une grille UNSAT au lieu de la jeter. Les murs chiffrés
+    # du noyau insatisfiable sont suspendus (leur littéral d'activation n'est plus
+    # passé en hypothèse au solveur incrémental, rien n'est ré-encodé) jusqu'à
+    # ce que le reste de la grille soit satisfiable; seuls ces murs reçoivent
+    # alors le nombre d'ampoules voisines du modèle trouvé, qui reste une
+    # solution de la grille réparée. Chaque appel UNSAT suspend au moins un mur:
+    # la boucle s'arrête d'elle-même (max_reparations la borne). La grille est
+    # modifiée sur place.
+    # Retourne (statut 'SAT' / 'UNSAT' / None si aucun solveur, appels SAT, murs modifiés).
+    n, m = len(grille), len(grille[0])
+    encodeur = EncodeurIncremental(grille)
+    cle_de = {a: cle for cle, a in encodeur.groupes.items() if cle[0] == 'chiffre'}
+    suspendus = set()
+    appels = 0
+    while True:
+        appels += 1
+        resultat = encodeur.solveur.resoudre([a for a in encodeur.groupes.values() if a not in suspendus])
+        if resultat is not False or (max_reparations is not None and appels > max_reparations):
+            break
+        murs = [a for a in encodeur.solveur.noyau() if a in cle_de and a not in suspendus]
+        if not murs:
+            break
+        suspendus.update(murs)
+
+    modifies = 0
+    if resultat:
+        ampoules = set(encodeur.ampoules())
+        for a in suspendus:
+            i, j = divmod(cle_de[a][1], m)
+            cellule = f"#{sum(1 for pos in voisins(i, j, n, m) if pos in ampoules)}"
+            if cellule != grille[i][j]:
+                grille[i][j] = cellule
+                modifies += 1
+    encodeur.solveur.fermer()
+    statut = None if resultat is None else ('SAT' if resultat else 'UNSAT')
+    return statut, appels, modifies
+
+def generer_grille_reparee(n, m, difficulte='moyen', max_tentatives=1000, max_reparations=None, rng=random):
+    # Variante de generer_grille_light_up qui répare les grilles tirées au lieu
+    # de les jeter (normaliser_murs puis reparer_grille). Demande un solveur
+    # incrémental (python-sat). Retourne (grille, appels SAT), ou (None, appels).
+    appels = 0
+    for tentative in range(max_tentatives):
+        grille = tirer_grille(n, m, difficulte, rng)
+        normaliser_murs(grille)
         
         nb_cases_blanches = sum(1 for ligne in grille for case in ligne if case == '.')
         if nb_cases_blanches < (n * m) * 0.3:
             continue
         
-        resultat = tester_grille_avec_sat(grille)
+        statut, nb, _ = reparer_grille(grille, max_reparations)
+        appels += nb
+        if statut == 'SAT':
+            return grille, appels
+    return None, appels
+
+def tirer_numerotation(gabarit, difficulte='moyen', rng=random):
+    # Chiffres d'une partie des murs du gabarit (proportion p_mur_numerote de la
+    # difficulté), chacun tiré parmi ceux que permettent ses voisins libres
+    p_mur_numerote = NIVEAUX[difficulte]['p_mur_numerote']
+    chiffres = {}
+    for i in range(gabarit.H):
+        for j in range(gabarit.L):
+            if gabarit.murs[i][j] == '#' and rng.random() < p_mur_numerote:
+                chiffres[(i, j)] = rng.randint(0, len(gabarit.voisins_libres(i, j)))
+    return chiffres
+
+def balayer_numerotations(gabarit, essais, difficulte='moyen', rng=random):
+    # Essaie essais numérotations de la disposition du gabarit, une résolution
+    # sous hypothèses chacune, et produit les grilles solvables. Après un échec,
+    # seuls les murs du noyau insatisfiable sont renumérotés (même proportion
+    # de murs chiffrés); après un succès, la numérotation est entièrement retirée.
+    p_mur_numerote = NIVEAUX[difficulte]['p_mur_numerote']
+    chiffres = tirer_numerotation(gabarit, difficulte, rng)
+    for _ in range(essais):
+        resultat = gabarit.resoudre(chiffres)
+        if resultat is None:
+            return
+        if resultat:
+            yield gabarit.grille(chiffres)
+            chiffres = tirer_numerotation(gabarit, difficulte, rng)
+            continue
+        for i, j in gabarit.noyau():
+            chiffres.pop((i, j))
+            if rng.random() < p_mur_numerote:
+                chiffres[(i, j)] = rng.randint(0, len(gabarit.voisins_libres(i, j)))
+
+def generer_grille_gabarit(n, m, difficulte='moyen', numerotations=50, max_dispositions=100, rng=random):
+    # Stratégie par gabarit: chaque disposition de murs tirée est encodée une
+    # seule fois (GabaritMurs) puis jusqu'à numerotations numérotations sont
+    # essayées avant de passer à une autre disposition.
+    # Retourne (grille, résolutions SAT), ou (None, résolutions).
+    resolutions = 0
+    for _ in range(max_dispositions):
+        murs = tirer_grille(n, m, difficulte, rng)
+        if sum(1 for ligne in murs for case in ligne if case == '.') < (n * m) * 0.3:
+            continue
+        with GabaritMurs(murs) as gabarit:
+            grille = next(balayer_numerotations(gabarit, numerotations, difficulte, rng), None)
+            resolutions += gabarit.nb_resolutions
+        if grille is not None:
+            return grille, resolutions
+    return None, resolutions
+
+def generer_grille_notee(n, m, difficulte='moyen', cible=None, max_tentatives=100000, max_noeuds=10000,
+                         rng=random):
+    # Grilles tirées (densités de difficulte) filtrées par difficulté mesurée
+    # (difficulte.noter): garde la première grille solvable dont le niveau de
+    # déduction nécessaire correspond à cible ('facile': règles simples,
+    # 'moyen': anticipation, 'difficile': recherche; par défaut difficulte).
+    # Aucun appel SAT: les niveaux 1 et 2 concluent seuls, le niveau 3 par une
+    # recherche bornée à max_noeuds nœuds (grilles sans réponse écartées).
+    # Retourne (grille, note), ou (None, None).
+    cible = cible or difficulte
+    if cible not in NIVEAUX:
+        raise ValueError("Difficulté invalide. Choisir parmi 'facile', 'moyen' ou 'difficile'.")
+    for tentative in range(max_tentatives):
+        grille = tirer_grille(n, m, difficulte, rng)
+        normaliser_murs(grille)
         
-        if forcer_fausse:
-            if resultat is False:
-                print(f"Tentative {tentative + 1}/{max_tentatives}... ✓ Grille UNSOLVABLE générée!")
-                return grille
-        else:
-            if resultat is None:
-                print(f"Tentative {tentative + 1}/{max_tentatives}... ✓ Grille valide générée!")
-                return grille
-            elif resultat:
-                print(f"Tentative {tentative + 1}/{max_tentatives}... ✓ Grille valide générée!")
-                return grille
+        nb_cases_blanches = sum(1 for ligne in grille for case in ligne if case == '.')
+        if nb_cases_blanches < (n * m) * 0.3:
+            continue
+        
+        note = noter(grille, max_noeuds)
+        if note.statut == 'SAT' and note.difficulte() == cible:
+            return grille, note
+    return None, None
+
+def perturbations_candidates(grille, ampoules, rng=random):
+    # Modifications d'un seul mur qui contredisent la solution connue: chiffre
+    # décalé de ±1 sur un mur chiffré, chiffre faux ajouté sur un mur simple.
+    # Les chiffres restent compatibles avec le nombre de cases libres voisines.
+    n, m = len(grille), len(grille[0])
+    ampoules = set(ampoules)
+    candidates = []
+    for i in range(n):
+        for j in range(m):
+            if not grille[i][j].startswith('#'):
+                continue
+            libres = sum(1 for ni, nj in voisins(i, j, n, m) if not grille[ni][nj].startswith('#'))
+            allumees = sum(1 for pos in voisins(i, j, n, m) if pos in ampoules)
+            if mur_chiffre(grille[i][j]):
+                chiffre = int(grille[i][j][1:])
+                options = [c for c in (chiffre - 1, chiffre + 1) if 0 <= c <= libres]
+                priorite = 0
+            else:
+                options = [c for c in (allumees - 1, allumees + 1) if 0 <= c <= libres]
+                priorite = 1
+            for chiffre in options:
+                candidates.append((priorite, rng.random(), i, j, f"#{chiffre}"))
+    candidates.sort()
+    return [(i, j, cellule) for _, _, i, j, cellule in candidates]
+
+def generer_grille_insoluble(n, m, difficulte='moyen', max_perturbations=200, max_grilles=20, rng=random):
+    # Part d'une grille solvable, modifie un mur choisi d'après sa solution et
+    # confirme l'impossibilité avec le solveur incrémental. Retourne la grille
+    # et l'explication (noyau insatisfiable réduit, en phrases).
+    for _ in range(max_grilles):
+        grille = generer_grille_light_up(n, m, difficulte, budgets=BudgetAdaptatif())
+        encodeur = EncodeurIncremental(grille)
+        if not encodeur.resoudre():
+            continue
+        
+        essais = 0
+        for i, j, cellule in perturbations_candidates(grille, encodeur.ampoules(), rng):
+            if essais >= max_perturbations:
+                break
+            essais += 1
+            ancienne = encodeur.grille[i][j]
+            encodeur.modifier(i, j, cellule)
+            if encodeur.resoudre() is False:
+                grille[i][j] = cellule
+                explication = encodeur.decrire_explication(encodeur.expliquer())
+                print(f"Perturbation {essais}: ({i},{j}) {ancienne} → {cellule} ✓ Grille UNSOLVABLE générée!")
+                return grille, explication
+            encodeur.modifier(i, j, ancienne)
     
-    if forcer_fausse:
-        print(f"\n⚠️  {max_tentatives} tentatives échouées, on continue...")
-        return generer_grille_light_up(n, m, difficulte, max_tentatives, forcer_fausse=True)
-    else:
-        print(f"\n⚠️  {max_tentatives} tentatives échouées, on continue...")
-        return generer_grille_light_up(n, m, difficulte, max_tentatives)
+    raise RuntimeError(f"Aucune perturbation insoluble trouvée sur {max_grilles} grilles")
+
+def planter_grille(n, m, difficulte='moyen', rng=random):
+    # Grille solvable par construction, sans appel au solveur (grandes tailles):
+    # on tire les murs, on place une ampoule sur chaque case restée dans l'ombre
+    # (ordre aléatoire), puis on chiffre une partie des murs avec le nombre
+    # d'ampoules adjacentes de cette solution cachée.
+    # Retourne (GrilleCompacte, ensemble des cases ampoules de la solution cachée).
+    p_mur = NIVEAUX[difficulte]['p_mur']
+    p_mur_numerote = NIVEAUX[difficulte]['p_mur_numerote']
+    grille = GrilleCompacte(n, m, bytearray(MUR if rng.random() < p_mur else BLANCHE for _ in range(n * m)))
+
+    index = IndexGrille(grille)
+    comptes = index.segments_allumes([])
+    ampoules = set()
+    cases = [c for c in range(n * m) if not index.mur[c]]
+    rng.shuffle(cases)
+    for c in cases:
+        if not index.eclairee(c, comptes):
+            ampoules.add(c)
+            comptes[index.seg_ligne[c]] += 1
+            comptes[index.seg_colonne[c]] += 1
+
+    for c in range(n * m):
+        if grille.cases[c] == MUR and rng.random() < p_mur_numerote:
+            i, j = divmod(c, m)
+            chiffre = sum(1 for ni, nj in voisins(i, j, n, m) if ni * m + nj in ampoules)
+            grille.cases[c] = MUR_CHIFFRE + chiffre
+    return grille, ampoules
+
+def generer_grille_plantee(n, m, difficulte='moyen', rng=random, compacte=False):
+    # Grille de planter_grille, rendue en GrilleCompacte (un octet par case) si
+    # compacte, sinon convertie au format texte
+    grille, _ = planter_grille(n, m, difficulte, rng)
+    return grille if compacte else grille.vers_liste()
+
+def remplir_archive(nom_fichier, nombre, n, m, difficulte='moyen', rng=random):
+    # Ajoute à l'archive (créée au besoin) nombre grilles plantées avec leur
+    # solution cachée; retourne les numéros des grilles ajoutées
+    with EcrivainArchive(nom_fichier) as archive:
+        premier = len(archive.decalages)
+        for _ in range(nombre):
+            grille, ampoules = planter_grille(n, m, difficulte, rng)
+            archive.ajouter(grille, ampoules)
+    return range(premier, premier + nombre)
 
 def ecrire_grille_dans_fichier(grille, nom_fichier):
     with open(nom_fichier, 'w') as f:
@@ -230,6 +476,10 @@ if __name__ == "__main__":
     largeur = 7
     difficulte = 'moyen'
     forcer_fausse = False
+    plantee = False
+    binaire = False
+    strategie = 'reparation'
+    mesuree = None
     
     if len(sys.argv) >= 3:
         difficulte = sys.argv[1]
@@ -238,10 +488,54 @@ if __name__ == "__main__":
         
         if len(sys.argv) >= 5 and sys.argv[4].lower() == '-unsolvable':
             forcer_fausse = True
+        # -planted: grille solvable par construction (grandes tailles, sans solveur)
+        if len(sys.argv) >= 5 and sys.argv[4].lower() == '-planted':
+            plantee = True
+        # -binary: écrit la grille au format binaire compact (grille_light_up.lug)
+        binaire = '-binary' in [arg.lower() for arg in sys.argv[4:]]
+        # -gabarit: une disposition de murs encodée une fois, numérotations essayées par hypothèses
+        # -tirage: grilles UNSAT jetées (sans réparation ni python-sat)
+        for option in ('-gabarit', '-tirage'):
+            if option in [arg.lower() for arg in sys.argv[4:]]:
+                strategie = option[1:]
+        # -mesuree NIVEAU: grille dont la difficulté mesurée (niveau de déduction) est NIVEAU
+        options = [arg.lower() for arg in sys.argv]
+        if '-mesuree' in options and options.index('-mesuree') + 1 < len(sys.argv):
+            mesuree = sys.argv[options.index('-mesuree') + 1]
+        # -pack NOMBRE [FICHIER]: ajoute NOMBRE grilles plantées et leur solution à une archive
+        if len(sys.argv) >= 6 and sys.argv[4].lower() == '-pack':
+            nom_archive = sys.argv[6] if len(sys.argv) >= 7 else 'grilles.lupk'
+            numeros = remplir_archive(nom_archive, int(sys.argv[5]), hauteur, largeur, difficulte)
+            print(f"Grilles {numeros.start} à {numeros.stop - 1} ajoutées à '{nom_archive}'")
+            sys.exit(0)
     
-    grille = generer_grille_light_up(hauteur, largeur, difficulte=difficulte, forcer_fausse=forcer_fausse)
-    ecrire_grille_dans_fichier(grille, 'grille_light_up.txt')
+    if plantee:
+        grille = generer_grille_plantee(hauteur, largeur, difficulte, compacte=binaire)
+    elif forcer_fausse:
+        print(f"Génération d'une grille UNSOLVABLE {hauteur}x{largeur} de difficulté '{difficulte}'...")
+        grille, explication = generer_grille_insoluble(hauteur, largeur, difficulte)
+        print("\nPourquoi la grille est impossible:")
+        for phrase in explication:
+            print(f"  - {phrase}")
+    elif mesuree:
+        print(f"Génération d'une grille {hauteur}x{largeur} ({difficulte}) de difficulté mesurée '{mesuree}'...")
+        grille, note = generer_grille_notee(hauteur, largeur, difficulte, mesuree)
+        if grille is None:
+            print("⚠️  Aucune grille de cette difficulté trouvée")
+            sys.exit(1)
+        print(f"✓ Niveau {note.niveau}, étapes par niveau {note.etapes}")
+    else:
+        grille = generer_grille_light_up(hauteur, largeur, difficulte=difficulte, strategie=strategie)
+    if binaire:
+        if not isinstance(grille, GrilleCompacte):
+            grille = GrilleCompacte.depuis_liste(grille)
+        grille.ecrire_binaire('grille_light_up.lug')
+        print("\nGrille sauvegardée dans 'grille_light_up.lug'")
+        grille = grille.vers_liste() if hauteur * largeur <= 10000 else grille
+    else:
+        ecrire_grille_dans_fichier(grille, 'grille_light_up.txt')
     
-    print("\nGrille générée:")
-    for ligne in grille:
-        print(' '.join(ligne))
\ No newline at end of file
+    if hauteur * largeur <= 10000:
+        print("\nGrille générée:")
+        for ligne in grille:
+            print(' '.join(ligne))
\ No newline at end of file
@@ -4,7 +4,11 @@ import os
 import random
 import tempfile
 import subprocess
-from itertools import combinations
+
+from encodeur_incremental import EncodeurIncremental
+from lightup.encodages import generer_clauses
+from lightup.index_grille import IndexGrille
+from solveur_incremental import VerificateurCompletude, grille_puzzle
 
 # Couleurs
 COULEUR_FOND = "#F0F0F0"
@@ -15,6 +19,15 @@ COULEUR_AMPOULE = "#FFD700"
 COULEUR_ECLAIREE = "#FFFACD"
 COULEUR_ERREUR = "#FF6347"
 COULEUR_TEXTE_MUR = "#FFFFFF"
+COULEUR_MARQUE = "#808080"
+
+# Affichage
+TAILLE_VUE = 800  # Côté maximal de la zone visible du plateau (pixels)
+TAILLE_CASE_MAX = 50  # Taille des cases quand la grille tient dans la vue
+ZOOM_MIN = 1
+ZOOM_MAX = 80
+SEUIL_IMAGE = 16  # En dessous (pixels par case), la grille est rendue en une seule image
+TAILLE_GRILLE_MAX = 1000
 
 # ===== FONCTIONS DU SOLVEUR SAT =====
 
@@ -37,90 +50,20 @@ def mur_chiffre(cellule):
 
 def generer_dimacs(grille):
     """Génère le problème SAT au format DIMACS"""
-    H = len(grille)
-    L = len(grille[0])
-    clauses = []
-    var_map = {}
-    var_id = 1
-
-    # Création d'une variable pour chaque case blanche
-    for i in range(H):
-        for j in range(L):
-            if case_est_blanche(grille[i][j]):
-                var_map[(i, j)] = var_id
-                var_id += 1
-
-    # Pour chaque paire de cases blanches alignées sans mur entre elles,
-    # interdire d'avoir des ampoules sur les deux cases
-    for (i, j), v1 in var_map.items():
-        for di, dj in [(-1,0),(1,0),(0,-1),(0,1)]:
-            ni, nj = i+di, j+dj
-            while est_dans_grille(ni, nj, H, L):
-                if not case_est_blanche(grille[ni][nj]):
-                    break  # On s'arrête aux murs
-                v2 = var_map[(ni, nj)]
-                clauses.append([-v1, -v2])
-                ni += di
-                nj += dj
-
-    # Chaque case blanche doit être éclairée par au moins une ampoule
-    # (soit elle contient une ampoule, soit une ampoule l'éclaire)
-    for (i, j), v in var_map.items():
-        sources = [v]  # L'ampoule peut être sur cette case
-        for di, dj in [(-1,0),(1,0),(0,-1),(0,1)]:
-            ni, nj = i+di, j+dj
-            while est_dans_grille(ni, nj, H, L):
-                if not case_est_blanche(grille[ni][nj]):
-                    break  # On s'arrête aux murs
-                sources.append(var_map[(ni, nj)])  # Ou une ampoule depuis cette direction
-                ni += di
-                nj += dj
-        clauses.append(sources)
-
-    # Pour chaque mur avec un chiffre, exactement N cases adjacentes doivent avoir une ampoule
-    for i in range(H):
-        for j in range(L):
-            if mur_chiffre(grille[i][j]):
-                chiffre = int(grille[i][j][1:])
-                # Ne considérer que les cases blanches adjacentes
-                cases_voisines = [(ni,nj) for ni,nj in voisins(i,j,H,L) if (ni,nj) in var_map]
-                vars_voisins = [var_map[pos] for pos in cases_voisines]
-                
-                if chiffre > len(vars_voisins):
-                    messagebox.showerror("Erreur", f"Mur #{chiffre} en ({i},{j}) nécessite {chiffre} voisins mais seulement {len(vars_voisins)} disponibles")
-                    return None, None
-
-                # Pour implémenter "exactement N ampoules", nous avons besoin de:
-                # 1. "Au moins N ampoules" ET
-                # 2. "Au plus N ampoules"
-
-                # 1. Au moins 'chiffre' ampoules
-                if chiffre > 0:
-                    # Toutes les combinaisons de (len(vars_voisins) - chiffre + 1) variables ne peuvent pas être toutes fausses
-                    for comb in combinations(vars_voisins, len(vars_voisins) - chiffre + 1):
-                        # Pour chaque combinaison, au moins une variable doit être vraie
-                        clause = list(comb)
-                        clauses.append(clause)
-
-                # 2. Au plus 'chiffre' ampoules
-                if chiffre < len(vars_voisins):
-                    # Toutes les combinaisons de (chiffre + 1) variables ne peuvent pas être toutes vraies
-                    for comb in combinations(vars_voisins, chiffre + 1):
-                        # Pour chaque combinaison, au moins une variable doit être fausse
-                        clause = [-v for v in comb]
-                        clauses.append(clause)
-
-                # Si chiffre est 0, on ajoute une clause pour chaque variable
-                # indiquant qu'elle doit être fausse
-                if chiffre == 0:
-                    for v in vars_voisins:
-                        clauses.append([-v])
+    index = IndexGrille(grille)
+    impossible = index.mur_impossible()
+    if impossible:
+        i, j, chiffre, nb = impossible
+        messagebox.showerror("Erreur", f"Mur #{chiffre} en ({i},{j}) nécessite {chiffre} voisins mais seulement {nb} disponibles")
+        return None, None
+    
+    var_map, clauses = generer_clauses(grille, index)
 
     # Création du fichier DIMACS
     fd, nom_fichier = tempfile.mkstemp(suffix='.cnf')
     os.close(fd)
     
-    nb_vars = var_id - 1
+    nb_vars = len(var_map)
     nb_clauses = len(clauses)
 
     with open(nom_fichier, 'w') as f:
@@ -205,6 +148,40 @@ def interpreter_solution(solution, grille, var_map):
     
     return solution_grille
 
+# ===== AFFICHAGE DU PLATEAU =====
+
+def couleur_cellule(cellule):
+    """Couleur de fond d'une cellule de la grille"""
+    if cellule == '#':
+        return COULEUR_MUR
+    if isinstance(cellule, str) and cellule.startswith('#') and len(cellule) > 1:
+        return COULEUR_MUR_CHIFFRE
+    if cellule == 'A':
+        return COULEUR_AMPOULE
+    if cellule == '*':
+        return COULEUR_ECLAIREE
+    return COULEUR_CASE_VIDE
+
+def couleur_pixel(cellule, marquee=False, erreur=False):
+    """Couleur d'une case rendue par un seul pixel (faible zoom): erreurs et marques comprises"""
+    if erreur:
+        return COULEUR_ERREUR
+    if marquee and cellule in ('.', '*'):
+        return COULEUR_MARQUE
+    return couleur_cellule(cellule)
+
+def plage_visible(debut, fin, taille, marge, nb):
+    """Indices [premier, dernier[ des cases d'un axe qui recouvrent les pixels [debut, fin["""
+    premier = min(nb, max(0, int((debut - marge) // taille)))
+    dernier = min(nb, max(0, int((fin - marge) // taille) + 1))
+    return premier, max(premier, dernier)
+
+def donnees_image(grille, marques=(), cases_erreur=()):
+    """Données de PhotoImage.put: un pixel par case, une ligne {...} par rangée"""
+    return " ".join("{" + " ".join(couleur_pixel(cellule, (i, j) in marques, (i, j) in cases_erreur)
+                                   for j, cellule in enumerate(ligne)) + "}"
+                    for i, ligne in enumerate(grille))
+
 # ===== INTERFACE GRAPHIQUE =====
 
 class LightUpGUI:
@@ -220,14 +197,54 @@ class LightUpGUI:
         self.marge = 20
         self.mode_edition = False
         self.outil_actuel = "mur"  # Options: "mur", "mur_chiffre", "vide", "ampoule"
+        self.marques = set()  # Cases marquées "sans ampoule" par le joueur
+        self.cases_erreur = set()  # Cases mises en évidence après une vérification
+        self.verificateur = None
+        self.cle_verificateur = None
+        self.encodeur = None  # Encodage incrémental du mode édition
+        self.index = None  # Index des segments pour l'éclairage (recalculé si les murs changent)
+        self.comptes = None  # Ampoules par segment
+        
+        # Plateau virtualisé: seules les cases visibles ont des éléments de canvas
+        self.geometrie = None  # (hauteur, largeur, taille_cellule) du dernier dessin
+        self.rectangles = {}  # (i, j) -> rectangle de la case visible
+        self.decors = {}  # (i, j) -> chiffre, ampoule ou marque dessinés sur la case
+        self.reserve = []  # Rectangles cachés, réutilisés au défilement
+        self.image_base = None  # Faible zoom: un pixel par case
+        self.image_vue = None  # Faible zoom: partie visible agrandie
+        self.item_image = None
+        self.vue_planifiee = None
         
         # Cadre principal
         self.frame_principal = tk.Frame(root, bg=COULEUR_FOND)
         self.frame_principal.pack(padx=10, pady=10)
         
-        # Canvas pour dessiner la grille
-        self.canvas = tk.Canvas(self.frame_principal, bg=COULEUR_FOND, highlightthickness=0)
-        self.canvas.pack(side=tk.LEFT, padx=10, pady=10)
+        # Canvas pour dessiner la grille, avec barres de défilement
+        self.frame_canvas = tk.Frame(self.frame_principal, bg=COULEUR_FOND)
+        self.frame_canvas.pack(side=tk.LEFT, padx=10, pady=10)
+        self.canvas = tk.Canvas(self.frame_canvas, bg=COULEUR_FOND, highlightthickness=0)
+        self.defilement_x = tk.Scrollbar(self.frame_canvas, orient=tk.HORIZONTAL, command=self.defiler_x)
+        self.defilement_y = tk.Scrollbar(self.frame_canvas, orient=tk.VERTICAL, command=self.defiler_y)
+        self.canvas.config(xscrollcommand=self.defilement_x.set, yscrollcommand=self.defilement_y.set)
+        self.canvas.grid(row=0, column=0)
+        self.defilement_y.grid(row=0, column=1, sticky=tk.NS)
+        self.defilement_x.grid(row=1, column=0, sticky=tk.EW)
+        
+        # Un seul gestionnaire par événement: la case est retrouvée par ses coordonnées
+        self.canvas.bind("<Button-1>", lambda event: self.clic_canvas(event, self.clic_case))
+        self.canvas.bind("<Button-3>", lambda event: self.clic_canvas(event, self.marquer_case))
+        self.canvas.bind("<Configure>", lambda event: self.planifier_vue())
+        self.canvas.bind("<MouseWheel>", self.molette)
+        self.canvas.bind("<Shift-MouseWheel>", self.molette)
+        self.canvas.bind("<Control-MouseWheel>", self.molette)
+        for bouton in ("<Button-4>", "<Button-5>", "<Shift-Button-4>", "<Shift-Button-5>",
+                       "<Control-Button-4>", "<Control-Button-5>"):
+            self.canvas.bind(bouton, self.molette)
+        for touche in ("<plus>", "<KP_Add>", "<equal>"):
+            self.canvas.bind(touche, lambda event: self.zoomer(1.25))
+        for touche in ("<minus>", "<KP_Subtract>"):
+            self.canvas.bind(touche, lambda event: self.zoomer(0.8))
+        self.canvas.bind("<Key-0>", lambda event: self.ajuster_zoom())
         
         # Panneau de contrôle
         self.panneau_controle = tk.Frame(self.frame_principal, bg=COULEUR_FOND)
@@ -261,6 +278,13 @@ class LightUpGUI:
         modemenu.add_command(label="Mode Édition", command=lambda: self.changer_mode(True))
         menubar.add_cascade(label="Mode", menu=modemenu)
         
+        # Menu Affichage
+        vuemenu = tk.Menu(menubar, tearoff=0)
+        vuemenu.add_command(label="Zoom avant (+)", command=lambda: self.zoomer(1.25))
+        vuemenu.add_command(label="Zoom arrière (-)", command=lambda: self.zoomer(0.8))
+        vuemenu.add_command(label="Grille entière (0)", command=self.ajuster_zoom)
+        menubar.add_cascade(label="Affichage", menu=vuemenu)
+        
         # Menu Grille aléatoire
         randommenu = tk.Menu(menubar, tearoff=0)
         randommenu.add_command(label="Facile (5x5)", command=lambda: self.generer_grille_aleatoire(5, 5, 0.1))
@@ -272,6 +296,7 @@ class LightUpGUI:
         satmenu = tk.Menu(menubar, tearoff=0)
         satmenu.add_command(label="Résoudre avec SAT", command=self.resoudre_avec_sat)
         satmenu.add_command(label="Vérifier validité SAT", command=self.verifier_validite_sat)
+        satmenu.add_command(label="Placement complétable ?", command=self.verifier_completude)
         menubar.add_cascade(label="Solveur SAT", menu=satmenu)
         
         # Menu Aide
@@ -295,6 +320,7 @@ class LightUpGUI:
         # Remplacer "Indice" par "Règles"
         tk.Button(frame_boutons_jeu, text="Règles", command=self.afficher_regles, width=12).pack(pady=2)
         tk.Button(frame_boutons_jeu, text="Solution SAT", command=self.resoudre_avec_sat, width=12).pack(pady=2)
+        tk.Button(frame_boutons_jeu, text="Complétable ?", command=self.verifier_completude, width=12).pack(pady=2)
         tk.Button(frame_boutons_jeu, text="Réinitialiser", command=self.reinitialiser_grille, width=12).pack(pady=2)
         
         # Séparateur
@@ -331,87 +357,270 @@ class LightUpGUI:
         
         # Bouton pour effacer la grille
         tk.Button(self.frame_edition, text="Effacer la grille", command=self.effacer_grille).pack(pady=(10, 0))
+        
+        # Solvabilité recalculée à chaque modification
+        self.var_direct = tk.BooleanVar(value=True)
+        tk.Checkbutton(self.frame_edition, text="Vérification en direct", variable=self.var_direct,
+                       bg=COULEUR_FOND, command=self.mettre_a_jour_statut_edition).pack(anchor=tk.W, pady=(10, 0))
+        self.label_statut = tk.Label(self.frame_edition, text="", bg=COULEUR_FOND, wraplength=150, justify=tk.LEFT)
+        self.label_statut.pack(anchor=tk.W)
     
     def initialiser_grille(self, hauteur, largeur):
         """Initialise une grille vide avec les dimensions spécifiées"""
         self.grille = [['.' for _ in range(largeur)] for _ in range(hauteur)]
         self.solution = [['.' for _ in range(largeur)] for _ in range(hauteur)]
+        self.encodeur = None
+        self.index = None
+        self.marques = set()
+        self.cases_erreur = set()
         self.redessiner_grille()
     
     def redessiner_grille(self):
-        """Redessine la grille complète"""
-        self.canvas.delete("all")
+        """Redessine la grille: géométrie du plateau, puis toutes les cases visibles"""
+        self.appliquer_geometrie()
+        self.image_base = None
+        self.dessiner_vue(forcer=True)
+    
+    def taille_ajustee(self):
+        """Taille de case qui fait tenir toute la grille dans la vue (au moins ZOOM_MIN pixel)"""
+        cote = max(len(self.grille), len(self.grille[0]))
+        return max(ZOOM_MIN, min(TAILLE_CASE_MAX, (TAILLE_VUE - 2 * self.marge) // cote))
+    
+    def appliquer_geometrie(self):
+        """Adapte le canvas et sa zone de défilement à la grille et au zoom actuels"""
+        hauteur = len(self.grille)
+        largeur = len(self.grille[0])
+        
+        # Nouvelle grille: zoom ajusté pour la voir entière, vue ramenée en haut à gauche
+        nouvelle = self.geometrie is None or self.geometrie[:2] != (hauteur, largeur)
+        if nouvelle:
+            self.taille_cellule = self.taille_ajustee()
+        geometrie = (hauteur, largeur, self.taille_cellule)
+        if geometrie == self.geometrie:
+            return
+        self.geometrie = geometrie
+        self.vider_plateau()
         
+        # La vue ne dépasse pas TAILLE_VUE: au-delà, le plateau défile
+        largeur_plateau = largeur * self.taille_cellule + 2 * self.marge
+        hauteur_plateau = hauteur * self.taille_cellule + 2 * self.marge
+        self.canvas.config(width=min(TAILLE_VUE, largeur_plateau), height=min(TAILLE_VUE, hauteur_plateau),
+                           scrollregion=(0, 0, largeur_plateau, hauteur_plateau))
+        if nouvelle:
+            self.canvas.xview_moveto(0)
+            self.canvas.yview_moveto(0)
+    
+    def vider_plateau(self):
+        """Supprime tous les éléments du canvas (changement de grille ou de zoom)"""
+        self.canvas.delete("all")
+        self.rectangles = {}
+        self.decors = {}
+        self.reserve = []
+        self.item_image = None
+        self.image_base = None
+    
+    def taille_vue(self):
+        """Largeur et hauteur visibles du canvas (sa taille demandée tant qu'il n'est pas affiché)"""
+        if self.canvas.winfo_ismapped():
+            return self.canvas.winfo_width(), self.canvas.winfo_height()
+        return int(self.canvas.cget("width")), int(self.canvas.cget("height"))
+    
+    def planifier_vue(self):
+        """Regroupe les événements de défilement en un seul dessin, quand l'interface est libre"""
+        if self.vue_planifiee is None:
+            self.vue_planifiee = self.root.after_idle(self.dessiner_vue)
+    
+    def dessiner_vue(self, forcer=False):
+        """Dessine les cases visibles; seules les cases nouvellement visibles sont créées, sauf si forcer"""
+        self.vue_planifiee = None
+        if not self.grille or self.geometrie is None:
+            return
         hauteur = len(self.grille)
         largeur = len(self.grille[0])
+        largeur_vue, hauteur_vue = self.taille_vue()
+        x0 = self.canvas.canvasx(0)
+        y0 = self.canvas.canvasy(0)
+        i0, i1 = plage_visible(y0, y0 + hauteur_vue, self.taille_cellule, self.marge, hauteur)
+        j0, j1 = plage_visible(x0, x0 + largeur_vue, self.taille_cellule, self.marge, largeur)
         
-        # Ajuster la taille de la fenêtre selon la taille de la grille
-        taille_max = 800  # Taille maximale pour le canvas
-        self.taille_cellule = min(50, (taille_max - 2*self.marge) // max(hauteur, largeur))
+        if self.taille_cellule < SEUIL_IMAGE:
+            self.dessiner_image(i0, i1, j0, j1)
+            return
         
-        # Définir la taille du canvas
-        largeur_canvas = largeur * self.taille_cellule + 2 * self.marge
-        hauteur_canvas = hauteur * self.taille_cellule + 2 * self.marge
-        self.canvas.config(width=largeur_canvas, height=hauteur_canvas)
+        # Les cases sorties de la vue rendent leur rectangle à la réserve
+        for case in [case for case in self.rectangles if not (i0 <= case[0] < i1 and j0 <= case[1] < j1)]:
+            rectangle = self.rectangles.pop(case)
+            self.canvas.itemconfig(rectangle, state=tk.HIDDEN)
+            self.reserve.append(rectangle)
+            self.canvas.delete(*self.decors.pop(case, ()))
         
-        # Dessiner chaque cellule
-        for i in range(hauteur):
-            for j in range(largeur):
-                x1 = j * self.taille_cellule + self.marge
-                y1 = i * self.taille_cellule + self.marge
-                x2 = x1 + self.taille_cellule
-                y2 = y1 + self.taille_cellule
-                
-                cellule = self.grille[i][j]
-                
-                # Déterminer la couleur de la cellule
-                if cellule == '.':
-                    couleur = COULEUR_CASE_VIDE
-                elif cellule == '#':
-                    couleur = COULEUR_MUR
-                elif isinstance(cellule, str) and cellule.startswith('#') and len(cellule) > 1:
-                    couleur = COULEUR_MUR_CHIFFRE
-                elif cellule == 'A':
-                    couleur = COULEUR_AMPOULE
-                elif cellule == '*':
-                    couleur = COULEUR_ECLAIREE
-                else:
-                    couleur = COULEUR_CASE_VIDE
-                
-                # Dessiner le rectangle
-                id_rect = self.canvas.create_rectangle(x1, y1, x2, y2, fill=couleur, outline="#AAAAAA")
-                
-                # Ajouter un texte si c'est un mur chiffré
-                if isinstance(cellule, str) and cellule.startswith('#') and len(cellule) > 1:
-                    chiffre = cellule[1:]
-                    self.canvas.create_text((x1+x2)//2, (y1+y2)//2, text=chiffre, 
-                                          fill=COULEUR_TEXTE_MUR, font=("Arial", int(self.taille_cellule * 0.5)))
-                
-                # Dessiner une ampoule
-                elif cellule == 'A':
-                    centre_x = (x1 + x2) // 2
-                    centre_y = (y1 + y2) // 2
-                    rayon = int(self.taille_cellule * 0.35)
-                    self.canvas.create_oval(centre_x - rayon, centre_y - rayon,
-                                          centre_x + rayon, centre_y + rayon,
-                                          fill=COULEUR_AMPOULE, outline="#B8860B")
-                    
-                    # Ajouter des rayons
-                    for angle in range(0, 360, 45):
-                        angle_rad = angle * 3.14159 / 180
-                        dx = rayon * 0.7 * (angle % 90 == 0 and 1 or 0.7) * (angle < 180 and 1 or -1) * (angle % 270 != 0 and 1 or -1)
-                        dy = rayon * 0.7 * (angle % 90 != 0 and 1 or 0.7) * (angle < 270 and angle > 90 and 1 or -1)
-                        self.canvas.create_line(centre_x, centre_y, centre_x + dx, centre_y + dy, 
-                                              fill="#FFB90F", width=2)
-                
-                # Ajouter les coordonnées comme balise pour l'interaction
-                self.canvas.tag_bind(id_rect, "<Button-1>", lambda event, i=i, j=j: self.clic_case(i, j))
+        for i in range(i0, i1):
+            for j in range(j0, j1):
+                if forcer or (i, j) not in self.rectangles:
+                    self.dessiner_case(i, j)
+    
+    def dessiner_case(self, i, j):
+        """Dessine la case (i, j), avec un rectangle recyclé de la réserve si possible"""
+        x1 = j * self.taille_cellule + self.marge
+        y1 = i * self.taille_cellule + self.marge
+        x2 = x1 + self.taille_cellule
+        y2 = y1 + self.taille_cellule
+        
+        # Les cases mises en évidence après une vérification ont un bord rouge
+        if (i, j) in self.cases_erreur:
+            options = {"fill": couleur_cellule(self.grille[i][j]), "outline": COULEUR_ERREUR, "width": 3}
+        else:
+            options = {"fill": couleur_cellule(self.grille[i][j]), "outline": "#AAAAAA", "width": 1}
+        
+        rectangle = self.rectangles.get((i, j))
+        if rectangle is None:
+            if self.reserve:
+                rectangle = self.reserve.pop()
+                self.canvas.coords(rectangle, x1, y1, x2, y2)
+                self.canvas.itemconfig(rectangle, state=tk.NORMAL, **options)
+            else:
+                rectangle = self.canvas.create_rectangle(x1, y1, x2, y2, **options)
+            self.rectangles[(i, j)] = rectangle
+        else:
+            self.canvas.itemconfig(rectangle, **options)
+        
+        self.canvas.delete(*self.decors.pop((i, j), ()))
+        decors = self.dessiner_decors(i, j, x1, y1, x2, y2)
+        if decors:
+            self.decors[(i, j)] = decors
+    
+    def dessiner_decors(self, i, j, x1, y1, x2, y2):
+        """Dessine le chiffre, l'ampoule ou la marque de la case; retourne les éléments créés"""
+        cellule = self.grille[i][j]
+        elements = []
+        
+        # Ajouter un texte si c'est un mur chiffré
+        if isinstance(cellule, str) and cellule.startswith('#') and len(cellule) > 1:
+            chiffre = cellule[1:]
+            elements.append(self.canvas.create_text((x1+x2)//2, (y1+y2)//2, text=chiffre,
+                                                    fill=COULEUR_TEXTE_MUR, font=("Arial", int(self.taille_cellule * 0.5))))
+        
+        # Dessiner une ampoule
+        elif cellule == 'A':
+            centre_x = (x1 + x2) // 2
+            centre_y = (y1 + y2) // 2
+            rayon = int(self.taille_cellule * 0.35)
+            elements.append(self.canvas.create_oval(centre_x - rayon, centre_y - rayon,
+                                                    centre_x + rayon, centre_y + rayon,
+                                                    fill=COULEUR_AMPOULE, outline="#B8860B"))
+            
+            # Ajouter des rayons
+            for angle in range(0, 360, 45):
+                dx = rayon * 0.7 * (angle % 90 == 0 and 1 or 0.7) * (angle < 180 and 1 or -1) * (angle % 270 != 0 and 1 or -1)
+                dy = rayon * 0.7 * (angle % 90 != 0 and 1 or 0.7) * (angle < 270 and angle > 90 and 1 or -1)
+                elements.append(self.canvas.create_line(centre_x, centre_y, centre_x + dx, centre_y + dy,
+                                                        fill="#FFB90F", width=2))
+        
+        # Marque "sans ampoule" posée par le joueur
+        elif (i, j) in self.marques:
+            rayon = max(2, int(self.taille_cellule * 0.1))
+            elements.append(self.canvas.create_oval((x1+x2)//2 - rayon, (y1+y2)//2 - rayon,
+                                                    (x1+x2)//2 + rayon, (y1+y2)//2 + rayon,
+                                                    fill=COULEUR_MARQUE, outline=COULEUR_MARQUE))
+        return elements
+    
+    def dessiner_image(self, i0, i1, j0, j1):
+        """Faible zoom: la partie visible de l'image (un pixel par case) est agrandie dans un seul élément"""
+        if self.image_base is None:
+            self.image_base = tk.PhotoImage(master=self.canvas, width=len(self.grille[0]), height=len(self.grille))
+            self.image_base.put(donnees_image(self.grille, self.marques, self.cases_erreur))
+        if self.image_vue is None:
+            self.image_vue = tk.PhotoImage(master=self.canvas)
+        
+        # -shrink: l'image de la vue prend exactement la taille de la zone copiée
+        self.image_vue.blank()
+        if i1 > i0 and j1 > j0:
+            self.canvas.tk.call(str(self.image_vue), "copy", str(self.image_base), "-from", j0, i0, j1, i1,
+                                "-zoom", self.taille_cellule, self.taille_cellule, "-shrink")
+        position = (j0 * self.taille_cellule + self.marge, i0 * self.taille_cellule + self.marge)
+        if self.item_image is None:
+            self.item_image = self.canvas.create_image(*position, image=self.image_vue, anchor=tk.NW)
+        else:
+            self.canvas.coords(self.item_image, *position)
+    
+    def rafraichir_cases(self, cases):
+        """Redessine seulement les cases données (celles qui sont hors de la vue n'ont rien à redessiner)"""
+        if self.taille_cellule < SEUIL_IMAGE:
+            if self.image_base is not None:
+                for i, j in cases:
+                    couleur = couleur_pixel(self.grille[i][j], (i, j) in self.marques, (i, j) in self.cases_erreur)
+                    self.image_base.put(couleur, to=(j, i))
+            self.dessiner_vue()
+            return
+        for i, j in cases:
+            if (i, j) in self.rectangles:
+                self.dessiner_case(i, j)
+    
+    def defiler_x(self, *args):
+        self.canvas.xview(*args)
+        self.planifier_vue()
+    
+    def defiler_y(self, *args):
+        self.canvas.yview(*args)
+        self.planifier_vue()
+    
+    def molette(self, event):
+        """Molette: défilement vertical, horizontal avec Maj, zoom autour du pointeur avec Ctrl"""
+        vers_le_haut = event.num == 4 or getattr(event, "delta", 0) > 0
+        if event.state & 0x0004:  # Ctrl
+            self.zoomer(1.25 if vers_le_haut else 0.8, event.x, event.y)
+            return
+        pas = -3 if vers_le_haut else 3
+        if event.state & 0x0001:  # Maj
+            self.canvas.xview_scroll(pas, "units")
+        else:
+            self.canvas.yview_scroll(pas, "units")
+        self.planifier_vue()
+    
+    def zoomer(self, facteur, x=None, y=None):
+        """Change la taille des cases en gardant immobile le point (x, y) de la vue (son centre par défaut)"""
+        ancienne = self.taille_cellule
+        nouvelle = int(round(ancienne * facteur))
+        if nouvelle == ancienne:
+            nouvelle += 1 if facteur > 1 else -1
+        nouvelle = max(ZOOM_MIN, min(ZOOM_MAX, nouvelle))
+        if nouvelle == ancienne:
+            return
+        
+        largeur_vue, hauteur_vue = self.taille_vue()
+        x = largeur_vue / 2 if x is None else x
+        y = hauteur_vue / 2 if y is None else y
+        # Position du point fixe en cases, avant le zoom
+        colonne = (self.canvas.canvasx(x) - self.marge) / ancienne
+        rangee = (self.canvas.canvasy(y) - self.marge) / ancienne
+        
+        self.taille_cellule = nouvelle
+        self.appliquer_geometrie()
+        largeur_plateau = len(self.grille[0]) * nouvelle + 2 * self.marge
+        hauteur_plateau = len(self.grille) * nouvelle + 2 * self.marge
+        self.canvas.xview_moveto((self.marge + colonne * nouvelle - x) / largeur_plateau)
+        self.canvas.yview_moveto((self.marge + rangee * nouvelle - y) / hauteur_plateau)
+        self.dessiner_vue(forcer=True)
+    
+    def ajuster_zoom(self):
+        """Zoom qui montre la grille entière"""
+        self.taille_cellule = self.taille_ajustee()
+        self.redessiner_grille()
+    
+    def clic_canvas(self, event, action):
+        """Retrouve la case sous le pointeur et lui applique action(i, j)"""
+        self.canvas.focus_set()
+        j = int((self.canvas.canvasx(event.x) - self.marge) // self.taille_cellule)
+        i = int((self.canvas.canvasy(event.y) - self.marge) // self.taille_cellule)
+        if 0 <= i < len(self.grille) and 0 <= j < len(self.grille[0]):
+            action(i, j)
     
     def changer_mode(self, mode_edition):
         """Change entre le mode jeu et le mode édition"""
         self.mode_edition = mode_edition
         if mode_edition:
             self.frame_edition.pack(fill=tk.X, pady=5)
+            self.mettre_a_jour_statut_edition()
             messagebox.showinfo("Mode Édition", "Vous êtes maintenant en mode édition. Vous pouvez modifier la grille.")
         else:
             self.frame_edition.pack_forget()
@@ -424,13 +633,19 @@ class LightUpGUI:
     
     def clic_case(self, i, j):
         """Gère le clic sur une case de la grille"""
+        a_redessiner = self.cases_erreur | {(i, j)}
+        self.cases_erreur = set()
         if self.mode_edition:
             self.modifier_case(i, j)
         else:
-            self.placer_ampoule(i, j)
+            changees = self.placer_ampoule(i, j)
+            if changees is None:
+                self.redessiner_grille()
+                return
+            a_redessiner |= changees
         
-        # Redessiner la grille
-        self.redessiner_grille()
+        # Redessiner seulement les cases modifiées
+        self.rafraichir_cases(a_redessiner)
     
     def modifier_case(self, i, j):
         """Modifie une case en mode édition"""
@@ -443,9 +658,43 @@ class LightUpGUI:
             self.grille[i][j] = '.'
         elif self.outil_actuel == "ampoule":
             self.grille[i][j] = 'A'
+        
+        if self.encodeur is not None:
+            self.encodeur.modifier(i, j, self.grille[i][j])
+        self.index = None
+        self.mettre_a_jour_statut_edition()
+    
+    def mettre_a_jour_statut_edition(self):
+        """Affiche la solvabilité et l'unicité de la grille en cours d'édition"""
+        if not self.var_direct.get():
+            self.label_statut.config(text="")
+            return
+        
+        # L'encodage complet n'est fait qu'une fois, les modifications suivantes sont incrémentales
+        if self.encodeur is None:
+            self.encodeur = EncodeurIncremental(self.grille)
+        
+        statut = self.encodeur.verifier()
+        textes = {
+            None: "Aucun solveur SAT disponible",
+            'aucune': "Aucune solution",
+            'unique': "Solution unique",
+            'multiple': "Plusieurs solutions",
+        }
+        couleurs = {'aucune': COULEUR_ERREUR, 'unique': "#228B22"}
+        self.label_statut.config(text=textes[statut], fg=couleurs.get(statut, "#000000"))
+    
+    def marquer_case(self, i, j):
+        """Marque ou démarque une case comme ne pouvant pas contenir d'ampoule (clic droit)"""
+        if self.mode_edition or self.grille[i][j] not in ['.', '*']:
+            return
+        self.marques.symmetric_difference_update({(i, j)})
+        a_redessiner = self.cases_erreur | {(i, j)}
+        self.cases_erreur = set()
+        self.rafraichir_cases(a_redessiner)
     
     def placer_ampoule(self, i, j):
-        """Place ou retire une ampoule en mode jeu"""
+        """Place ou retire une ampoule en mode jeu; retourne les cases changées (None: toutes)"""
         # Vérifier si la case est valide pour placer une ampoule
         if self.grille[i][j] in ['.', '*', 'A']:
             # Si déjà une ampoule, la retirer
@@ -453,45 +702,63 @@ class LightUpGUI:
                 self.grille[i][j] = '.'
             else:
                 self.grille[i][j] = 'A'
+                self.marques.discard((i, j))
             
             # Mettre à jour l'éclairage
-            self.mettre_a_jour_eclairage()
+            return self.mettre_a_jour_eclairage((i, j))
+        return set()
     
-    def mettre_a_jour_eclairage(self):
-        """Met à jour l'éclairage des cases après placement d'ampoules"""
+    def mettre_a_jour_eclairage(self, case=None):
+        """Met à jour l'éclairage des cases après placement d'ampoules.
+        
+        Avec case (ampoule posée ou retirée), seuls ses deux segments sont
+        recalculés et les cases changées sont retournées; sinon toute la
+        grille l'est (retourne None).
+        """
         hauteur = len(self.grille)
         largeur = len(self.grille[0])
         
+        if case is not None and self.index is not None:
+            i, j = case
+            c = i * largeur + j
+            delta = 1 if self.grille[i][j] == 'A' else -1
+            self.comptes[self.index.seg_ligne[c]] += delta
+            self.comptes[self.index.seg_colonne[c]] += delta
+            changees = set()
+            for s in (self.index.seg_ligne[c], self.index.seg_colonne[c]):
+                for c2 in self.index.membres_segment(s):
+                    i2, j2 = divmod(c2, largeur)
+                    if self.grille[i2][j2] in ('.', '*'):
+                        cellule = '*' if self.index.eclairee(c2, self.comptes) else '.'
+                        if cellule != self.grille[i2][j2]:
+                            self.grille[i2][j2] = cellule
+                            changees.add((i2, j2))
+            return changees
+        
         # Réinitialiser les cases éclairées
         for i in range(hauteur):
             for j in range(largeur):
                 if self.grille[i][j] == '*':
                     self.grille[i][j] = '.'
         
-        # Marquer les cases éclairées par chaque ampoule
+        # Marquer les cases éclairées: toute case d'un segment contenant une ampoule
+        # (l'index est gardé pour les mises à jour suivantes, tant que les murs ne changent pas)
+        self.index = IndexGrille(self.grille)
+        ampoules = [i * largeur + j for i in range(hauteur) for j in range(largeur) if self.grille[i][j] == 'A']
+        self.comptes = self.index.segments_allumes(ampoules)
         for i in range(hauteur):
             for j in range(largeur):
-                if self.grille[i][j] == 'A':
-                    # Éclairer dans les 4 directions
-                    for di, dj in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-                        ni, nj = i + di, j + dj
-                        while 0 <= ni < hauteur and 0 <= nj < largeur:
-                            # S'arrêter aux murs
-                            if self.grille[ni][nj] == '#' or (isinstance(self.grille[ni][nj], str) and self.grille[ni][nj].startswith('#')):
-                                break
-                            # Marquer comme éclairé si ce n'est pas une ampoule
-                            if self.grille[ni][nj] != 'A':
-                                self.grille[ni][nj] = '*'
-                            ni += di
-                            nj += dj
+                if self.grille[i][j] == '.' and self.index.eclairee(i * largeur + j, self.comptes):
+                    self.grille[i][j] = '*'
+        return None
     
     def nouvelle_grille(self):
         """Crée une nouvelle grille"""
-        hauteur = simpledialog.askinteger("Nouvelle grille", "Hauteur de la grille:", minvalue=3, maxvalue=20)
+        hauteur = simpledialog.askinteger("Nouvelle grille", "Hauteur de la grille:", minvalue=3, maxvalue=TAILLE_GRILLE_MAX)
         if hauteur is None:
             return
         
-        largeur = simpledialog.askinteger("Nouvelle grille", "Largeur de la grille:", minvalue=3, maxvalue=20)
+        largeur = simpledialog.askinteger("Nouvelle grille", "Largeur de la grille:", minvalue=3, maxvalue=TAILLE_GRILLE_MAX)
         if largeur is None:
             return
         
@@ -516,6 +783,10 @@ class LightUpGUI:
                 raise ValueError("Grille vide ou invalide")
             
             self.grille = lignes
+            self.encodeur = None
+            self.index = None
+            self.marques = set()
+            self.cases_erreur = set()
             
             self.redessiner_grille()
             messagebox.showinfo("Succès", f"Grille chargée depuis {os.path.basename(fichier)}")
@@ -551,33 +822,26 @@ class LightUpGUI:
                     return False
         
         # Vérifier que les ampoules ne s'éclairent pas entre elles
-        for i in range(hauteur):
-            for j in range(largeur):
-                if self.grille[i][j] == 'A':
-                    # Vérifier dans les 4 directions
-                    for di, dj in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-                        ni, nj = i + di, j + dj
-                        while 0 <= ni < hauteur and 0 <= nj < largeur:
-                            # S'arrêter aux murs
-                            if self.grille[ni][nj] == '#' or (isinstance(self.grille[ni][nj], str) and self.grille[ni][nj].startswith('#')):
-                                break
-                            if self.grille[ni][nj] == 'A':  # Une autre ampoule est visible
-                                messagebox.showinfo("Vérification", f"Les ampoules en ({i},{j}) et ({ni},{nj}) s'éclairent mutuellement.")
-                                return False
-                            ni += di
-                            nj += dj
+        index = IndexGrille(self.grille)
+        ampoules = [i * largeur + j for i in range(hauteur) for j in range(largeur) if self.grille[i][j] == 'A']
+        comptes = index.segments_allumes(ampoules)
+        for c in ampoules:
+            if comptes[index.seg_ligne[c]] > 1 or comptes[index.seg_colonne[c]] > 1:
+                for c2 in index.visibles(c):
+                    ni, nj = divmod(c2, largeur)
+                    if self.grille[ni][nj] == 'A':  # Une autre ampoule est visible
+                        i, j = divmod(c, largeur)
+                        messagebox.showinfo("Vérification", f"Les ampoules en ({i},{j}) et ({ni},{nj}) s'éclairent mutuellement.")
+                        return False
         
         # Vérifier les contraintes de murs chiffrés
-        for i in range(hauteur):
-            for j in range(largeur):
-                if isinstance(self.grille[i][j], str) and self.grille[i][j].startswith('#') and len(self.grille[i][j]) > 1:
-                    chiffre = int(self.grille[i][j][1:])
-                    voisins_coords = [(i-1, j), (i+1, j), (i, j-1), (i, j+1)]
-                    ampoules_adjacentes = sum(1 for ni, nj in voisins_coords 
-                                          if 0 <= ni < hauteur and 0 <= nj < largeur and self.grille[ni][nj] == 'A')
-                    if ampoules_adjacentes != chiffre:
-                        messagebox.showinfo("Vérification", f"Le mur en ({i},{j}) doit avoir exactement {chiffre} ampoules adjacentes.")
-                        return False
+        for k, c in enumerate(index.murs_chiffres):
+            chiffre = index.chiffre[c]
+            ampoules_adjacentes = sum(1 for c2 in index.voisins_mur(k) if self.grille[c2 // largeur][c2 % largeur] == 'A')
+            if ampoules_adjacentes != chiffre:
+                i, j = divmod(c, largeur)
+                messagebox.showinfo("Vérification", f"Le mur en ({i},{j}) doit avoir exactement {chiffre} ampoules adjacentes.")
+                return False
         
         messagebox.showinfo("Félicitations", "Votre solution est correcte!")
         return True
@@ -589,8 +853,9 @@ class LightUpGUI:
         self.root.update()
         
         try:
-            # Générer le problème SAT
-            var_map, nom_fichier = generer_dimacs(self.grille)
+            # Générer le problème SAT sur le puzzle d'origine (sans les ampoules du joueur)
+            puzzle = grille_puzzle(self.grille)
+            var_map, nom_fichier = generer_dimacs(puzzle)
             
             if var_map is None:
                 messagebox.showerror("Erreur", "Impossible de générer le problème SAT.")
@@ -604,7 +869,7 @@ class LightUpGUI:
                 return
             
             # Interpréter la solution
-            solution_grille = interpreter_solution(solution, self.grille, var_map)
+            solution_grille = interpreter_solution(solution, puzzle, var_map)
             
             if solution_grille is None:
                 messagebox.showerror("Erreur", "Erreur dans l'interprétation de la solution.")
@@ -629,7 +894,7 @@ class LightUpGUI:
         
         try:
             # Générer le problème SAT
-            var_map, nom_fichier = generer_dimacs(self.grille)
+            var_map, nom_fichier = generer_dimacs(grille_puzzle(self.grille))
             
             if var_map is None:
                 messagebox.showerror("Erreur", "Impossible de générer le problème SAT.")
@@ -648,6 +913,32 @@ class LightUpGUI:
         finally:
             self.root.config(cursor="")
     
+    def verifier_completude(self):
+        """Vérifie si les ampoules placées (et les cases marquées) peuvent encore mener à une solution"""
+        puzzle = grille_puzzle(self.grille)
+        cle = tuple(map(tuple, puzzle))
+        
+        # Le puzzle n'est encodé qu'une fois, tant que ses murs ne changent pas
+        if self.verificateur is None or self.cle_verificateur != cle:
+            self.verificateur = VerificateurCompletude(puzzle)
+            self.cle_verificateur = cle
+        
+        ampoules = [(i, j) for i, ligne in enumerate(self.grille) for j, cellule in enumerate(ligne) if cellule == 'A']
+        completable, echecs = self.verificateur.verifier(ampoules, self.marques)
+        
+        if completable is None:
+            messagebox.showerror("Erreur", "Aucun solveur SAT disponible (installez pysat ou MiniSAT).")
+        elif completable:
+            messagebox.showinfo("Complétude", "Votre placement peut encore être complété en une solution.")
+        else:
+            self.cases_erreur = {pos for _, pos in echecs}
+            self.redessiner_grille()
+            if echecs:
+                details = ", ".join(f"{'ampoule' if genre == 'ampoule' else 'marque'} en ({i},{j})" for genre, (i, j) in echecs)
+                messagebox.showinfo("Complétude", f"Impasse: ces choix sont incompatibles:\n{details}")
+            else:
+                messagebox.showinfo("Complétude", "Impasse: la grille n'a aucune solution.")
+    
     def afficher_regles(self):
         """Affiche les règles du jeu"""
         regles = """
@@ -660,6 +951,7 @@ Règles du jeu Light Up:
 
 Pour jouer:
 - Cliquez sur une case blanche pour y placer ou retirer une ampoule.
+- Clic droit pour marquer une case qui ne doit pas contenir d'ampoule.
 - Les cases éclairées sont marquées en jaune clair.
 - Utilisez "Vérification" pour voir si votre solution est correcte.
 - Utilisez "Solution SAT" pour résoudre automatiquement le puzzle.
@@ -680,6 +972,9 @@ Pour jouer:
                 if self.grille[i][j] in ['A', '*']:
                     self.grille[i][j] = '.'
         
+        self.index = None
+        self.marques = set()
+        self.cases_erreur = set()
         self.redessiner_grille()
     
     def effacer_grille(self):
@@ -687,7 +982,10 @@ Pour jouer:
         hauteur = len(self.grille)
         largeur = len(self.grille[0])
         self.grille = [['.' for _ in range(largeur)] for _ in range(hauteur)]
+        self.encodeur = None
+        self.index = None
         self.redessiner_grille()
+        self.mettre_a_jour_statut_edition()
     
     def generer_grille_aleatoire(self, hauteur, largeur, difficulte):
         """Génère une grille aléatoire avec la difficulté spécifiée"""
@@ -0,0 +1,31 @@
+"""Cœur du solveur Light Up sans interface: grille, encodage, solveurs, vérification.
+
+Aucun import de tkinter, aucun affichage, aucun fichier à nom fixe. Les
+noms ci-dessous sont chargés à la première utilisation (import lightup ne
+coûte presque rien); pysat et numpy ne sont importés que par les fonctions
+qui s'en servent.
+"""
+
+_EXPORTS = {
+    'lire_grille': 'lightup.grille_compacte',
+    'GrilleCompacte': 'lightup.grille_compacte',
+    'ResultatSolveur': 'lightup.solveurs',
+    'encoder': 'lightup.encodage',
+    'ecrire_cnf': 'lightup.encodage',
+    'resoudre': 'lightup.solveurs',
+    'moteur_par_defaut': 'lightup.solveurs',
+    'grille_avec_ampoules': 'lightup.verification',
+    'lister_erreurs': 'lightup.verification',
+    'est_solution': 'lightup.verification',
+    'decrire_erreur': 'lightup.verification',
+}
+
+__all__ = list(_EXPORTS)
+
+def __getattr__(nom):
+    if nom not in _EXPORTS:
+        raise AttributeError(f"module 'lightup' has no attribute '{nom}'")
+    from importlib import import_module
+    valeur = getattr(import_module(_EXPORTS[nom]), nom)
+    globals()[nom] = valeur
+    return valeur
@@ -0,0 +1,5 @@
+import sys
+
+from lightup.cli import main
+
+sys.exit(main())
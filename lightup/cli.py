@@ -0,0 +1,133 @@
+import os
+import sys
+
+USAGE = """usage: lightup GRILLE [--moteur minisat|pysat] [--timeout SECONDES] [--renforcer] [--sans-symetries]
+                      [--encodage auto|AMO/ECLAIRAGE] [--politique FICHIER] [--journal-encodage FICHIER]
+       lightup --verifier SOLUTION
+       lightup --temps-import [BUDGET_MS]"""
+
+# Modules qui ne doivent pas être chargés par l'import du cœur
+INTERDITS = ('tkinter', 'numpy', 'pysat')
+
+# Budget par défaut de l'import du cœur (--temps-import)
+BUDGET_IMPORT_MS = 50.0
+
+# Importe tout le cœur, puis liste les modules interdits chargés au passage
+SONDE = ("import lightup.cli, lightup.encodage, lightup.solveurs, lightup.verification, sys; "
+         "print(' '.join(m for m in sys.modules if m.split('.')[0] in {interdits!r}))")
+
+def mesurer_temps_import(repetitions=5):
+    """Temps d'import du cœur dans un interpréteur neuf (meilleur de repetitions, en ms).
+
+    Mesuré avec python -X importtime: somme des temps cumulés des imports de
+    premier niveau du paquet lightup, sans le démarrage de l'interpréteur.
+    Retourne (temps en ms, modules interdits chargés).
+    """
+    import subprocess
+    racine = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    environnement = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [racine, os.environ.get('PYTHONPATH')])))
+    meilleur, interdits = None, []
+    for _ in range(repetitions):
+        processus = subprocess.run([sys.executable, '-X', 'importtime', '-c', SONDE.format(interdits=INTERDITS)],
+                                   capture_output=True, text=True, env=environnement, check=True)
+        total = 0
+        for ligne in processus.stderr.splitlines():
+            # "import time:  self [us] | cumulative | nom", le nom indenté selon la profondeur
+            champs = ligne.split('|')
+            if len(champs) == 3 and champs[2].startswith(' lightup') and champs[1].strip().isdigit():
+                total += int(champs[1])
+        meilleur = total if meilleur is None else min(meilleur, total)
+        interdits = processus.stdout.split()
+    return meilleur / 1000, interdits
+
+def _lire(nom_fichier):
+    from lightup.grille_compacte import GrilleCompacte, est_binaire
+    if est_binaire(nom_fichier):
+        return GrilleCompacte.lire_binaire(nom_fichier)
+    return GrilleCompacte.lire_texte(nom_fichier)
+
+def _afficher(grille):
+    for ligne in grille.vers_liste(eclairage=True):
+        print(" ".join(ligne))
+
+def main(args=None):
+    """Point d'entrée de la commande lightup; retourne le code de sortie.
+
+    0: solution trouvée (ou valide, ou budget respecté), 1: pas de solution
+    (ou solution fausse, ou budget dépassé), 2: erreur d'utilisation.
+    """
+    args = list(sys.argv[1:] if args is None else args)
+    if not args or args[0] in ('-h', '--help'):
+        print(USAGE)
+        return 0 if args else 2
+
+    # --temps-import [BUDGET_MS]: vérifie que l'import du cœur reste dans le budget
+    if args[0] == '--temps-import':
+        budget = float(args[1]) if len(args) > 1 else BUDGET_IMPORT_MS
+        temps, interdits = mesurer_temps_import()
+        print(f"Import du cœur: {temps:.1f} ms (budget {budget:.0f} ms)")
+        if interdits:
+            print(f"Modules interdits chargés: {', '.join(interdits)}")
+        return 0 if temps <= budget and not interdits else 1
+
+    # --verifier SOLUTION: grille avec ses ampoules ('A')
+    if args[0] == '--verifier':
+        if len(args) < 2:
+            print(USAGE)
+            return 2
+        from lightup.verification import decrire_erreur, lister_erreurs_solution
+        erreurs = lister_erreurs_solution(_lire(args[1]))
+        for erreur in erreurs:
+            print(f"ERREUR: {decrire_erreur(erreur)}")
+        print("Solution valide" if not erreurs else f"Solution invalide ({len(erreurs)} erreur(s))")
+        return 0 if not erreurs else 1
+
+    moteur = timeout = politique = journal = None
+    encodage = 'auto'
+    renforcer = '--renforcer' in args
+    if renforcer:
+        args.remove('--renforcer')
+    briser_symetries = '--sans-symetries' not in args
+    if not briser_symetries:
+        args.remove('--sans-symetries')
+    for option in ('--moteur', '--timeout', '--encodage', '--politique', '--journal-encodage'):
+        if option in args:
+            position = args.index(option)
+            args.pop(position)
+            if position >= len(args):
+                print(USAGE)
+                return 2
+            valeur = args.pop(position)
+            if option == '--moteur':
+                moteur = valeur
+            elif option == '--timeout':
+                timeout = float(valeur)
+            elif option == '--encodage':
+                encodage = valeur
+            elif option == '--politique':
+                politique = valeur
+            else:
+                journal = valeur
+    from lightup.encodages import ENCODAGES
+    if len(args) != 1 or moteur not in (None, 'minisat', 'pysat') or encodage not in ('auto',) + ENCODAGES:
+        print(USAGE)
+        return 2
+
+    from lightup.solveurs import resoudre
+    if politique or journal:
+        from lightup import selection_encodage
+        if politique:
+            selection_encodage.utiliser_politique(politique)
+        selection_encodage.journaliser(journal)
+    grille = _lire(args[0])
+    try:
+        resultat = resoudre(grille, moteur, timeout, renforcer, briser_symetries, encodage)
+    except (FileNotFoundError, ImportError):
+        print("Aucun solveur: installer MiniSAT (dans le PATH) ou python-sat")
+        return 2
+    if resultat.statut != 'SAT':
+        print("Pas de solution" if resultat.statut == 'UNSAT' else "Pas de réponse (timeout dépassé)")
+        return 1
+    from lightup.verification import grille_avec_ampoules
+    _afficher(grille_avec_ampoules(grille, resultat.ampoules))
+    return 0
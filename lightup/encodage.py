@@ -0,0 +1,37 @@
+from lightup.encodages import encoder_variante
+from lightup.symetries import clauses_symetries
+
+def encoder(grille, renforcer=False, briser_symetries=True, encodage='auto', index=None):
+    """Encodage de la grille sans affichage ni fichier: (var_map, clauses, nb_vars).
+
+    encodage: une variante de encodages.ENCODAGES ('paires/direct' donne les
+    clauses de dimacs.generer_dimacs, symétries comprises, sans le
+    prétraitement), ou 'auto' pour le choix de selection_encodage d'après
+    les caractéristiques de la grille. var_map vaut None si un mur chiffré a
+    trop peu de voisins.
+    """
+    if encodage == 'auto':
+        from lightup.index_grille import IndexGrille
+        from lightup.selection_encodage import choisir_encodage
+        index = index or IndexGrille(grille)
+        encodage = choisir_encodage(grille, index)
+    var_map, clauses, nb_vars = encoder_variante(grille, encodage, index, renforcer)
+    if var_map is None:
+        return None, None, 0
+    if briser_symetries:
+        symetriques, nb_aux = clauses_symetries(grille, var_map, premiere_aux=nb_vars + 1)
+        clauses.extend(symetriques)
+        nb_vars += nb_aux
+    return var_map, clauses, nb_vars
+
+def ecrire_cnf(nom_fichier, clauses, nb_vars):
+    """Écrit les clauses au format DIMACS"""
+    with open(nom_fichier, 'w') as f:
+        f.write(f"p cnf {nb_vars} {len(clauses)}\n")
+        for clause in clauses:
+            f.write(" ".join(map(str, clause)) + " 0\n")
+
+def ampoules_du_modele(modele, var_map):
+    """Cases (i, j) des variables vraies du modèle (variables auxiliaires ignorées)"""
+    coord_map = {v: k for k, v in var_map.items()}
+    return [coord_map[l] for l in modele if l > 0 and l in coord_map]
@@ -0,0 +1,154 @@
+from itertools import combinations
+
+from lightup.index_grille import IndexGrille
+from lightup.renforcement import clauses_impliquees
+
+# Encodages disponibles: "au plus une ampoule par segment" / "case éclairée"
+AMO = ('paires', 'sequentiel')
+ECLAIRAGES = ('direct', 'segments')
+ENCODAGES = tuple(f"{amo}/{eclairage}" for amo in AMO for eclairage in ECLAIRAGES)
+PAR_DEFAUT = 'paires/direct'
+
+# En dessous de cette longueur, le compteur séquentiel coûte plus de clauses que les paires
+LONGUEUR_SEQUENTIEL = 5
+
+def clauses_exactement(variables, n):
+    """Clauses "exactement n variables vraies" (encodage binomial, pour les murs chiffrés)"""
+    clauses = []
+    if n > 0:
+        clauses.extend(list(comb) for comb in combinations(variables, len(variables) - n + 1))
+    if n < len(variables):
+        clauses.extend([-v for v in comb] for comb in combinations(variables, n + 1))
+    if n == 0:
+        clauses.extend([-v] for v in variables)
+    return clauses
+
+def generer_clauses(grille, index=None, renforcer=False, alignement=True):
+    """Génère les variables et les clauses sans affichage ni fichier (None, None si grille invalide).
+
+    renforcer ajoute les clauses impliquées par les règles du jeu (voir renforcement.py).
+    alignement=False omet les clauses d'alignement (ajoutées à la demande par cegar.py).
+    """
+    index = index or IndexGrille(grille)
+    if index.mur_impossible():
+        return None, None
+    L = index.L
+    clauses = []
+
+    # Une variable par case non-mur, en ordre ligne par ligne
+    var_case = [0] * (index.H * L)
+    var_map = {}
+    for c in range(index.H * L):
+        if not index.mur[c]:
+            var_case[c] = len(var_map) + 1
+            var_map[divmod(c, L)] = var_case[c]
+
+    # Alignement: deux ampoules d'un même segment ne se voient pas
+    if alignement:
+        for c, v1 in enumerate(var_case):
+            if v1:
+                for direction in index.directions(c):
+                    clauses.extend([-v1, -var_case[c2]] for c2 in direction)
+
+    # Éclairage: chaque case est éclairée par une ampoule de ses segments
+    for c, v in enumerate(var_case):
+        if v:
+            clauses.append([v] + [var_case[c2] for c2 in index.visibles(c)])
+
+    # Murs chiffrés: exactement N ampoules adjacentes
+    for k, c in enumerate(index.murs_chiffres):
+        chiffre = index.chiffre[c]
+        clauses.extend(clauses_exactement([var_case[c2] for c2 in index.voisins_mur(k)], chiffre))
+
+    if renforcer:
+        clauses.extend(clauses_impliquees(grille, var_map, index))
+
+    return var_map, clauses
+
+def au_plus_un_sequentiel(variables, premiere_aux):
+    """Clauses "au plus une variable vraie" par compteur séquentiel (Sinz).
+
+    s_i ("une des i premières est vraie") est numérotée premiere_aux + i - 1:
+    3m - 4 clauses et m - 1 variables auxiliaires au lieu de m(m-1)/2
+    clauses. Retourne (clauses, nombre de variables auxiliaires).
+    """
+    m = len(variables)
+    if m < 2:
+        return [], 0
+    s = list(range(premiere_aux, premiere_aux + m - 1))
+    clauses = [[-variables[0], s[0]]]
+    for i in range(1, m - 1):
+        clauses.append([-variables[i], s[i]])
+        clauses.append([-s[i - 1], s[i]])
+        clauses.append([-variables[i], -s[i - 1]])
+    clauses.append([-variables[m - 1], -s[m - 2]])
+    return clauses, m - 1
+
+def encoder_variante(grille, encodage=PAR_DEFAUT, index=None, renforcer=False):
+    """Encodage de la grille dans la variante donnée: (var_map, clauses, nb_vars).
+
+    amo 'paires': une clause binaire par paire de cases d'un segment;
+    'sequentiel': compteur séquentiel pour les segments d'au moins
+    LONGUEUR_SEQUENTIEL cases. eclairage 'direct': une clause par case avec
+    toutes les cases qu'elle voit; 'segments': une variable par segment
+    (vraie seulement si une de ses cases a une ampoule) et une clause binaire
+    par case. Les variables des cases sont celles de generer_clauses,
+    les auxiliaires les suivent; 'paires/direct' est exactement l'encodage de
+    generer_clauses. var_map vaut None si un mur chiffré a trop peu de voisins.
+    """
+    amo, eclairage = encodage.split('/')
+    if amo not in AMO or eclairage not in ECLAIRAGES:
+        raise ValueError(f"encodage inconnu: {encodage}")
+    index = index or IndexGrille(grille)
+    if encodage == 'paires/direct':
+        var_map, clauses = generer_clauses(grille, index, renforcer)
+        return (None, None, 0) if var_map is None else (var_map, clauses, len(var_map))
+    if index.mur_impossible():
+        return None, None, 0
+    L = index.L
+    var_case = [0] * (index.H * L)
+    var_map = {}
+    for c in range(index.H * L):
+        if not index.mur[c]:
+            var_case[c] = len(var_map) + 1
+            var_map[divmod(c, L)] = var_case[c]
+    nb_vars = len(var_map)
+    clauses = []
+    membres = [[var_case[c] for c in index.membres_segment(s)] for s in range(index.nb_segments)]
+
+    # Alignement: au plus une ampoule par segment
+    for variables in membres:
+        if amo == 'sequentiel' and len(variables) >= LONGUEUR_SEQUENTIEL:
+            nouvelles, nb_aux = au_plus_un_sequentiel(variables, nb_vars + 1)
+            clauses.extend(nouvelles)
+            nb_vars += nb_aux
+        else:
+            clauses.extend([-a, -b] for a, b in combinations(variables, 2))
+
+    # Éclairage
+    if eclairage == 'direct':
+        for c, v in enumerate(var_case):
+            if v:
+                clauses.append([v] + [var_case[c2] for c2 in index.visibles(c)])
+    else:
+        # Un segment d'une seule case est représenté par la variable de la case
+        var_segment = []
+        for variables in membres:
+            if len(variables) == 1:
+                var_segment.append(variables[0])
+            else:
+                nb_vars += 1
+                var_segment.append(nb_vars)
+                clauses.append([-nb_vars] + variables)
+        for c, v in enumerate(var_case):
+            if v:
+                clauses.append([var_segment[index.seg_ligne[c]], var_segment[index.seg_colonne[c]]])
+
+    # Murs chiffrés: exactement N ampoules adjacentes
+    for k, c in enumerate(index.murs_chiffres):
+        clauses.extend(clauses_exactement([var_case[c2] for c2 in index.voisins_mur(k)], index.chiffre[c]))
+
+    if renforcer:
+        clauses.extend(clauses_impliquees(grille, var_map, index))
+
+    return var_map, clauses, nb_vars
@@ -0,0 +1,186 @@
+import mmap
+import struct
+
+# Codes des cases, un octet par case (ceux de verificateur_numpy, qui peut lire les octets tels quels)
+BLANCHE = 0
+AMPOULE = 1
+MUR = 2
+MUR_CHIFFRE = 3  # '#N' est codé MUR_CHIFFRE + N
+
+# Format binaire: en-tête (signature, version, H, L) puis H * L octets ligne par ligne
+SIGNATURE = b'LUPG'
+VERSION = 1
+ENTETE = struct.Struct('<4sHxxII')
+
+TEXTE = {BLANCHE: '.', AMPOULE: 'A', MUR: '#', **{MUR_CHIFFRE + n: f"#{n}" for n in range(5)}}
+CODES = {texte: code for code, texte in TEXTE.items()}
+CODES.update({' ': BLANCHE, '*': BLANCHE})
+
+# Tables de bytes.translate: code -> 1 si mur, code -> chiffre (0xFF = -1 en octet signé)
+TABLE_MUR = bytes(1 if code >= MUR else 0 for code in range(256))
+TABLE_CHIFFRE = bytes(code - MUR_CHIFFRE if MUR_CHIFFRE <= code <= MUR_CHIFFRE + 4 else 0xFF for code in range(256))
+
+def code_case(cellule):
+    """Code d'une case de grille texte (' ', '.', '*', 'A', '#', '#N'); ValueError si N n'est pas entre 0 et 4"""
+    if cellule == 'A':
+        return AMPOULE
+    if cellule.startswith('#'):
+        if len(cellule) == 1:
+            return MUR
+        if len(cellule) != 2 or cellule[1] not in '01234':
+            raise ValueError(f"Mur chiffré invalide: '{cellule}' (chiffre de 0 à 4)")
+        return MUR_CHIFFRE + int(cellule[1:])
+    return BLANCHE
+
+class GrilleCompacte:
+    """Grille H x L stockée sur un octet par case, en ordre ligne par ligne (c = i * L + j).
+
+    cases est un bytearray, ou une vue en lecture seule sur un fichier
+    binaire projeté en mémoire (ouvrir). Les cases éclairées ('*') ne sont
+    pas stockées: elles se déduisent des ampoules (vers_liste(eclairage=True)).
+    """
+
+    def __init__(self, H, L, cases=None):
+        self.H = H
+        self.L = L
+        self.cases = bytearray(H * L) if cases is None else cases
+        self._projection = None
+
+    @classmethod
+    def depuis_liste(cls, grille):
+        """Convertit une grille texte (liste de listes de chaînes)"""
+        H, L = len(grille), len(grille[0])
+        cases = bytearray()
+        for ligne in grille:
+            cases += _coder(ligne)
+        return cls(H, L, cases)
+
+    @classmethod
+    def lire_texte(cls, nom_fichier):
+        """Lit le format texte habituel (cases séparées par des espaces) sans construire de liste de listes"""
+        cases = bytearray()
+        H = L = 0
+        with open(nom_fichier) as f:
+            for ligne in f:
+                cellules = ligne.split()
+                if not cellules:
+                    continue
+                cases += _coder(cellules)
+                H += 1
+                L = L or len(cellules)
+                if len(cases) != H * L:
+                    raise ValueError(f"Ligne {H} de longueur {len(cellules)} au lieu de {L}")
+        return cls(H, L, cases)
+
+    @classmethod
+    def lire_binaire(cls, nom_fichier):
+        """Charge un fichier binaire en mémoire (copie modifiable)"""
+        with open(nom_fichier, 'rb') as f:
+            H, L = _lire_entete(f.read(ENTETE.size))
+            cases = bytearray(f.read(H * L))
+        if len(cases) != H * L:
+            raise ValueError(f"Fichier '{nom_fichier}' tronqué")
+        return cls(H, L, cases)
+
+    @classmethod
+    def ouvrir(cls, nom_fichier):
+        """Projette un fichier binaire en mémoire (lecture seule, chargé à la demande par le système)"""
+        with open(nom_fichier, 'rb') as f:
+            projection = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        H, L = _lire_entete(projection[:ENTETE.size])
+        if len(projection) < ENTETE.size + H * L:
+            raise ValueError(f"Fichier '{nom_fichier}' tronqué")
+        grille = cls(H, L, memoryview(projection)[ENTETE.size:ENTETE.size + H * L])
+        grille._projection = projection
+        return grille
+
+    def ecrire_binaire(self, nom_fichier):
+        with open(nom_fichier, 'wb') as f:
+            f.write(ENTETE.pack(SIGNATURE, VERSION, self.H, self.L))
+            f.write(self.cases)
+
+    def ecrire_texte(self, nom_fichier, eclairage=False):
+        with open(nom_fichier, 'w') as f:
+            for ligne in self.vers_liste(eclairage):
+                f.write(' '.join(ligne) + '\n')
+
+    def vers_liste(self, eclairage=False):
+        """Grille texte; avec eclairage, les cases blanches deviennent '*' ou ' ' (format solution)"""
+        texte = [TEXTE[code] for code in range(MUR_CHIFFRE + 5)]
+        if not eclairage:
+            return [[texte[code] for code in ligne] for ligne in self.lignes()]
+        from lightup.index_grille import IndexGrille
+        index = IndexGrille(self)
+        comptes = index.segments_allumes(self.ampoules())
+        grille = []
+        for i, ligne in enumerate(self.lignes()):
+            base = i * self.L
+            grille.append([texte[code] if code != BLANCHE else ('*' if index.eclairee(base + j, comptes) else ' ')
+                           for j, code in enumerate(ligne)])
+        return grille
+
+    def lignes(self):
+        """Lignes de la grille (bytes), pour comparer ou transformer des grilles entières"""
+        cases = bytes(self.cases)
+        return [cases[i * self.L:(i + 1) * self.L] for i in range(self.H)]
+
+    def code(self, i, j):
+        return self.cases[i * self.L + j]
+
+    def cellule(self, i, j):
+        """Case (i, j) au format texte"""
+        return TEXTE[self.cases[i * self.L + j]]
+
+    def ampoules(self):
+        """Cases c contenant une ampoule"""
+        return list(_positions(bytes(self.cases), AMPOULE))
+
+    def mur(self):
+        """bytearray: 1 pour les murs (chiffrés ou non)"""
+        return bytearray(bytes(self.cases).translate(TABLE_MUR))
+
+    def chiffres(self):
+        """Octets signés: N pour un mur '#N', -1 sinon"""
+        return bytes(self.cases).translate(TABLE_CHIFFRE)
+
+    def __eq__(self, autre):
+        return isinstance(autre, GrilleCompacte) and (self.H, self.L) == (autre.H, autre.L) \
+            and self.cases == autre.cases
+
+def _coder(cellules):
+    """Octets d'une ligne de cases texte (table pour les cases usuelles, code_case sinon)"""
+    try:
+        return bytes(map(CODES.__getitem__, cellules))
+    except KeyError:
+        return bytes(map(code_case, cellules))
+
+def _lire_entete(octets):
+    if len(octets) < ENTETE.size:
+        raise ValueError("Fichier de grille binaire trop court")
+    signature, version, H, L = ENTETE.unpack(octets)
+    if signature != SIGNATURE:
+        raise ValueError("Ce n'est pas un fichier de grille binaire")
+    if version != VERSION:
+        raise ValueError(f"Version de grille binaire non supportée: {version}")
+    return H, L
+
+def _positions(octets, code):
+    """Indices des octets égaux à code (recherche en C avec bytes.find)"""
+    cible = bytes([code])
+    c = octets.find(cible)
+    while c >= 0:
+        yield c
+        c = octets.find(cible, c + 1)
+
+def est_binaire(nom_fichier):
+    """Vrai si le fichier commence par la signature du format binaire"""
+    with open(nom_fichier, 'rb') as f:
+        return f.read(len(SIGNATURE)) == SIGNATURE
+
+def lire_grille(nom_fichier):
+    """Lit une grille à partir d'un fichier (texte, ou binaire de grille_compacte)"""
+    if est_binaire(nom_fichier):
+        return GrilleCompacte.lire_binaire(nom_fichier).vers_liste()
+    with open(nom_fichier, 'r') as f:
+        lignes = [ligne.strip().split() for ligne in f.readlines()]
+    return lignes
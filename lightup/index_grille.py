@@ -0,0 +1,159 @@
+from array import array
+
+from lightup.grille_compacte import GrilleCompacte
+
+def est_mur(cellule):
+    """Vérifie si la cellule est un mur (chiffré ou non)"""
+    return cellule.startswith('#')
+
+class IndexGrille:
+    """Index des segments d'une grille, construit une seule fois en temps linéaire.
+
+    La grille est une liste de listes de chaînes ou une GrilleCompacte.
+    Les cases sont numérotées en ordre ligne par ligne (c = i * L + j).
+    Un segment est une suite maximale de cases non-murs sur une ligne (segments
+    0 .. nb_segments_lignes - 1) ou sur une colonne (segments suivants). Une
+    ampoule éclaire exactement les cases de ses deux segments.
+
+    Tableaux compacts (array) :
+      seg_ligne[c], seg_colonne[c]   segments de la case (-1 pour un mur)
+      rang_ligne[c], rang_colonne[c] position de la case dans ses segments
+      debut_segment[s] .. debut_segment[s+1]  tranche de membres du segment s
+      chiffre[c]                     N pour un mur '#N', -1 sinon
+      murs_chiffres                  cases des murs chiffrés
+      debut_voisins[k] .. debut_voisins[k+1]  tranche de voisins_blancs du k-ième mur chiffré
+    Les ordres (membres de haut en bas / de gauche à droite, voisins haut,
+    bas, gauche, droite) sont ceux des boucles historiques de parcours.
+    """
+
+    def __init__(self, grille):
+        if isinstance(grille, GrilleCompacte):
+            # Une traduction d'octets suffit: pas de chaîne à examiner case par case
+            H, L = grille.H, grille.L
+            self.mur = grille.mur()
+            self.chiffre = array('b')
+            self.chiffre.frombytes(grille.chiffres())
+        else:
+            H = len(grille)
+            L = len(grille[0])
+            self.mur = bytearray(H * L)
+            self.chiffre = array('b', [-1]) * (H * L)
+            for i, ligne in enumerate(grille):
+                base = i * L
+                for j, cellule in enumerate(ligne):
+                    if est_mur(cellule):
+                        self.mur[base + j] = 1
+                        if len(cellule) > 1:
+                            self.chiffre[base + j] = int(cellule[1:])
+        self.H = H
+        self.L = L
+        n = H * L
+
+        self.seg_ligne = array('i', [-1]) * n
+        self.seg_colonne = array('i', [-1]) * n
+        self.rang_ligne = array('i', [0]) * n
+        self.rang_colonne = array('i', [0]) * n
+        self.debut_segment = array('i')
+        self.membres = array('i')
+
+        mur = self.mur
+        # Segments horizontaux
+        for i in range(H):
+            ouvert = False
+            for c in range(i * L, i * L + L):
+                if mur[c]:
+                    ouvert = False
+                    continue
+                if not ouvert:
+                    self.debut_segment.append(len(self.membres))
+                    ouvert = True
+                s = len(self.debut_segment) - 1
+                self.seg_ligne[c] = s
+                self.rang_ligne[c] = len(self.membres) - self.debut_segment[s]
+                self.membres.append(c)
+        self.nb_segments_lignes = len(self.debut_segment)
+
+        # Segments verticaux
+        for j in range(L):
+            ouvert = False
+            for c in range(j, n, L):
+                if mur[c]:
+                    ouvert = False
+                    continue
+                if not ouvert:
+                    self.debut_segment.append(len(self.membres))
+                    ouvert = True
+                s = len(self.debut_segment) - 1
+                self.seg_colonne[c] = s
+                self.rang_colonne[c] = len(self.membres) - self.debut_segment[s]
+                self.membres.append(c)
+        self.debut_segment.append(len(self.membres))
+        self.nb_segments = len(self.debut_segment) - 1
+
+        # Voisins non-murs des murs chiffrés
+        self.murs_chiffres = array('i')
+        self.debut_voisins = array('i', [0])
+        self.voisins_blancs = array('i')
+        for c in range(n):
+            if self.chiffre[c] < 0:
+                continue
+            i, j = divmod(c, L)
+            self.murs_chiffres.append(c)
+            for ni, nj in ((i - 1, j), (i + 1, j), (i, j - 1), (i, j + 1)):
+                if 0 <= ni < H and 0 <= nj < L and not mur[ni * L + nj]:
+                    self.voisins_blancs.append(ni * L + nj)
+            self.debut_voisins.append(len(self.voisins_blancs))
+
+    def case(self, i, j):
+        """Numéro de la case (i, j)"""
+        return i * self.L + j
+
+    def position(self, c):
+        """Coordonnées (i, j) de la case c"""
+        return divmod(c, self.L)
+
+    def membres_segment(self, s):
+        """Cases du segment s, dans l'ordre de parcours"""
+        return self.membres[self.debut_segment[s]:self.debut_segment[s + 1]]
+
+    def directions(self, c):
+        """Cases vues depuis c vers le haut, le bas, la gauche et la droite (du plus proche au plus loin)"""
+        debut, rang = self.debut_segment[self.seg_colonne[c]], self.rang_colonne[c]
+        fin = self.debut_segment[self.seg_colonne[c] + 1]
+        haut = self.membres[debut:debut + rang][::-1]
+        bas = self.membres[debut + rang + 1:fin]
+        debut, rang = self.debut_segment[self.seg_ligne[c]], self.rang_ligne[c]
+        fin = self.debut_segment[self.seg_ligne[c] + 1]
+        gauche = self.membres[debut:debut + rang][::-1]
+        droite = self.membres[debut + rang + 1:fin]
+        return haut, bas, gauche, droite
+
+    def visibles(self, c):
+        """Cases vues depuis c (hors c), dans l'ordre haut, bas, gauche, droite"""
+        haut, bas, gauche, droite = self.directions(c)
+        return haut + bas + gauche + droite
+
+    def voisins_mur(self, k):
+        """Cases non-murs adjacentes au k-ième mur chiffré"""
+        return self.voisins_blancs[self.debut_voisins[k]:self.debut_voisins[k + 1]]
+
+    def mur_impossible(self):
+        """Premier mur chiffré avec trop peu de voisins libres: (i, j, chiffre, nb_voisins) ou None"""
+        for k, c in enumerate(self.murs_chiffres):
+            nb = self.debut_voisins[k + 1] - self.debut_voisins[k]
+            if self.chiffre[c] > nb:
+                i, j = self.position(c)
+                return i, j, self.chiffre[c], nb
+        return None
+
+    def segments_allumes(self, ampoules):
+        """Nombre d'ampoules par segment pour un ensemble de cases ampoules"""
+        comptes = array('i', [0]) * self.nb_segments
+        for c in ampoules:
+            comptes[self.seg_ligne[c]] += 1
+            comptes[self.seg_colonne[c]] += 1
+        return comptes
+
+    def eclairee(self, c, comptes):
+        """Vrai si la case c est dans un segment contenant une ampoule"""
+        return comptes[self.seg_ligne[c]] > 0 or comptes[self.seg_colonne[c]] > 0
@@ -0,0 +1,78 @@
+import contextlib
+import time
+
+# Désactivée par défaut: chrono() renvoie alors un contexte vide partagé
+ACTIF = False
+
+_NUL = contextlib.nullcontext()
+_temps = {}
+_compteurs = {}
+_solveur = []
+
+def activer(actif=True):
+    """Active ou désactive la collecte des mesures"""
+    global ACTIF
+    ACTIF = actif
+
+def reinitialiser():
+    """Efface toutes les mesures collectées"""
+    _temps.clear()
+    _compteurs.clear()
+    _solveur.clear()
+
+class _Chrono:
+    __slots__ = ('nom', 'debut')
+
+    def __init__(self, nom):
+        self.nom = nom
+
+    def __enter__(self):
+        self.debut = time.perf_counter()
+        return self
+
+    def __exit__(self, *args):
+        duree = time.perf_counter() - self.debut
+        total, appels = _temps.get(self.nom, (0.0, 0))
+        _temps[self.nom] = (total + duree, appels + 1)
+        return False
+
+def chrono(nom):
+    """Gestionnaire de contexte qui cumule la durée du bloc sous le nom donné"""
+    if not ACTIF:
+        return _NUL
+    return _Chrono(nom)
+
+def compter(nom, n=1):
+    """Incrémente un compteur"""
+    if ACTIF:
+        _compteurs[nom] = _compteurs.get(nom, 0) + n
+
+def enregistrer_solveur(stats):
+    """Conserve les statistiques d'un appel au solveur (dictionnaire)"""
+    if ACTIF:
+        _solveur.append(stats)
+
+def rapport():
+    """Retourne toutes les mesures sous forme de dictionnaire sérialisable"""
+    return {
+        'temps': {nom: {'total': total, 'appels': appels} for nom, (total, appels) in _temps.items()},
+        'compteurs': dict(_compteurs),
+        'solveur': list(_solveur),
+    }
+
+def afficher_rapport():
+    """Affiche les étapes de la plus coûteuse à la moins coûteuse"""
+    mesures = rapport()
+    print("=== Temps par étape ===")
+    for nom, m in sorted(mesures['temps'].items(), key=lambda x: -x[1]['total']):
+        print(f"{nom:>24}: {m['total'] * 1000:10.2f} ms ({m['appels']} appel(s))")
+    for nom, valeur in mesures['compteurs'].items():
+        print(f"{nom:>24}: {valeur}")
+    for stats in mesures['solveur']:
+        print("Solveur:", ", ".join(f"{cle}={valeur}" for cle, valeur in stats.items()))
+
+def exporter_json(nom_fichier):
+    """Écrit le rapport au format JSON"""
+    import json
+    with open(nom_fichier, 'w') as f:
+        json.dump(rapport(), f, indent=2)
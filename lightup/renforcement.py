@@ -0,0 +1,116 @@
+from lightup.index_grille import IndexGrille
+
+INCONNUE = 0
+AMPOULE = 1
+INTERDITE = 2
+
+def deduire(grille, index=None):
+    """Règles classiques du jeu appliquées jusqu'au point fixe.
+
+    - un mur chiffré qui a déjà ses N ampoules interdit ses autres voisins,
+      un mur dont il reste exactement N voisins possibles les force tous;
+    - une ampoule interdit toutes les cases qu'elle voit;
+    - une case non éclairée dont il ne reste qu'un éclaireur possible
+      (elle-même ou une case visible) force cette ampoule;
+    - règle diagonale: une ampoule en diagonale d'un mur vide les deux
+      voisins du mur qu'elle touche; si les autres voisins ne suffisent plus
+      au chiffre, la case diagonale est interdite (ex: diagonales d'un #3).
+    Retourne un bytearray d'états par case (INCONNUE, AMPOULE, INTERDITE),
+    ou None si la grille est contradictoire.
+    """
+    index = index or IndexGrille(grille)
+    L = index.L
+    etat = bytearray(index.H * L)
+    comptes = index.segments_allumes([])
+
+    def placer(c):
+        if etat[c] == INTERDITE:
+            return False
+        if etat[c] == AMPOULE:
+            return True
+        etat[c] = AMPOULE
+        comptes[index.seg_ligne[c]] += 1
+        comptes[index.seg_colonne[c]] += 1
+        for v in index.visibles(c):
+            if etat[v] == AMPOULE:
+                return False
+            etat[v] = INTERDITE
+        return True
+
+    # Règle diagonale (ne dépend que de la forme de la grille)
+    for k, c in enumerate(index.murs_chiffres):
+        voisins = set(index.voisins_mur(k))
+        i, j = index.position(c)
+        for di, dj in ((-1, -1), (-1, 1), (1, -1), (1, 1)):
+            di_, dj_ = i + di, j + dj
+            if not (0 <= di_ < index.H and 0 <= dj_ < L) or index.mur[di_ * L + dj_]:
+                continue
+            touches = voisins & {i * L + dj_, di_ * L + j}
+            if index.chiffre[c] > len(voisins) - len(touches):
+                etat[di_ * L + dj_] = INTERDITE
+
+    change = True
+    while change:
+        change = False
+        for k, c in enumerate(index.murs_chiffres):
+            chiffre = index.chiffre[c]
+            possibles = [m for m in index.voisins_mur(k) if etat[m] != INTERDITE]
+            nb_ampoules = sum(1 for m in possibles if etat[m] == AMPOULE)
+            if nb_ampoules > chiffre or len(possibles) < chiffre:
+                return None
+            if nb_ampoules == chiffre:
+                for m in possibles:
+                    if etat[m] == INCONNUE:
+                        etat[m] = INTERDITE
+                        change = True
+            elif len(possibles) == chiffre:
+                for m in possibles:
+                    if etat[m] == INCONNUE:
+                        if not placer(m):
+                            return None
+                        change = True
+
+        for c in range(index.H * L):
+            if index.mur[c] or index.eclairee(c, comptes):
+                continue
+            eclaireurs = [m for m in [c] + list(index.visibles(c)) if etat[m] != INTERDITE]
+            if not eclaireurs:
+                return None
+            if len(eclaireurs) == 1:
+                if not placer(eclaireurs[0]):
+                    return None
+                change = True
+    return etat
+
+def clauses_impliquees(grille, var_map, index=None):
+    """Clauses déduites des règles du jeu, à ajouter à l'encodage.
+
+    Unitaires pour les cases fixées par deduire(), et binaires pour la règle
+    diagonale quand le mur garde juste assez de voisins: une ampoule en
+    diagonale force alors les voisins qu'elle ne touche pas. Retourne [[]]
+    si la grille est contradictoire.
+    """
+    index = index or IndexGrille(grille)
+    etat = deduire(grille, index)
+    if etat is None:
+        return [[]]
+    L = index.L
+    clauses = []
+    for c, valeur in enumerate(etat):
+        if valeur != INCONNUE:
+            v = var_map[index.position(c)]
+            clauses.append([v] if valeur == AMPOULE else [-v])
+
+    for k, c in enumerate(index.murs_chiffres):
+        voisins = set(index.voisins_mur(k))
+        i, j = index.position(c)
+        for di, dj in ((-1, -1), (-1, 1), (1, -1), (1, 1)):
+            di_, dj_ = i + di, j + dj
+            if not (0 <= di_ < index.H and 0 <= dj_ < L) or etat[di_ * L + dj_] != INCONNUE \
+                    or index.mur[di_ * L + dj_]:
+                continue
+            reste = voisins - {i * L + dj_, di_ * L + j}
+            if index.chiffre[c] == len(reste) and len(reste) < len(voisins):
+                d = var_map[(di_, dj_)]
+                clauses.extend([-d, var_map[index.position(m)]] for m in sorted(reste))
+    return clauses
@@ -0,0 +1,274 @@
+import json
+import time
+from math import log
+
+from lightup import instrumentation
+from lightup.encodages import ENCODAGES, LONGUEUR_SEQUENTIEL
+from lightup.index_grille import IndexGrille
+
+CARACTERISTIQUES = ('cases', 'densite_murs', 'ratio_chiffres', 'saturation', 'longueur_moyenne', 'longueur_p90',
+                    'longueur_max', 'part_longs')
+
+# Arbre appris par python3 benchmark.py --entrainer-encodage --par-case 6 --repetitions 2
+# (grilles tirées et plantées de 7x7 à 200x200, graine 0, pysat): le compteur
+# séquentiel gagne partout sauf sur les grandes grilles solvables, où ses
+# variables auxiliaires ralentissent la recherche
+ARBRE_DEFAUT = {
+    'caracteristique': 'saturation', 'seuil': 0.3049,
+    'inferieur': {'caracteristique': 'cases', 'seuil': 25000,
+                  'inferieur': {'encodage': 'sequentiel/segments'},
+                  'superieur': {'encodage': 'paires/segments'}},
+    'superieur': {'encodage': 'sequentiel/segments'},
+}
+
+# Décisions journalisées (JSON lines), None pour ne rien écrire: voir journaliser()
+JOURNAL = None
+
+def caracteristiques(grille, index=None):
+    """Caractéristiques de la grille qui départagent les encodages.
+
+    cases: taille de la grille; densite_murs: part des cases qui sont des
+    murs; ratio_chiffres: part des murs qui sont chiffrés; saturation:
+    chiffres rapportés aux voisins libres des murs chiffrés (faible pour une
+    grille solvable, élevée pour une grille tirée au hasard); longueurs des
+    segments: moyenne vue d'une case (pondérée par les cases), 90e centile,
+    maximum, et part des cases dans un segment assez long pour le compteur
+    séquentiel.
+    """
+    index = index or IndexGrille(grille)
+    cases = index.H * index.L
+    debut = index.debut_segment
+    longueurs = sorted(debut[s + 1] - debut[s] for s in range(index.nb_segments))
+    membres = len(index.membres)  # Chaque case libre est dans deux segments
+    nb_murs = cases - membres // 2
+    voisins = len(index.voisins_blancs)
+    return {
+        'cases': cases,
+        'densite_murs': nb_murs / cases,
+        'ratio_chiffres': len(index.murs_chiffres) / nb_murs if nb_murs else 0.0,
+        'saturation': sum(index.chiffre[c] for c in index.murs_chiffres) / voisins if voisins else 0.0,
+        'longueur_moyenne': sum(l * l for l in longueurs) / membres if membres else 0.0,
+        'longueur_p90': longueurs[(len(longueurs) - 1) * 9 // 10] if longueurs else 0,
+        'longueur_max': longueurs[-1] if longueurs else 0,
+        'part_longs': sum(l for l in longueurs if l >= LONGUEUR_SEQUENTIEL) / membres if membres else 0.0,
+    }
+
+class Politique:
+    """Arbre de décision: caractéristiques d'une grille -> encodage.
+
+    Un nœud est soit une feuille {'encodage': nom}, soit {'caracteristique':
+    nom, 'seuil': x, 'inferieur': nœud, 'superieur': nœud}, la branche
+    inferieur étant suivie quand la caractéristique est < seuil.
+    """
+
+    def __init__(self, arbre=None):
+        self.arbre = arbre or ARBRE_DEFAUT
+
+    def choisir(self, caract):
+        """(encodage, règle suivie) pour des caractéristiques"""
+        noeud = self.arbre
+        regle = []
+        while 'encodage' not in noeud:
+            nom, seuil = noeud['caracteristique'], noeud['seuil']
+            if caract[nom] < seuil:
+                regle.append(f"{nom} < {seuil:g}")
+                noeud = noeud['inferieur']
+            else:
+                regle.append(f"{nom} >= {seuil:g}")
+                noeud = noeud['superieur']
+        return noeud['encodage'], " et ".join(regle) or "toujours"
+
+    def decrire(self, noeud=None, marge=""):
+        """Lignes de texte de l'arbre, indentées par profondeur"""
+        noeud = noeud or self.arbre
+        if 'encodage' in noeud:
+            return [f"{marge}-> {noeud['encodage']}"]
+        nom, seuil = noeud['caracteristique'], noeud['seuil']
+        return ([f"{marge}{nom} < {seuil:g}:"] + self.decrire(noeud['inferieur'], marge + "    ") +
+                [f"{marge}{nom} >= {seuil:g}:"] + self.decrire(noeud['superieur'], marge + "    "))
+
+    def sauvegarder(self, nom_fichier):
+        with open(nom_fichier, 'w') as f:
+            json.dump(self.arbre, f, indent=2)
+
+    @classmethod
+    def charger(cls, nom_fichier):
+        with open(nom_fichier) as f:
+            return cls(json.load(f))
+
+_politique = Politique()
+
+def utiliser_politique(politique):
+    """Remplace la politique de choisir_encodage (Politique, nom de fichier JSON, ou None pour l'arbre par défaut)"""
+    global _politique
+    _politique = Politique.charger(politique) if isinstance(politique, str) else politique or Politique()
+
+def journaliser(nom_fichier="selection_encodage.jsonl"):
+    """Ajoute chaque décision de choisir_encodage au fichier JSON lines (None: plus de journal)"""
+    global JOURNAL
+    JOURNAL = nom_fichier
+
+def choisir_encodage(grille, index=None, politique=None):
+    """Encodage de la grille choisi par la politique (par défaut celle de utiliser_politique).
+
+    La décision est comptée dans instrumentation (compteur encodage_NOM) et
+    ajoutée au journal s'il est activé, avec les caractéristiques et la règle
+    suivie.
+    """
+    caract = caracteristiques(grille, index)
+    encodage, regle = (politique or _politique).choisir(caract)
+    instrumentation.compter(f"encodage_{encodage}")
+    if JOURNAL:
+        with open(JOURNAL, 'a') as f:
+            f.write(json.dumps({
+                'date': time.strftime("%Y-%m-%dT%H:%M:%S"),
+                'caracteristiques': caract,
+                'regle': regle,
+                'encodage': encodage,
+            }) + "\n")
+    return encodage
+
+# Apprentissage
+
+def mesurer(corpus, encodages=ENCODAGES, moteur=None, repetitions=1):
+    """Temps de résolution (encodage compris) de chaque grille du corpus avec chaque encodage.
+
+    Le meilleur temps de repetitions essais est gardé. Retourne une mesure
+    par grille: id, taille, difficulte, plantee, caracteristiques, temps
+    {encodage: secondes}. Une divergence de statut entre encodages lève
+    RuntimeError.
+    """
+    from lightup.solveurs import resoudre
+    mesures = []
+    for instance in corpus:
+        temps, statuts = {}, set()
+        for encodage in encodages:
+            for _ in range(repetitions):
+                resultat = resoudre(instance['grille'], moteur, encodage=encodage)
+                temps[encodage] = min(temps.get(encodage, resultat.temps), resultat.temps)
+                statuts.add(resultat.statut)
+        if len(statuts) > 1:
+            raise RuntimeError(f"{instance['id']}: statuts différents selon l'encodage ({', '.join(sorted(statuts))})")
+        mesures.append({
+            'id': instance['id'],
+            'taille': instance['taille'],
+            'difficulte': instance['difficulte'],
+            'plantee': instance.get('plantee', False),
+            'caracteristiques': caracteristiques(instance['grille']),
+            'temps': temps,
+        })
+    return mesures
+
+def case_corpus(mesure):
+    """Case du corpus d'une mesure: taille, difficulté et origine (tirée ou plantée)"""
+    return f"{mesure['taille']}x{mesure['taille']}-{mesure['difficulte']}" + (" (plantées)" if mesure['plantee'] else "")
+
+def _couts(exemples, nb):
+    """Coût total de chaque encodage sur les exemples"""
+    return [sum(r[e] for _, r in exemples) for e in range(nb)]
+
+def _coupes(exemples, nb, min_cases):
+    """Coupures possibles: (caractéristique, seuil, inférieurs, supérieurs, coût de deux feuilles)"""
+    couts = _couts(exemples, nb)
+    for nom in CARACTERISTIQUES:
+        tri = sorted(exemples, key=lambda x: x[0][nom])
+        cumul = [[0.0] * nb]  # cumul[k][e]: coût de e sur les k premiers exemples
+        for _, r in tri:
+            cumul.append([c + x for c, x in zip(cumul[-1], r)])
+        for k in range(min_cases, len(tri) - min_cases + 1):
+            a, b = tri[k - 1][0][nom], tri[k][0][nom]
+            if a != b:
+                yield nom, (a + b) / 2, tri[:k], tri[k:], min(cumul[k]) + min(t - c for t, c in zip(couts, cumul[k]))
+
+def _cout_une_coupe(exemples, nb, min_cases):
+    """Meilleur coût avec au plus une coupure"""
+    return min([min(_couts(exemples, nb))] + [coupe[4] for coupe in _coupes(exemples, nb, min_cases)])
+
+def _noeud(exemples, encodages, profondeur, min_cases, gain_min):
+    """Nœud appris sur des exemples (caractéristiques, coût par encodage).
+
+    Une coupure est jugée avec la meilleure coupure suivante de chaque côté
+    (anticipation d'un niveau): une coupure qui ne gagne rien seule mais
+    isole une coupure utile est trouvée.
+    """
+    nb = len(encodages)
+    couts = _couts(exemples, nb)
+    cout = min(couts)
+    feuille = {'encodage': encodages[couts.index(cout)]}
+    if profondeur == 0 or len(exemples) < 2 * min_cases:
+        return feuille
+    coupe = None
+    for nom, seuil, inferieur, superieur, total in _coupes(exemples, nb, min_cases):
+        if profondeur > 1:
+            total = _cout_une_coupe(inferieur, nb, min_cases) + _cout_une_coupe(superieur, nb, min_cases)
+        if coupe is None or total < coupe[0]:
+            coupe = (total, nom, seuil, inferieur, superieur)
+    # Gain moyen d'au moins gain_min sur les exemples du plus petit côté
+    if coupe is None or cout - coupe[0] < gain_min * min(len(coupe[3]), len(coupe[4])):
+        return feuille
+    _, nom, seuil, inferieur, superieur = coupe
+    inferieur = _noeud(inferieur, encodages, profondeur - 1, min_cases, gain_min)
+    superieur = _noeud(superieur, encodages, profondeur - 1, min_cases, gain_min)
+    if inferieur == superieur:
+        return inferieur  # Les deux côtés ont renoncé à leur coupure
+    return {'caracteristique': nom, 'seuil': seuil, 'inferieur': inferieur, 'superieur': superieur}
+
+def entrainer(mesures, encodages=ENCODAGES, profondeur=2, min_cases=3, gain_min=0.03):
+    """Apprend une Politique sur des mesures (voir mesurer).
+
+    Les exemples sont les cases du corpus (case_corpus), pas les grilles:
+    d'une grille à l'autre, le meilleur encodage varie beaucoup au hasard de
+    la recherche du solveur, alors que le temps total d'une case est stable.
+    Un exemple a pour caractéristiques la moyenne de celles de ses grilles,
+    et pour coût d'un encodage le log de son temps total rapporté au
+    meilleur encodage de la case: chaque case pèse le même poids, quelle que
+    soit la taille de ses grilles. Une feuille garde l'encodage de moindre
+    coût; une coupure (caractéristique, seuil) n'est gardée que si elle
+    laisse min_cases cases de chaque côté et fait gagner en moyenne gain_min
+    sur les cases du plus petit côté: une minorité de cases mal servies par
+    l'encodage majoritaire obtient sa propre feuille.
+    """
+    cases = {}
+    for m in mesures:
+        cases.setdefault(case_corpus(m), []).append(m)
+    exemples = []
+    for groupe in cases.values():
+        caract = {nom: sum(m['caracteristiques'][nom] for m in groupe) / len(groupe) for nom in CARACTERISTIQUES}
+        temps = [sum(m['temps'][e] for m in groupe) for e in encodages]
+        exemples.append((caract, [log(t / min(temps)) for t in temps]))
+    return Politique(_noeud(exemples, list(encodages), profondeur, min_cases, gain_min))
+
+def evaluer(politique, mesures, encodages=ENCODAGES):
+    """Temps total de la politique et de chaque encodage fixe, par case du corpus.
+
+    Voir case_corpus. ratio: temps de la politique rapporté au meilleur
+    encodage fixe de la case.
+    """
+    bilan = {}
+    for m in mesures:
+        ligne = bilan.setdefault(case_corpus(m), {'grilles': 0, 'politique': 0.0, 'fixes': dict.fromkeys(encodages, 0.0)})
+        ligne['grilles'] += 1
+        ligne['politique'] += m['temps'][politique.choisir(m['caracteristiques'])[0]]
+        for encodage in encodages:
+            ligne['fixes'][encodage] += m['temps'][encodage]
+    for ligne in bilan.values():
+        ligne['ratio'] = ligne['politique'] / min(ligne['fixes'].values())
+    return bilan
+
+if __name__ == "__main__":
+    import sys
+
+    from lightup.grille_compacte import lire_grille
+
+    if len(sys.argv) > 1 and sys.argv[1] == '--politique':
+        politique = Politique.charger(sys.argv[2]) if len(sys.argv) > 2 else Politique()
+        print("\n".join(politique.decrire()))
+        sys.exit(0)
+    if len(sys.argv) < 2:
+        print("usage: python3 selection_encodage.py GRILLE... | --politique [FICHIER]")
+        sys.exit(2)
+    for nom_fichier in sys.argv[1:]:
+        caract = caracteristiques(lire_grille(nom_fichier))
+        encodage, regle = Politique().choisir(caract)
+        print(f"{nom_fichier}: {encodage} ({regle})")
+        print("  " + ", ".join(f"{nom}={valeur:.3g}" for nom, valeur in caract.items()))
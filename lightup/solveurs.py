@@ -0,0 +1,153 @@
+import os
+import time
+
+from lightup import instrumentation
+from lightup.encodage import ampoules_du_modele, ecrire_cnf, encoder
+from lightup.index_grille import IndexGrille
+
+STATS_PYSAT = {'restarts': 'redemarrages', 'conflicts': 'conflits', 'decisions': 'decisions',
+               'propagations': 'propagations'}
+
+class ResultatSolveur:
+    """Résultat structuré d'un appel au solveur SAT"""
+
+    def __init__(self, statut, modele=None, stats=None, temps=0.0, sortie="", erreurs=""):
+        self.statut = statut  # 'SAT', 'UNSAT' ou 'INCONNU'
+        self.modele = modele
+        self.stats = stats or {}
+        self.temps = temps
+        self.sortie = sortie
+        self.erreurs = erreurs
+
+    def vers_dict(self):
+        """Représentation sérialisable (sans le modèle)"""
+        return {'statut': self.statut, 'temps': self.temps, **self.stats}
+
+STATS_MINISAT = {
+    'redemarrages': r"restarts\s*:\s*(\d+)",
+    'conflits': r"conflicts\s*:\s*(\d+)",
+    'decisions': r"decisions\s*:\s*(\d+)",
+    'propagations': r"propagations\s*:\s*(\d+)",
+    'temps_cpu': r"CPU time\s*:\s*([\d.]+)",
+    'memoire_mo': r"Memory used\s*:\s*([\d.]+)",
+}
+
+def analyser_stats_minisat(sortie):
+    """Extrait les statistiques (conflits, décisions, propagations, temps CPU...) de la sortie de MiniSAT"""
+    import re  # Comme subprocess: importés à l'usage, pour que l'import du cœur (lightup) reste rapide
+    stats = {}
+    for cle, motif in STATS_MINISAT.items():
+        trouve = re.search(motif, sortie)
+        if trouve:
+            valeur = trouve.group(1)
+            stats[cle] = float(valeur) if '.' in valeur else int(valeur)
+    return stats
+
+def lire_modele(nom_solution):
+    """Lit le fichier résultat de MiniSAT: (statut, modèle)"""
+    with open(nom_solution, "r") as f:
+        lignes = f.readlines()
+    if not lignes:
+        return 'INCONNU', None
+    if lignes[0].strip() == "SAT":
+        valeurs = lignes[1].split() if len(lignes) > 1 else []
+        return 'SAT', [int(x) for x in valeurs if x != "0"]
+    if lignes[0].strip() == "UNSAT":
+        return 'UNSAT', None
+    return 'INCONNU', None
+
+def resoudre_cnf(nom_fichier="output.cnf", nom_solution="solution.txt", timeout=None):
+    """Lance MiniSAT sur un fichier DIMACS et retourne un ResultatSolveur (FileNotFoundError si absent)"""
+    import subprocess
+    debut = time.perf_counter()
+    with instrumentation.chrono("lancement_solveur"):
+        processus = subprocess.Popen(["minisat", nom_fichier, nom_solution],
+                                     stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    with instrumentation.chrono("resolution"):
+        try:
+            sortie, erreurs = processus.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            processus.kill()
+            sortie, erreurs = processus.communicate()
+            return ResultatSolveur('INCONNU', stats=analyser_stats_minisat(sortie),
+                                   temps=time.perf_counter() - debut, sortie=sortie, erreurs=erreurs)
+
+    with instrumentation.chrono("lecture_modele"):
+        stats = analyser_stats_minisat(sortie)
+        if processus.returncode == 20 or "UNSATISFIABLE" in sortie:
+            statut, modele = 'UNSAT', None
+        else:
+            try:
+                statut, modele = lire_modele(nom_solution)
+            except FileNotFoundError:
+                statut, modele = 'INCONNU', None
+
+    resultat = ResultatSolveur(statut, modele, stats, time.perf_counter() - debut, sortie, erreurs)
+    instrumentation.enregistrer_solveur(resultat.vers_dict())
+    return resultat
+
+def moteur_par_defaut():
+    """'minisat' s'il est dans le PATH, sinon 'pysat'"""
+    from shutil import which
+    return 'minisat' if which('minisat') else 'pysat'
+
+def resoudre(grille, moteur=None, timeout=None, renforcer=False, briser_symetries=True, encodage='auto'):
+    """Résout une grille sans rien afficher: ResultatSolveur.
+
+    moteur: 'minisat' (fichiers dans un dossier temporaire, supprimé après
+    l'appel) ou 'pysat' (en mémoire). timeout borne la résolution (statut
+    INCONNU au-delà). encodage: variante de l'encodage ou 'auto' (voir
+    encoder). L'attribut ampoules donne les cases (i, j) des ampoules si
+    SAT, None sinon; l'attribut encodage, la variante utilisée.
+    """
+    debut = time.perf_counter()
+    index = IndexGrille(grille)
+    if encodage == 'auto':
+        from lightup.selection_encodage import choisir_encodage
+        encodage = choisir_encodage(grille, index)
+    var_map, clauses, nb_vars = encoder(grille, renforcer, briser_symetries, encodage, index)
+    if var_map is None:
+        resultat = ResultatSolveur('UNSAT')
+    elif (moteur or moteur_par_defaut()) == 'minisat':
+        resultat = resoudre_minisat(clauses, nb_vars, timeout)
+    else:
+        resultat = resoudre_pysat(clauses, timeout)
+    resultat.temps = time.perf_counter() - debut
+    resultat.encodage = encodage
+    resultat.ampoules = ampoules_du_modele(resultat.modele, var_map) if resultat.statut == 'SAT' else None
+    return resultat
+
+def resoudre_minisat(clauses, nb_vars, timeout=None):
+    """MiniSAT sur les clauses, via un dossier temporaire (FileNotFoundError si MiniSAT est absent)"""
+    from tempfile import TemporaryDirectory
+    with TemporaryDirectory(prefix="lightup_") as dossier:
+        nom_cnf = os.path.join(dossier, "grille.cnf")
+        ecrire_cnf(nom_cnf, clauses, nb_vars)
+        return resoudre_cnf(nom_cnf, os.path.join(dossier, "solution.txt"), timeout)
+
+def creer_pysat(clauses):
+    """Solveur pysat (MiniSAT 2.2 en mémoire) initialisé avec les clauses (ImportError sans python-sat)"""
+    from pysat.solvers import Solver
+    return Solver(name='minisat22', bootstrap_with=clauses)
+
+def stats_pysat(solveur):
+    return {STATS_PYSAT[cle]: valeur for cle, valeur in solveur.accum_stats().items() if cle in STATS_PYSAT}
+
+def resoudre_pysat(clauses, timeout=None):
+    """pysat sur les clauses; au-delà de timeout secondes le solveur est interrompu"""
+    solveur = creer_pysat(clauses)
+    try:
+        if timeout is None:
+            reponse = solveur.solve()
+        else:
+            from threading import Timer
+            minuterie = Timer(timeout, solveur.interrupt)
+            minuterie.start()
+            try:
+                reponse = solveur.solve_limited(expect_interrupt=True)
+            finally:
+                minuterie.cancel()
+        statut = {True: 'SAT', False: 'UNSAT'}.get(reponse, 'INCONNU')
+        return ResultatSolveur(statut, solveur.get_model() if reponse else None, stats_pysat(solveur))
+    finally:
+        solveur.delete()
@@ -0,0 +1,92 @@
+from lightup.grille_compacte import GrilleCompacte
+
+def transformations(H, L):
+    """Rotations et réflexions qui conservent les dimensions H x L.
+
+    nom -> (grille -> grille transformée, case (i, j) -> case image). La
+    grille transformée T vérifie T[image(i, j)] = grille[i][j].
+    """
+    t = {
+        'rotation180': (lambda g: [ligne[::-1] for ligne in g[::-1]], lambda i, j: (H - 1 - i, L - 1 - j)),
+        'miroir_horizontal': (lambda g: [ligne[::-1] for ligne in g], lambda i, j: (i, L - 1 - j)),
+        'miroir_vertical': (lambda g: g[::-1], lambda i, j: (H - 1 - i, j)),
+    }
+    if H == L:
+        t.update({
+            'rotation90': (lambda g: list(zip(*g[::-1])), lambda i, j: (j, H - 1 - i)),
+            'rotation270': (lambda g: list(zip(*g))[::-1], lambda i, j: (L - 1 - j, i)),
+            'transposition': (lambda g: list(zip(*g)), lambda i, j: (j, i)),
+            'antitransposition': (lambda g: list(zip(*[ligne[::-1] for ligne in g[::-1]])),
+                                  lambda i, j: (L - 1 - j, H - 1 - i)),
+        })
+    return t
+
+def detecter_symetries(grille):
+    """Transformations qui laissent la grille inchangée (murs et chiffres compris): {nom: image}.
+
+    Comparaison des empreintes (hash) des grilles transformées, puis égalité
+    exacte pour écarter les collisions. Une GrilleCompacte est comparée ligne
+    par ligne sur ses octets.
+    """
+    if isinstance(grille, GrilleCompacte):
+        grille = grille.lignes()
+    H, L = len(grille), len(grille[0])
+    reference = tuple(map(tuple, grille))
+    empreinte = hash(reference)
+    symetries = {}
+    for nom, (transformer, image) in transformations(H, L).items():
+        transformee = tuple(map(tuple, transformer(grille)))
+        if hash(transformee) == empreinte and transformee == reference:
+            symetries[nom] = image
+    return symetries
+
+def clauses_lex_leader(permutation, premiere_aux):
+    """Clauses imposant x <=lex x∘permutation (variables dans l'ordre 1..n).
+
+    permutation[v] est l'image de la variable v (indice 0 inutilisé). Les
+    variables auxiliaires e_k ("préfixe égal jusqu'à la position k") sont
+    numérotées à partir de premiere_aux. Les points fixes, et la deuxième
+    case de chaque paire échangée (égalité déjà acquise), sont sautés.
+    Retourne (clauses, nombre de variables auxiliaires).
+    """
+    positions = [v for v in range(1, len(permutation))
+                 if permutation[v] != v and not (permutation[v] < v and permutation[permutation[v]] == v)]
+    clauses = []
+    egal = None  # e_{k-1}, None tant que le préfixe est vide
+    aux = premiere_aux
+    for rang, v in enumerate(positions):
+        w = permutation[v]
+        prefixe = [] if egal is None else [-egal]
+        clauses.append(prefixe + [-v, w])
+        if rang + 1 < len(positions):
+            # e_k <- e_{k-1} et x_v = x_w (le cas x_v > x_w est exclu ci-dessus)
+            clauses.append(prefixe + [-v, -w, aux])
+            clauses.append(prefixe + [v, w, aux])
+            egal = aux
+            aux += 1
+    return clauses, aux - premiere_aux
+
+def clauses_symetries(grille, var_map, symetries=None, premiere_aux=None):
+    """Clauses lex-leader pour chaque symétrie de la grille.
+
+    Une seule solution par classe de solutions symétriques est conservée:
+    la satisfiabilité ne change pas, mais l'énumération de toutes les
+    solutions (unicité...) ne doit pas utiliser ces clauses. Les variables
+    auxiliaires suivent celles des cases (len(var_map) + 1, ...), ou sont
+    numérotées à partir de premiere_aux si l'encodage en a déjà.
+    Retourne (clauses, nombre de variables auxiliaires).
+    """
+    if symetries is None:
+        symetries = detecter_symetries(grille)
+    if premiere_aux is None:
+        premiere_aux = len(var_map) + 1
+    clauses = []
+    nb_aux = 0
+    for image in symetries.values():
+        permutation = [0] * (len(var_map) + 1)
+        for (i, j), v in var_map.items():
+            permutation[v] = var_map[image(i, j)]
+        nouvelles, n = clauses_lex_leader(permutation, premiere_aux + nb_aux)
+        clauses.extend(nouvelles)
+        nb_aux += n
+    return clauses, nb_aux
@@ -0,0 +1,95 @@
+import numpy as np
+
+# Codes int8 des cases: ceux de la grille compacte (un octet par case)
+from lightup.grille_compacte import AMPOULE, MUR, MUR_CHIFFRE, GrilleCompacte, code_case
+
+CATEGORIES = ('non_eclairee', 'ampoules_alignees', 'mur_chiffre')
+
+def vers_tableau(grilles):
+    """Convertit une grille ou une liste de grilles de même forme en tableau int8 (B, H, L).
+
+    Les octets d'une GrilleCompacte sont lus sans copie (y compris projetés en mémoire).
+    """
+    if isinstance(grilles, GrilleCompacte):
+        return np.frombuffer(grilles.cases, dtype=np.int8).reshape(1, grilles.H, grilles.L)
+    if grilles and isinstance(grilles[0], GrilleCompacte):
+        return np.stack([vers_tableau(grille)[0] for grille in grilles])
+    if grilles and isinstance(grilles[0][0], str):
+        grilles = [grilles]
+    table = {}
+    return np.array([[[table.setdefault(c, code_case(c)) for c in ligne] for ligne in grille] for grille in grilles],
+                    dtype=np.int8)
+
+def _comptes_segments(ampoules, murs):
+    """Nombre d'ampoules du segment horizontal contenant chaque case (B, H, L)"""
+    B, H, L = murs.shape
+    # Chaque mur ouvre un nouveau segment: la somme cumulée des murs numérote les segments d'une ligne
+    etiquettes = np.cumsum(murs, axis=2, dtype=np.int64)
+    etiquettes += (np.arange(B * H, dtype=np.int64) * (L + 1)).reshape(B, H, 1)
+    comptes = np.bincount(etiquettes.ravel(), weights=ampoules.ravel(), minlength=B * H * (L + 1))
+    return comptes[etiquettes].astype(np.int32)
+
+def analyser_lot(tableau):
+    """Calcule les masques d'erreurs d'un lot (B, H, L): (non_eclairees, conflits, murs_faux, voisines)"""
+    tableau = np.asarray(tableau, dtype=np.int8)
+    murs = tableau >= MUR
+    ampoules = tableau == AMPOULE
+
+    comptes_lignes = _comptes_segments(ampoules, murs)
+    comptes_colonnes = _comptes_segments(ampoules.transpose(0, 2, 1), murs.transpose(0, 2, 1)).transpose(0, 2, 1)
+
+    non_eclairees = ~murs & (comptes_lignes == 0) & (comptes_colonnes == 0)
+    conflits = ampoules & ((comptes_lignes > 1) | (comptes_colonnes > 1))
+
+    # Ampoules adjacentes par décalage du tableau bordé de zéros
+    bord = np.pad(ampoules.astype(np.int8), ((0, 0), (1, 1), (1, 1)))
+    voisines = bord[:, :-2, 1:-1] + bord[:, 2:, 1:-1] + bord[:, 1:-1, :-2] + bord[:, 1:-1, 2:]
+    murs_faux = (tableau >= MUR_CHIFFRE) & (voisines != tableau - MUR_CHIFFRE)
+
+    return non_eclairees, conflits, murs_faux, voisines
+
+def verifier_lot(grilles):
+    """Vérifie un lot de grilles solution de même forme en un seul appel.
+
+    Retourne (valides, nombres) où valides est un tableau booléen (B,) et
+    nombres associe à chaque catégorie d'erreur le nombre de cases fautives par grille.
+    """
+    tableau = grilles if isinstance(grilles, np.ndarray) else vers_tableau(grilles)
+    non_eclairees, conflits, murs_faux, _ = analyser_lot(tableau)
+    nombres = {
+        'non_eclairee': non_eclairees.sum(axis=(1, 2)),
+        'ampoules_alignees': conflits.sum(axis=(1, 2)),
+        'mur_chiffre': murs_faux.sum(axis=(1, 2)),
+    }
+    valides = (nombres['non_eclairee'] == 0) & (nombres['ampoules_alignees'] == 0) & (nombres['mur_chiffre'] == 0)
+    return valides, nombres
+
+def lister_erreurs_numpy(solution_grille):
+    """Même résultat que verification.lister_erreurs_solution, calculé de façon vectorisée"""
+    tableau = vers_tableau(solution_grille)
+    non_eclairees, conflits, murs_faux, voisines = analyser_lot(tableau)
+    tableau, voisines = tableau[0], voisines[0]
+
+    erreurs = [('non_eclairee', (int(i), int(j))) for i, j in np.argwhere(non_eclairees[0])]
+
+    # Les paires ne sont énumérées que pour les rares ampoules en conflit
+    H, L = tableau.shape
+    murs = tableau >= MUR
+    for i, j in np.argwhere(conflits[0]):
+        for di, dj in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
+            ni, nj = i + di, j + dj
+            while 0 <= ni < H and 0 <= nj < L and not murs[ni, nj]:
+                if tableau[ni, nj] == AMPOULE:
+                    erreurs.append(('ampoules_alignees', (int(i), int(j)), (int(ni), int(nj))))
+                ni += di
+                nj += dj
+
+    for i, j in np.argwhere(murs_faux[0]):
+        erreurs.append(('mur_chiffre', (int(i), int(j)), int(tableau[i, j] - MUR_CHIFFRE), int(voisines[i, j])))
+
+    return erreurs
+
+def verifier_solution_numpy(solution_grille):
+    """Vérifie une grille solution, retourne (valide, erreurs)"""
+    erreurs = lister_erreurs_numpy(solution_grille)
+    return not erreurs, erreurs
@@ -0,0 +1,86 @@
+from lightup.grille_compacte import AMPOULE, GrilleCompacte
+from lightup.index_grille import IndexGrille
+
+def lister_erreurs_solution(solution_grille):
+    """Retourne la liste des erreurs d'une grille solution.
+
+    Chaque erreur est un tuple dont le premier élément est la catégorie:
+    ('non_eclairee', (i, j)), ('ampoules_alignees', (i, j), (ni, nj))
+    ou ('mur_chiffre', (i, j), chiffre, ampoules_adjacentes).
+    """
+    index = IndexGrille(solution_grille)
+    H, L = index.H, index.L
+    compacte = isinstance(solution_grille, GrilleCompacte)
+    if compacte:
+        ampoules = solution_grille.ampoules()
+    else:
+        ampoules = [c for c in range(H * L) if solution_grille[c // L][c % L] == 'A']
+    est_ampoule = bytearray(H * L)
+    for c in ampoules:
+        est_ampoule[c] = 1
+    comptes = index.segments_allumes(ampoules)
+    
+    erreurs = []
+    
+    # Vérifier que toutes les cases blanches sont éclairées
+    # (une grille compacte ne stocke pas l'éclairage: il se déduit des ampoules)
+    for i in range(H):
+        for j in range(L):
+            if compacte:
+                c = i * L + j
+                if not index.mur[c] and not index.eclairee(c, comptes):
+                    erreurs.append(('non_eclairee', (i, j)))
+            elif solution_grille[i][j] == ' ':  # Case blanche non éclairée
+                erreurs.append(('non_eclairee', (i, j)))
+    
+    # Vérifier que les ampoules ne s'éclairent pas entre elles:
+    # seuls les segments contenant plusieurs ampoules sont parcourus
+    for c in ampoules:
+        if comptes[index.seg_ligne[c]] > 1 or comptes[index.seg_colonne[c]] > 1:
+            for direction in index.directions(c):
+                for c2 in direction:
+                    if est_ampoule[c2]:  # Une autre ampoule est visible
+                        erreurs.append(('ampoules_alignees', divmod(c, L), divmod(c2, L)))
+    
+    # Vérifier les contraintes de murs chiffrés
+    for k, c in enumerate(index.murs_chiffres):
+        chiffre = index.chiffre[c]
+        ampoules_adjacentes = sum(est_ampoule[c2] for c2 in index.voisins_mur(k))
+        if ampoules_adjacentes != chiffre:
+            erreurs.append(('mur_chiffre', divmod(c, L), chiffre, ampoules_adjacentes))
+    
+    return erreurs
+
+def decrire_erreur(erreur):
+    """Message lisible pour une erreur de lister_erreurs_solution"""
+    categorie = erreur[0]
+    if categorie == 'non_eclairee':
+        i, j = erreur[1]
+        return f"Case ({i},{j}) non éclairée"
+    if categorie == 'ampoules_alignees':
+        (i, j), (ni, nj) = erreur[1], erreur[2]
+        return f"Ampoules ({i},{j}) et ({ni},{nj}) s'éclairent mutuellement"
+    (i, j), chiffre, ampoules_adjacentes = erreur[1:]
+    return f"Mur ({i},{j}) avec chiffre {chiffre} a {ampoules_adjacentes} ampoules adjacentes"
+
+def grille_avec_ampoules(grille, ampoules):
+    """GrilleCompacte de la grille (texte ou compacte) avec des ampoules aux cases (i, j)"""
+    if isinstance(grille, GrilleCompacte):
+        solution = GrilleCompacte(grille.H, grille.L, bytearray(grille.cases))
+    else:
+        solution = GrilleCompacte.depuis_liste(grille)
+    for i, j in ampoules:
+        solution.cases[i * solution.L + j] = AMPOULE
+    return solution
+
+def lister_erreurs(grille, ampoules):
+    """Erreurs de la grille avec ces ampoules (format de lister_erreurs_solution)"""
+    return lister_erreurs_solution(grille_avec_ampoules(grille, ampoules))
+
+def est_solution(grille, ampoules):
+    return not lister_erreurs(grille, ampoules)
+
+def verifier_lot(grilles):
+    """Vérification vectorisée d'un lot de grilles solution (numpy requis, voir verificateur_numpy)"""
+    from lightup.verificateur_numpy import verifier_lot
+    return verifier_lot(grilles)
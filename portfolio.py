@@ -0,0 +1,188 @@
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+
+from lightup.solveurs import ResultatSolveur, analyser_stats_minisat, lire_modele
+
+# 'minisat': le modèle est écrit dans le fichier {sortie} ("SAT" puis les littéraux)
+# 'competition': le modèle est affiché sur la sortie standard (lignes "s ..." et "v ...")
+# 'encodage': la configuration résout sa propre variante de l'encodage de la
+# grille (voir lightup.encodages) au lieu du CNF donné; elle ne court que si
+# la grille est passée à resoudre_portfolio
+CONFIGURATIONS = [
+    {'nom': 'minisat', 'commande': ['minisat', '{cnf}', '{sortie}'], 'format': 'minisat'},
+    {'nom': 'minisat-graine-7', 'commande': ['minisat', '-rnd-seed=7', '-rnd-freq=0.02', '{cnf}', '{sortie}'], 'format': 'minisat'},
+    {'nom': 'minisat-sans-luby', 'commande': ['minisat', '-no-luby', '-rinc=1.5', '{cnf}', '{sortie}'], 'format': 'minisat'},
+    {'nom': 'glucose', 'commande': ['glucose', '{cnf}', '{sortie}'], 'format': 'minisat'},
+    {'nom': 'cadical', 'commande': ['cadical', '-q', '{cnf}'], 'format': 'competition'},
+    {'nom': 'kissat', 'commande': ['kissat', '-q', '{cnf}'], 'format': 'competition'},
+    {'nom': 'minisat-paires-segments', 'commande': ['minisat', '{cnf}', '{sortie}'], 'format': 'minisat',
+     'encodage': 'paires/segments'},
+    {'nom': 'minisat-sequentiel-direct', 'commande': ['minisat', '{cnf}', '{sortie}'], 'format': 'minisat',
+     'encodage': 'sequentiel/direct'},
+    {'nom': 'minisat-sequentiel-segments', 'commande': ['minisat', '{cnf}', '{sortie}'], 'format': 'minisat',
+     'encodage': 'sequentiel/segments'},
+]
+
+# Journal des courses (JSON lines), désactivé par défaut (voir journaliser)
+FICHIER_JOURNAL = "portfolio.jsonl"
+JOURNAL = None
+
+def journaliser(nom_fichier=FICHIER_JOURNAL):
+    """Ajoute chaque course de resoudre_portfolio au fichier JSON lines (None: plus de journal)"""
+    global JOURNAL
+    JOURNAL = nom_fichier
+
+def configurations_disponibles(configurations=None):
+    """Configurations dont l'exécutable est présent dans le PATH"""
+    return [conf for conf in configurations or CONFIGURATIONS if shutil.which(conf['commande'][0])]
+
+def lire_sortie_competition(sortie):
+    """Lit une sortie au format des compétitions SAT: (statut, modèle)"""
+    statut, modele = 'INCONNU', []
+    for ligne in sortie.splitlines():
+        if ligne.startswith('s '):
+            statut = {'SATISFIABLE': 'SAT', 'UNSATISFIABLE': 'UNSAT'}.get(ligne[2:].strip(), 'INCONNU')
+        elif ligne.startswith('v '):
+            modele.extend(int(x) for x in ligne[2:].split() if x != '0')
+    return statut, (modele if statut == 'SAT' else None)
+
+def _entete_cnf(nom_fichier):
+    with open(nom_fichier) as f:
+        for ligne in f:
+            if ligne.startswith('p cnf'):
+                _, _, nb_vars, nb_clauses = ligne.split()
+                return int(nb_vars), int(nb_clauses)
+    return 0, 0
+
+def _ecrire_variante(grille, encodage, dossier):
+    """Écrit la variante encodage de la grille dans le dossier: (fichier CNF, var_map)"""
+    from lightup.encodage import ecrire_cnf, encoder
+    var_map, clauses, nb_vars = encoder(grille, briser_symetries=False, encodage=encodage)
+    nom_cnf = os.path.join(dossier, f"{encodage.replace('/', '-')}.cnf")
+    ecrire_cnf(nom_cnf, clauses, nb_vars)
+    return nom_cnf, var_map
+
+def _ramener_modele(modele, var_map_variante, var_map):
+    """Modèle d'une variante exprimé sur les variables de var_map (cases seulement)"""
+    from lightup.encodage import ampoules_du_modele
+    ampoules = set(ampoules_du_modele(modele, var_map_variante))
+    return [v if case in ampoules else -v for case, v in sorted(var_map.items(), key=lambda x: x[1])]
+
+def resoudre_portfolio(nom_fichier="output.cnf", configurations=None, budget=None, journal=None, grille=None,
+                       var_map=None):
+    """Lance toutes les configurations en parallèle et garde la première réponse définitive.
+
+    Les autres processus sont tués dès qu'une configuration répond SAT ou
+    UNSAT. Retourne un ResultatSolveur dont l'attribut configuration donne le
+    nom du gagnant (None si aucune réponse dans le budget, en secondes).
+    Avec la grille et le var_map du CNF donné, les configurations à encodage
+    propre courent aussi (encodées pendant que les autres tournent); le
+    modèle d'un gagnant de ce type est ramené aux variables de var_map.
+    Si un journal est donné (ou activé par journaliser), chaque course y est
+    ajoutée en JSON lines pour ajuster les réglages par défaut à partir des
+    données réelles.
+    """
+    configurations = [conf for conf in configurations_disponibles(configurations)
+                      if grille is not None and var_map is not None or 'encodage' not in conf]
+    if not configurations:
+        raise FileNotFoundError("Aucun solveur du portfolio n'est installé (ou grille absente pour les encodages)")
+    # Les configurations sur le CNF donné partent d'abord, les variantes à encoder ensuite
+    configurations.sort(key=lambda conf: 'encodage' in conf)
+
+    dossier = tempfile.mkdtemp(prefix="portfolio_")
+    debut = time.perf_counter()
+    courses = []
+    try:
+        variantes = {}  # encodage -> (fichier CNF, var_map de la variante)
+        for k, conf in enumerate(configurations):
+            nom_cnf = nom_fichier
+            if 'encodage' in conf:
+                if conf['encodage'] not in variantes:
+                    variantes[conf['encodage']] = _ecrire_variante(grille, conf['encodage'], dossier)
+                nom_cnf = variantes[conf['encodage']][0]
+            sortie_modele = os.path.join(dossier, f"{k}.out")
+            sortie_standard = open(os.path.join(dossier, f"{k}.log"), 'w+')
+            commande = [arg.format(cnf=nom_cnf, sortie=sortie_modele) for arg in conf['commande']]
+            processus = subprocess.Popen(commande, stdout=sortie_standard, stderr=subprocess.DEVNULL)
+            courses.append((conf, processus, sortie_modele, sortie_standard))
+
+        gagnant = None
+        while gagnant is None:
+            en_cours = 0
+            for course in courses:
+                code = course[1].poll()
+                if code is None:
+                    en_cours += 1
+                elif code in (10, 20):
+                    gagnant = course
+                    break
+            if gagnant is None and (en_cours == 0 or (budget is not None and time.perf_counter() - debut > budget)):
+                break
+            if gagnant is None:
+                time.sleep(0.002)
+        temps = time.perf_counter() - debut
+
+        for _, processus, _, _ in courses:
+            if processus.poll() is None:
+                processus.kill()
+                processus.wait()
+
+        if gagnant is None:
+            resultat = ResultatSolveur('INCONNU', temps=temps)
+            resultat.configuration = None
+        else:
+            conf, processus, sortie_modele, sortie_standard = gagnant
+            sortie_standard.seek(0)
+            sortie = sortie_standard.read()
+            if conf['format'] == 'competition':
+                statut, modele = lire_sortie_competition(sortie)
+            elif processus.returncode == 20:
+                statut, modele = 'UNSAT', None
+            else:
+                statut, modele = lire_modele(sortie_modele)
+            if modele is not None and 'encodage' in conf:
+                modele = _ramener_modele(modele, variantes[conf['encodage']][1], var_map)
+            resultat = ResultatSolveur(statut, modele, analyser_stats_minisat(sortie), temps, sortie)
+            resultat.configuration = conf['nom']
+    finally:
+        for _, processus, _, sortie_standard in courses:
+            sortie_standard.close()
+        shutil.rmtree(dossier, ignore_errors=True)
+
+    journal = journal or JOURNAL
+    if journal:
+        nb_vars, nb_clauses = _entete_cnf(nom_fichier)
+        with open(journal, 'a') as f:
+            f.write(json.dumps({
+                'date': time.strftime("%Y-%m-%dT%H:%M:%S"),
+                'variables': nb_vars,
+                'clauses': nb_clauses,
+                'configurations': [conf['nom'] for conf in configurations],
+                'gagnant': resultat.configuration,
+                'statut': resultat.statut,
+                'temps': resultat.temps,
+            }) + "\n")
+
+    return resultat
+
+def statistiques_journal(journal=FICHIER_JOURNAL):
+    """Nombre de victoires et temps moyen par configuration d'après le journal"""
+    victoires = {}
+    with open(journal) as f:
+        for ligne in f:
+            course = json.loads(ligne)
+            if course['gagnant'] is None:
+                continue
+            nombre, total = victoires.get(course['gagnant'], (0, 0.0))
+            victoires[course['gagnant']] = (nombre + 1, total + course['temps'])
+    return {nom: {'victoires': nombre, 'temps_moyen': total / nombre} for nom, (nombre, total) in victoires.items()}
+
+if __name__ == "__main__":
+    import sys
+    nom_journal = sys.argv[1] if len(sys.argv) > 1 else FICHIER_JOURNAL
+    for nom, stats in sorted(statistiques_journal(nom_journal).items(), key=lambda x: -x[1]['victoires']):
+        print(f"{nom:>20}: {stats['victoires']:6d} victoire(s), {stats['temps_moyen'] * 1000:8.1f} ms en moyenne")
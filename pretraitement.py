@@ -0,0 +1,130 @@
+class TableRenumerotation:
+    """Correspondance entre les variables d'origine et celles du CNF prétraité.
+
+    origine[k] est la variable d'origine de la nouvelle variable k (indice 0
+    inutilisé); fixees donne la valeur des variables éliminées par
+    propagation. Les variables qui n'apparaissent plus dans aucune clause
+    sont libres et prennent la valeur faux.
+    """
+
+    def __init__(self, nb_vars, origine, fixees):
+        self.nb_vars = nb_vars
+        self.origine = origine
+        self.fixees = fixees
+
+    def reconstruire(self, modele):
+        """Modèle du CNF prétraité -> modèle complet sur les variables d'origine"""
+        valeurs = dict(self.fixees)
+        for l in modele:
+            if 0 < abs(l) < len(self.origine):
+                valeurs[self.origine[abs(l)]] = l > 0
+        return [v if valeurs.get(v, False) else -v for v in range(1, self.nb_vars + 1)]
+
+def pretraiter(clauses, nb_vars):
+    """Simplifie un CNF: (clauses renumérotées, TableRenumerotation, statistiques).
+
+    Dans l'ordre: doublons et tautologies, propagation des clauses unitaires
+    (clauses satisfaites retirées, littéraux faux supprimés), clauses
+    subsumées par une clause plus courte, puis renumérotation compacte des
+    variables restantes. Une contradiction donne la seule clause vide [[]].
+    """
+    stats = {'clauses_avant': len(clauses), 'litteraux_avant': sum(len(c) for c in clauses),
+             'variables_avant': nb_vars}
+
+    # Doublons (ordre des littéraux indifférent) et tautologies
+    uniques = list(dict.fromkeys(map(tuple, map(sorted, clauses))))
+    stats['doublons'] = len(clauses) - len(uniques)
+    tautologies = 0
+    for k, clause in enumerate(uniques):
+        if len(clause) > 1 and len(set(map(abs, clause))) < len(clause):
+            ensemble = set(clause)
+            if any(-l in ensemble for l in ensemble):
+                tautologies += 1
+                uniques[k] = None
+            else:
+                uniques[k] = tuple(sorted(ensemble))  # littéral répété
+    if tautologies:
+        uniques = [clause for clause in uniques if clause is not None]
+    stats['tautologies'] = tautologies
+
+    # Propagation unitaire avec listes d'occurrences
+    occurrences = {}
+    for k, clause in enumerate(uniques):
+        for l in clause:
+            occurrences.setdefault(l, []).append(k)
+    valeur = {}  # variable -> bool
+    libres = [len(clause) for clause in uniques]
+    satisfaite = bytearray(len(uniques))
+    a_traiter = [clause[0] for clause in uniques if len(clause) == 1]
+    conflit = any(not clause for clause in uniques)
+    while a_traiter and not conflit:
+        l = a_traiter.pop()
+        if abs(l) in valeur:
+            conflit = valeur[abs(l)] != (l > 0)
+            continue
+        valeur[abs(l)] = l > 0
+        for k in occurrences.get(l, ()):
+            satisfaite[k] = 1
+        for k in occurrences.get(-l, ()):
+            if satisfaite[k]:
+                continue
+            libres[k] -= 1
+            if libres[k] == 0:
+                conflit = True
+                break
+            if libres[k] == 1:
+                a_traiter.extend(l2 for l2 in uniques[k] if abs(l2) not in valeur)
+    stats['variables_fixees'] = len(valeur)
+    if conflit:
+        stats.update({'satisfaites': 0, 'subsumees': 0, 'clauses_apres': 1, 'litteraux_apres': 0,
+                      'variables_apres': 0})
+        return [[]], TableRenumerotation(nb_vars, [0], valeur), stats
+
+    reduites = []
+    for k, clause in enumerate(uniques):
+        if satisfaite[k]:
+            continue
+        if libres[k] < len(clause):  # Contient un littéral faux
+            clause = tuple(l for l in clause if abs(l) not in valeur)
+        reduites.append(clause)
+    stats['satisfaites'] = len(uniques) - len(reduites)
+    del uniques, occurrences
+
+    # Subsomption: une clause retirée si une clause plus courte en est un sous-ensemble.
+    # Il ne reste plus de clause unitaire: seules les clauses d'au moins trois
+    # littéraux peuvent être subsumées (les clauses réduites identiques sont
+    # dédoublonnées au passage).
+    nb_reduites = len(reduites)
+    reduites = list(dict.fromkeys(reduites))
+    stats['doublons'] += nb_reduites - len(reduites)
+    occurrences = {}
+    for k, clause in enumerate(reduites):
+        if len(clause) >= 3:
+            for l in clause:
+                occurrences.setdefault(l, []).append(k)
+    subsumee = bytearray(len(reduites))
+    for k, clause in enumerate(reduites):
+        if subsumee[k]:
+            continue
+        listes = [occurrences.get(l) for l in clause]
+        if None in listes:
+            continue
+        candidates = min(listes, key=len)
+        ensemble = set(clause)
+        for k2 in candidates:
+            if len(reduites[k2]) > len(clause) and not subsumee[k2] and ensemble.issubset(reduites[k2]):
+                subsumee[k2] = 1
+    stats['subsumees'] = sum(subsumee)
+
+    # Renumérotation compacte des variables restantes, dans l'ordre d'origine
+    gardees = [clause for k, clause in enumerate(reduites) if not subsumee[k]]
+    origine = [0] + sorted({abs(l) for l in set().union(*gardees)})
+    correspondance = {}
+    for n, v in enumerate(origine[1:], 1):
+        correspondance[v] = n
+        correspondance[-v] = -n
+    resultat = [list(map(correspondance.__getitem__, clause)) for clause in gardees]
+    stats['clauses_apres'] = len(resultat)
+    stats['litteraux_apres'] = sum(len(c) for c in resultat)
+    stats['variables_apres'] = len(origine) - 1
+    return resultat, TableRenumerotation(nb_vars, origine, valeur), stats
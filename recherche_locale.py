@@ -0,0 +1,322 @@
+import random
+import time
+from array import array
+from collections import deque
+
+from lightup.index_grille import IndexGrille
+
+# Limites par défaut: bascules sans budget en temps, secondes pour dimacs.py --locale
+MAX_BASCULES = 10_000_000
+BUDGET_DEFAUT = 60.0
+
+class _Ensemble:
+    """Ensemble d'entiers 0 .. taille - 1 avec ajout, retrait et tirage aléatoire en O(1)"""
+
+    def __init__(self, taille):
+        self.elements = []
+        self.position = array('i', [-1]) * taille
+
+    def __len__(self):
+        return len(self.elements)
+
+    def ajouter(self, x):
+        if self.position[x] < 0:
+            self.position[x] = len(self.elements)
+            self.elements.append(x)
+
+    def retirer(self, x):
+        k = self.position[x]
+        if k >= 0:
+            self.position[x] = -1
+            dernier = self.elements.pop()
+            if k < len(self.elements):
+                self.elements[k] = dernier
+                self.position[dernier] = k
+
+    def tirer(self, rng):
+        return self.elements[rng.randrange(len(self.elements))]
+
+class RechercheLocale:
+    """Recherche locale de type WalkSAT directement sur la grille.
+
+    L'état est l'ensemble des ampoules. Le coût est la somme des cases non
+    éclairées, des ampoules en trop dans chaque segment et des écarts
+    |ampoules adjacentes - N| des murs chiffrés. Les défauts (cases non
+    éclairées, segments en conflit, murs faux) sont tenus à jour à chaque
+    bascule en ne parcourant que les deux segments et les murs voisins de la
+    case basculée.
+    """
+
+    def __init__(self, grille, bruit=0.5, rng=None):
+        self.index = index = IndexGrille(grille)
+        self.bruit = bruit
+        self.rng = rng or random.Random()
+        n = index.H * index.L
+
+        self.ampoule = bytearray(n)
+        self.comptes = index.segments_allumes([])
+        self.interdite = bytearray(n)
+        self.murs_de = {}  # case -> rangs k des murs chiffrés adjacents
+        self.adjacentes = [0] * len(index.murs_chiffres)
+        self.chiffres = [index.chiffre[c] for c in index.murs_chiffres]  # rang k -> N
+        for k, c in enumerate(index.murs_chiffres):
+            for c2 in index.voisins_mur(k):
+                self.murs_de.setdefault(c2, []).append(k)
+                if index.chiffre[c] == 0:
+                    self.interdite[c2] = 1
+
+        # Défauts et coût: construits par initialiser (evaluer), puis tenus à jour par basculer
+        self.non_eclairees = self.conflits = self.murs_faux = None
+        self.cout = None
+        self.nb_bascules = 0
+        self.forcee = bytearray(n)
+
+    def _deduire(self):
+        """Règles sûres des murs chiffrés, jusqu'au point fixe.
+
+        Un mur dont les voisins encore possibles sont exactement en nombre N
+        force ces ampoules; un mur qui a déjà ses N ampoules forcées interdit
+        ses autres voisins; une ampoule forcée interdit les cases qu'elle voit.
+        Les cases forcées ou interdites ne sont plus jamais basculées.
+        """
+        index = self.index
+        a_revoir = deque(range(len(index.murs_chiffres)))
+        en_attente = bytearray([1]) * len(index.murs_chiffres)
+
+        def marquer(tableau, m):
+            tableau[m] = 1
+            for k2 in self.murs_de.get(m, ()):
+                if not en_attente[k2]:
+                    en_attente[k2] = 1
+                    a_revoir.append(k2)
+
+        while a_revoir:
+            k = a_revoir.popleft()
+            en_attente[k] = 0
+            chiffre = index.chiffre[index.murs_chiffres[k]]
+            possibles = [m for m in index.voisins_mur(k) if not self.interdite[m]]
+            nb_forcees = sum(1 for m in possibles if self.forcee[m])
+            if nb_forcees == chiffre:
+                for m in possibles:
+                    if not self.forcee[m]:
+                        marquer(self.interdite, m)
+            elif len(possibles) == chiffre:
+                for m in possibles:
+                    if not self.forcee[m]:
+                        marquer(self.forcee, m)
+                        for v in index.visibles(m):
+                            if not self.interdite[v]:
+                                marquer(self.interdite, v)
+
+    def initialiser(self):
+        """Ampoules forcées, puis placement glouton sur les murs chiffrés et enfin sur chaque case encore dans l'ombre.
+
+        Les ampoules sont posées sans tenir les défauts à jour: ceux-ci et le
+        coût sont calculés en une passe à la fin (évaluer).
+        """
+        index, comptes, adjacentes = self.index, self.comptes, self.adjacentes
+        seg_ligne, seg_colonne = index.seg_ligne, index.seg_colonne
+        self._deduire()
+
+        def poser(c):
+            self.ampoule[c] = 1
+            comptes[seg_ligne[c]] += 1
+            comptes[seg_colonne[c]] += 1
+            for k in self.murs_de.get(c, ()):
+                adjacentes[k] += 1
+            self.nb_bascules += 1
+
+        def permise(c):
+            return (not self.interdite[c] and not self.ampoule[c]
+                    and not comptes[seg_ligne[c]] and not comptes[seg_colonne[c]]
+                    and all(adjacentes[k] < self.chiffres[k] for k in self.murs_de.get(c, ())))
+
+        for c in range(index.H * index.L):
+            if self.forcee[c] and not self.ampoule[c]:
+                poser(c)
+
+        murs = list(range(len(index.murs_chiffres)))
+        self.rng.shuffle(murs)
+        for k in murs:
+            for m in index.voisins_mur(k):
+                if adjacentes[k] < self.chiffres[k] and permise(m):
+                    poser(m)
+
+        cases = [c for c in range(index.H * index.L) if not index.mur[c]]
+        self.rng.shuffle(cases)
+        for c in cases:
+            if permise(c):
+                poser(c)
+        # Cases interdites ou forcées: jamais basculées par la recherche
+        self.bloquee = bytes(i | f for i, f in zip(self.interdite, self.forcee))
+        self.evaluer()
+
+    def evaluer(self):
+        """Reconstruit les défauts et le coût de l'état courant en une passe"""
+        index, comptes = self.index, self.comptes
+        self.non_eclairees = _Ensemble(index.H * index.L)
+        self.conflits = _Ensemble(index.nb_segments)
+        self.murs_faux = _Ensemble(len(self.chiffres))
+        seg_ligne, seg_colonne = index.seg_ligne, index.seg_colonne
+        for c in range(index.H * index.L):
+            if not index.mur[c] and not comptes[seg_ligne[c]] and not comptes[seg_colonne[c]]:
+                self.non_eclairees.ajouter(c)
+        cout = len(self.non_eclairees)
+        for s, nb in enumerate(comptes):
+            if nb > 1:
+                self.conflits.ajouter(s)
+                cout += nb - 1
+        for k, chiffre in enumerate(self.chiffres):
+            if self.adjacentes[k] != chiffre:
+                self.murs_faux.ajouter(k)
+                cout += abs(self.adjacentes[k] - chiffre)
+        self.cout = cout
+
+    def delta(self, c):
+        """Variation du coût si l'on bascule la case c"""
+        index, comptes, membres, debut = self.index, self.comptes, self.index.membres, self.index.debut_segment
+        sl, sc = index.seg_ligne[c], index.seg_colonne[c]
+        nl, nc = comptes[sl], comptes[sc]
+        signe = -1 if self.ampoule[c] else 1
+        d = 0
+
+        # Cases qui changent d'éclairage: seulement si un segment passe de 0 à 1 ampoule (ou l'inverse)
+        seuil = 0 if signe > 0 else 1
+        if nl == seuil:
+            seg_colonne = index.seg_colonne
+            for m in membres[debut[sl]:debut[sl + 1]]:
+                if not comptes[seg_colonne[m]]:
+                    d -= signe
+        if nc == seuil:
+            seg_ligne = index.seg_ligne
+            for m in membres[debut[sc]:debut[sc + 1]]:
+                if not comptes[seg_ligne[m]]:
+                    d -= signe
+        if nl == seuil and nc == seuil:
+            d += 1  # c elle-même: comptée deux fois ci-dessus si l'on ajoute, jamais si l'on retire
+
+        # Ampoules en trop dans les deux segments
+        minimum = 1 if signe > 0 else 2
+        if nl >= minimum:
+            d += signe
+        if nc >= minimum:
+            d += signe
+
+        for k in self.murs_de.get(c, ()):
+            chiffre = self.chiffres[k]
+            adjacentes = self.adjacentes[k]
+            d += abs(adjacentes + signe - chiffre) - abs(adjacentes - chiffre)
+        return d
+
+    def basculer(self, c):
+        """Ajoute ou retire l'ampoule de la case c et met à jour les défauts et le coût.
+
+        Seules les cases dont l'éclairage change sont touchées: celles d'un
+        segment qui passe de 0 à 1 ampoule (ou l'inverse) et dont l'autre
+        segment est vide.
+        """
+        index, comptes, membres, debut = self.index, self.comptes, self.index.membres, self.index.debut_segment
+        self.nb_bascules += 1
+        signe = -1 if self.ampoule[c] else 1
+        self.ampoule[c] ^= 1
+        cout = self.cout
+
+        for s, autres in ((index.seg_ligne[c], index.seg_colonne), (index.seg_colonne[c], index.seg_ligne)):
+            avant = comptes[s]
+            apres = comptes[s] = avant + signe
+            if apres == 2 and avant == 1:
+                self.conflits.ajouter(s)
+            elif apres == 1 and avant == 2:
+                self.conflits.retirer(s)
+            if avant > 1 or apres > 1:
+                cout += signe  # Une ampoule en trop de plus (ou de moins) dans le segment
+            if avant == 0 or apres == 0:
+                # Cases du segment sans ampoule dans leur autre segment
+                changees = [m for m in membres[debut[s]:debut[s + 1]] if not comptes[autres[m]]]
+                maj = self.non_eclairees.retirer if apres else self.non_eclairees.ajouter
+                for m in changees:
+                    maj(m)
+                cout -= signe * len(changees)
+
+        for k in self.murs_de.get(c, ()):
+            chiffre = self.chiffres[k]
+            avant = self.adjacentes[k]
+            apres = self.adjacentes[k] = avant + signe
+            cout += abs(apres - chiffre) - abs(avant - chiffre)
+            if apres == chiffre:
+                self.murs_faux.retirer(k)
+            else:
+                self.murs_faux.ajouter(k)
+        self.cout = cout
+
+    def candidates(self):
+        """Cases à basculer pour corriger un défaut tiré au hasard"""
+        index, rng, bloquee = self.index, self.rng, self.bloquee
+        membres, debut = index.membres, index.debut_segment
+        nb_sombres, nb_conflits = len(self.non_eclairees), len(self.conflits)
+        r = rng.randrange(nb_sombres + nb_conflits + len(self.murs_faux))
+        if r < nb_sombres:
+            c = self.non_eclairees.tirer(rng)
+            sl, sc = index.seg_ligne[c], index.seg_colonne[c]
+            return ([m for m in membres[debut[sl]:debut[sl + 1]] if not bloquee[m]]
+                    + [m for m in membres[debut[sc]:debut[sc + 1]] if not bloquee[m]])
+        if r < nb_sombres + nb_conflits:
+            s = self.conflits.tirer(rng)
+            ampoule = self.ampoule
+            return [m for m in membres[debut[s]:debut[s + 1]] if ampoule[m] and not bloquee[m]]
+        k = self.murs_faux.tirer(rng)
+        trop_peu = self.adjacentes[k] < self.chiffres[k]
+        return [m for m in index.voisins_mur(k) if (not self.ampoule[m]) == trop_peu and not bloquee[m]]
+
+    def resoudre(self, max_bascules=None, budget=None):
+        """Bascule des cases jusqu'à un coût nul: liste des ampoules (i, j) ou None si le budget est épuisé.
+
+        Chaque tour de boucle bascule une case: si le défaut tiré n'offre
+        aucune case basculable, une case libre est basculée au hasard. Le
+        temps écoulé est vérifié tous les 256 tours.
+        """
+        debut = time.perf_counter()
+        self.initialiser()
+        libres = [c for c in range(len(self.ampoule)) if not self.index.mur[c] and not self.bloquee[c]]
+        tours = 0
+        while self.cout > 0:
+            if max_bascules is not None and self.nb_bascules >= max_bascules:
+                return None
+            tours += 1
+            if budget is not None and tours % 256 == 0 and time.perf_counter() - debut > budget:
+                return None
+            candidates = self.candidates()
+            if not candidates:
+                if not libres:
+                    return None  # Aucune case ne peut changer: le défaut restera
+                c = self.rng.choice(libres)
+            elif self.rng.random() < self.bruit:
+                c = self.rng.choice(candidates)
+            else:
+                deltas = [self.delta(m) for m in candidates]
+                meilleur = min(deltas)
+                c = self.rng.choice([m for m, d in zip(candidates, deltas) if d == meilleur])
+            self.basculer(c)
+        return [self.index.position(c) for c in range(len(self.ampoule)) if self.ampoule[c]]
+
+def grille_solution(grille, ampoules):
+    """Grille solution au format de interpreter_solution ('A', '*', ' ')"""
+    index = IndexGrille(grille)
+    cases = [index.case(i, j) for i, j in ampoules]
+    comptes = index.segments_allumes(cases)
+    solution = [[cellule if index.mur[i * index.L + j] else (' ' if not index.eclairee(i * index.L + j, comptes) else '*')
+                 for j, cellule in enumerate(ligne)] for i, ligne in enumerate(grille)]
+    for i, j in ampoules:
+        solution[i][j] = 'A'
+    return solution
+
+def resoudre_recherche_locale(grille, budget=None, max_bascules=None, bruit=0.5, graine=None):
+    """Résout une grille supposée solvable par recherche locale: (ampoules, nb_bascules).
+
+    Sans budget ni max_bascules, la recherche s'arrête après MAX_BASCULES
+    bascules: sur une grille impossible, elle ne finirait jamais.
+    """
+    if budget is None and max_bascules is None:
+        max_bascules = MAX_BASCULES
+    recherche = RechercheLocale(grille, bruit, random.Random(graine))
+    return recherche.resoudre(max_bascules, budget), recherche.nb_bascules
@@ -0,0 +1,159 @@
+import asyncio
+import os
+import shutil
+import tempfile
+import time
+import weakref
+
+from lightup.encodage import ampoules_du_modele, ecrire_cnf, encoder
+from lightup.solveurs import ResultatSolveur, analyser_stats_minisat, creer_pysat, lire_modele, stats_pysat
+
+class SolveurAsync:
+    """Résolution de grilles depuis une boucle asyncio, au plus `concurrence` à la fois.
+
+    Moteur 'minisat': MiniSAT lancé avec asyncio.create_subprocess_exec,
+    l'annulation tue le processus. Moteur 'pysat': résolution dans un thread,
+    l'annulation interrompt le solveur. Par défaut MiniSAT s'il est installé,
+    sinon pysat. L'encodage (CPU) est fait dans un thread pour ne pas bloquer
+    la boucle. Un SolveurAsync appartient à la boucle qui l'utilise.
+    """
+
+    def __init__(self, concurrence=None, moteur=None):
+        self.concurrence = concurrence or os.cpu_count() or 1
+        self.moteur = moteur or ('minisat' if shutil.which('minisat') else 'pysat')
+        self._semaphore = asyncio.Semaphore(self.concurrence)
+
+    async def resoudre(self, grille, timeout=None):
+        """ResultatSolveur de la grille (INCONNU si l'appel dépasse timeout secondes).
+
+        Le délai couvre tout l'appel, encodage compris. Un encodage interrompu
+        par le délai ou l'annulation finit dans son thread, mais sa place de
+        concurrence est rendue tout de suite. L'attribut ampoules donne les
+        cases (i, j) des ampoules si SAT, None sinon.
+        """
+        async with self._semaphore:
+            debut = time.perf_counter()
+            try:
+                var_map, resultat = await asyncio.wait_for(self._encoder_resoudre(grille), timeout)
+            except asyncio.TimeoutError:
+                var_map, resultat = None, ResultatSolveur('INCONNU')
+        resultat.temps = time.perf_counter() - debut
+        resultat.ampoules = None
+        if resultat.statut == 'SAT':
+            resultat.ampoules = ampoules_du_modele(resultat.modele, var_map)
+        return resultat
+
+    async def _encoder_resoudre(self, grille):
+        boucle = asyncio.get_running_loop()
+        var_map, clauses, nb_vars = await boucle.run_in_executor(None, encoder, grille)
+        if var_map is None:
+            return None, ResultatSolveur('UNSAT')
+        if self.moteur == 'minisat':
+            return var_map, await self._minisat(clauses, nb_vars)
+        return var_map, await self._pysat(clauses)
+
+    async def _minisat(self, clauses, nb_vars):
+        boucle = asyncio.get_running_loop()
+        dossier = tempfile.mkdtemp(prefix="lightup_")
+        nom_cnf = os.path.join(dossier, "grille.cnf")
+        nom_solution = os.path.join(dossier, "solution.txt")
+        try:
+            await boucle.run_in_executor(None, ecrire_cnf, nom_cnf, clauses, nb_vars)
+            processus = await asyncio.create_subprocess_exec(
+                "minisat", nom_cnf, nom_solution, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
+            try:
+                sortie, erreurs = await processus.communicate()
+            except asyncio.CancelledError:
+                if processus.returncode is None:
+                    processus.kill()
+                await processus.wait()
+                raise
+            sortie, erreurs = sortie.decode(), erreurs.decode()
+            if processus.returncode == 20:
+                statut, modele = 'UNSAT', None
+            else:
+                try:
+                    statut, modele = lire_modele(nom_solution)
+                except FileNotFoundError:
+                    statut, modele = 'INCONNU', None
+            return ResultatSolveur(statut, modele, analyser_stats_minisat(sortie), sortie=sortie, erreurs=erreurs)
+        finally:
+            shutil.rmtree(dossier, ignore_errors=True)
+
+    async def _pysat(self, clauses):
+        boucle = asyncio.get_running_loop()
+        solveur = await boucle.run_in_executor(None, creer_pysat, clauses)
+        try:
+            calcul = boucle.run_in_executor(None, solveur.solve_limited, [], True)
+            try:
+                reponse = await asyncio.shield(calcul)
+            except asyncio.CancelledError:
+                solveur.interrupt()
+                await calcul
+                raise
+            statut = {True: 'SAT', False: 'UNSAT'}.get(reponse, 'INCONNU')
+            return ResultatSolveur(statut, solveur.get_model() if reponse else None, stats_pysat(solveur))
+        finally:
+            solveur.delete()
+
+    async def resoudre_flux(self, grilles, timeout=None):
+        """Résout un flux de grilles (itérable ou itérable asynchrone).
+
+        Produit (numéro de la grille dans le flux, ResultatSolveur) dans l'ordre
+        où les résolutions se terminent. Au plus 2 * concurrence grilles sont
+        lues d'avance; fermer le générateur annule les résolutions en cours.
+        """
+        source = _iterer(grilles)
+        en_cours = set()
+        epuise = False
+        numero = 0
+        try:
+            while True:
+                while not epuise and len(en_cours) < 2 * self.concurrence:
+                    try:
+                        grille = await source.__anext__()
+                    except StopAsyncIteration:
+                        epuise = True
+                        break
+                    en_cours.add(asyncio.ensure_future(self._numeroter(numero, grille, timeout)))
+                    numero += 1
+                if not en_cours:
+                    return
+                finies, en_cours = await asyncio.wait(en_cours, return_when=asyncio.FIRST_COMPLETED)
+                for tache in finies:
+                    yield tache.result()
+        finally:
+            for tache in en_cours:
+                tache.cancel()
+            if en_cours:
+                await asyncio.gather(*en_cours, return_exceptions=True)
+
+    async def _numeroter(self, numero, grille, timeout):
+        return numero, await self.resoudre(grille, timeout)
+
+async def _iterer(grilles):
+    if hasattr(grilles, '__aiter__'):
+        async for grille in grilles:
+            yield grille
+    else:
+        for grille in grilles:
+            yield grille
+
+# Un solveur par défaut par boucle (le sémaphore est lié à sa boucle)
+_par_boucle = weakref.WeakKeyDictionary()
+
+def solveur_par_defaut():
+    """SolveurAsync partagé de la boucle courante (concurrence: nombre de cœurs)"""
+    boucle = asyncio.get_running_loop()
+    if boucle not in _par_boucle:
+        _par_boucle[boucle] = SolveurAsync()
+    return _par_boucle[boucle]
+
+async def resoudre_async(grille, timeout=None):
+    """Résout une grille avec le solveur partagé de la boucle courante"""
+    return await solveur_par_defaut().resoudre(grille, timeout)
+
+async def resoudre_flux(grilles, timeout=None):
+    """Résout un flux de grilles avec le solveur partagé: produit (numéro, ResultatSolveur)"""
+    async for numero, resultat in solveur_par_defaut().resoudre_flux(grilles, timeout):
+        yield numero, resultat
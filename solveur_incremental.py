@@ -0,0 +1,172 @@
+import os
+import subprocess
+import tempfile
+
+from lightup.encodages import generer_clauses
+
+def grille_puzzle(grille):
+    """Retire les ampoules et l'éclairage d'une grille de jeu pour retrouver le puzzle d'origine"""
+    return [['.' if cellule in ('A', '*') else cellule for cellule in ligne] for ligne in grille]
+
+def resoudre_minisat(clauses, nb_vars):
+    """Résout une liste de clauses avec MiniSAT en ligne de commande, retourne (satisfiable, modèle)"""
+    fd, nom_cnf = tempfile.mkstemp(suffix='.cnf')
+    os.close(fd)
+    fd, nom_out = tempfile.mkstemp(suffix='.out')
+    os.close(fd)
+    try:
+        with open(nom_cnf, 'w') as f:
+            f.write(f"p cnf {nb_vars} {len(clauses)}\n")
+            for clause in clauses:
+                f.write(" ".join(map(str, clause)) + " 0\n")
+
+        subprocess.run(["minisat", nom_cnf, nom_out],
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False)
+
+        with open(nom_out, 'r') as f:
+            lignes = f.readlines()
+        if lignes and lignes[0].strip() == "SAT":
+            valeurs = lignes[1].split() if len(lignes) > 1 else []
+            return True, [int(x) for x in valeurs if x != "0"]
+        return False, None
+    finally:
+        for nom in (nom_cnf, nom_out):
+            try:
+                os.remove(nom)
+            except OSError:
+                pass
+
+class SolveurIncremental:
+    """Solveur SAT gardé en mémoire entre deux appels, résolution sous hypothèses.
+
+    Utilise pysat s'il est installé (solveur chaud, noyau d'hypothèses exact),
+    sinon retombe sur MiniSAT en ligne de commande en ajoutant les hypothèses
+    comme clauses unitaires (le noyau renvoyé est alors l'ensemble des hypothèses).
+    """
+
+    def __init__(self, clauses=None, nom_solveur='minisat22'):
+        self.nb_vars = 0
+        self._clauses = []
+        self._modele = None
+        self._noyau = None
+        try:
+            from pysat.solvers import Solver
+            self._solveur = Solver(name=nom_solveur)
+        except ImportError:
+            self._solveur = None
+        if clauses:
+            self.ajouter_clauses(clauses)
+
+    @property
+    def incremental(self):
+        """Vrai si un solveur incrémental en mémoire est disponible"""
+        return self._solveur is not None
+
+    def nouvelle_variable(self):
+        """Réserve une nouvelle variable (ex: littéral d'activation)"""
+        self.nb_vars += 1
+        return self.nb_vars
+
+    def ajouter_clause(self, clause):
+        """Ajoute une clause définitivement"""
+        self.nb_vars = max(self.nb_vars, max((abs(l) for l in clause), default=0))
+        if self._solveur is not None:
+            self._solveur.add_clause(clause)
+        else:
+            self._clauses.append(list(clause))
+
+    def ajouter_clauses(self, clauses):
+        """Ajoute plusieurs clauses"""
+        for clause in clauses:
+            self.ajouter_clause(clause)
+
+    def resoudre(self, hypotheses=()):
+        """Résout sous hypothèses: True (SAT), False (UNSAT) ou None (aucun solveur)"""
+        hypotheses = list(hypotheses)
+        self._modele = None
+        self._noyau = None
+
+        if self._solveur is not None:
+            if self._solveur.solve(assumptions=hypotheses):
+                self._modele = self._solveur.get_model()
+                return True
+            self._noyau = self._solveur.get_core() or []
+            return False
+
+        try:
+            satisfiable, modele = resoudre_minisat(self._clauses + [[h] for h in hypotheses], self.nb_vars)
+        except FileNotFoundError:
+            return None
+        if satisfiable:
+            self._modele = modele
+            return True
+        self._noyau = hypotheses
+        return False
+
+    def modele(self):
+        """Modèle du dernier appel satisfiable"""
+        return self._modele
+
+    def noyau(self):
+        """Sous-ensemble d'hypothèses en échec lors du dernier appel insatisfiable"""
+        return self._noyau
+
+    def fermer(self):
+        """Libère le solveur"""
+        if self._solveur is not None:
+            self._solveur.delete()
+            self._solveur = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.fermer()
+
+class VerificateurCompletude:
+    """Encode le puzzle une seule fois et teste si un placement partiel peut encore être complété"""
+
+    def __init__(self, grille):
+        self.grille = grille_puzzle(grille)
+        self.var_map, clauses = generer_clauses(self.grille)
+        self.solveur = None
+        if self.var_map is not None:
+            self.solveur = SolveurIncremental(clauses)
+            self.solveur.nb_vars = max(self.solveur.nb_vars, len(self.var_map))
+
+    def verifier(self, ampoules, sans_ampoule=()):
+        """Vérifie si les ampoules placées (et les cases marquées sans ampoule) mènent à une solution.
+
+        Retourne (completable, echecs) où echecs est la liste des hypothèses
+        en conflit sous la forme ('ampoule' | 'vide', (i, j)), ou (None, [])
+        si aucun solveur n'est disponible.
+        """
+        if self.solveur is None:
+            return False, []
+
+        hypotheses = []
+        origine = {}
+        for genre, cases, signe in (('ampoule', ampoules, 1), ('vide', sans_ampoule, -1)):
+            for pos in cases:
+                if pos not in self.var_map:
+                    if genre == 'ampoule':
+                        return False, [(genre, pos)]
+                    continue
+                litteral = signe * self.var_map[pos]
+                hypotheses.append(litteral)
+                origine[litteral] = (genre, pos)
+
+        resultat = self.solveur.resoudre(hypotheses)
+        if resultat is None:
+            return None, []
+        if resultat:
+            return True, []
+        return False, [origine[l] for l in self.solveur.noyau() if l in origine]
+
+    def solution(self):
+        """Ampoules de la dernière complétion trouvée"""
+        modele = self.solveur.modele() if self.solveur else None
+        if not modele:
+            return []
+        coord_map = {v: k for k, v in self.var_map.items()}
+        return [coord_map[v] for v in modele if v > 0 and v in coord_map]
@@ -0,0 +1,63 @@
+import random
+
+import pytest
+
+from archive_grilles import EcrivainArchive, LecteurArchive
+from genere_grille import planter_grille, remplir_archive
+from lightup import est_solution
+from lightup.grille_compacte import GrilleCompacte
+
+GRILLE = [['.', '#2', '.'],
+          ['.', '#', '.'],
+          ['.', '#0', '.']]
+
+def test_aller_retour(tmp_path):
+    nom = str(tmp_path / "grilles.lupk")
+    with EcrivainArchive(nom) as archive:
+        assert archive.ajouter(GRILLE, [0, 2]) == 0
+        assert archive.ajouter([['.', '#']]) == 1
+    with LecteurArchive(nom) as archive:
+        assert len(archive) == 2
+        assert archive.grille(0) == GrilleCompacte.depuis_liste(GRILLE)
+        assert archive.ampoules(0) == [0, 2]
+        assert archive.solution(0).vers_liste() == [['A', '#2', 'A'], ['.', '#', '.'], ['.', '#0', '.']]
+        assert archive.grille(1).vers_liste() == [['.', '#']]
+        assert archive.ampoules(1) is None and archive.solution(1) is None
+        with pytest.raises(IndexError):
+            archive.grille(2)
+
+def test_reouverture_et_solutions_plantees(tmp_path):
+    nom = str(tmp_path / "grilles.lupk")
+    rng = random.Random(0)
+    assert remplir_archive(nom, 3, 12, 9, rng=rng) == range(0, 3)
+    assert remplir_archive(nom, 2, 5, 20, rng=rng) == range(3, 5)
+    with LecteurArchive(nom) as archive:
+        assert len(archive) == 5
+        for n in range(5):
+            grille = archive.grille(n)
+            ampoules = [divmod(c, grille.L) for c in archive.ampoules(n)]
+            assert est_solution(grille, ampoules)
+        assert (archive.grille(4).H, archive.grille(4).L) == (5, 20)
+
+def test_ecriture_interrompue(tmp_path):
+    nom = str(tmp_path / "grilles.lupk")
+    with EcrivainArchive(nom) as archive:
+        archive.ajouter(GRILLE, [0, 2])
+    # Enregistrements ajoutés sans fermer: pas d'index, l'archive se relit telle qu'avant
+    archive = EcrivainArchive(nom)
+    grille, ampoules = planter_grille(6, 6, rng=random.Random(1))
+    archive.ajouter(grille, ampoules)
+    archive.fichier.close()
+    with LecteurArchive(nom) as lecteur:
+        assert len(lecteur) == 1
+    with EcrivainArchive(nom) as archive:
+        assert archive.ajouter(grille, ampoules) == 1
+    with LecteurArchive(nom) as lecteur:
+        assert len(lecteur) == 2 and lecteur.grille(1) == grille
+
+@pytest.mark.parametrize('contenu', [b'', b'LUPG' + bytes(40), b'LUPK\x01\x00' + bytes(10)])
+def test_fichier_invalide(tmp_path, contenu):
+    nom = tmp_path / "grilles.lupk"
+    nom.write_bytes(contenu)
+    with pytest.raises(ValueError):
+        LecteurArchive(str(nom))
@@ -0,0 +1,39 @@
+import random
+
+import pytest
+
+from bandes import choisir_coupes, resoudre_par_bandes, transposer
+from genere_grille import generer_grille_plantee
+from lightup import est_solution, resoudre
+
+pytest.importorskip('pysat')
+
+def test_choisir_coupes():
+    grille = [['.'] * 4 for _ in range(100)]
+    coupes = choisir_coupes(grille, 20)
+    assert coupes[0] == 0 and coupes[-1] == 100
+    assert all(b - a >= 2 for a, b in zip(coupes, coupes[1:]))
+    assert choisir_coupes(grille[:22], 20) == [0, 22]
+
+@pytest.mark.parametrize('processus', [1, 2])
+def test_grille_plantee(processus):
+    grille = generer_grille_plantee(60, 25, 'difficile', rng=random.Random(0))
+    statut, ampoules, rapport = resoudre_par_bandes(grille, hauteur_bande=10, processus=processus)
+    assert statut == 'SAT' and est_solution(grille, ampoules)
+    assert len(rapport['coupes']) >= 3
+
+def test_grille_plus_large_que_haute():
+    grille = transposer(generer_grille_plantee(60, 20, rng=random.Random(1)))
+    statut, ampoules, _ = resoudre_par_bandes(grille, hauteur_bande=10, processus=1)
+    assert statut == 'SAT' and est_solution(grille, ampoules)
+
+@pytest.mark.parametrize('ligne', [0, 25, 59])
+def test_grille_impossible(ligne):
+    grille = generer_grille_plantee(60, 20, rng=random.Random(2))
+    grille[ligne][:2] = ['#1', '#']  # Un mur #1 entouré de murs
+    for voisine in (ligne - 1, ligne + 1):
+        if 0 <= voisine < 60:
+            grille[voisine][0] = '#'
+    assert resoudre(grille, moteur='pysat').statut == 'UNSAT'
+    statut, ampoules, _ = resoudre_par_bandes(grille, hauteur_bande=10, processus=1)
+    assert statut == 'UNSAT' and ampoules is None
@@ -0,0 +1,51 @@
+import json
+import shutil
+
+import pytest
+
+from benchmark import comparer, generer_corpus, lancer_benchmark
+from genere_grille import grille_est_valide
+from lightup import instrumentation, resoudre
+
+def test_corpus_reproductible():
+    corpus = generer_corpus(tailles=[5, 8], par_case=2, graine=3)
+    assert len(corpus) == 2 * 3 * 2
+    assert corpus == generer_corpus(tailles=[5, 8], par_case=2, graine=3)
+    assert len({instance['id'] for instance in corpus}) == len(corpus)
+    assert all(grille_est_valide(instance['grille']) for instance in corpus)
+
+def test_corpus_plante():
+    pytest.importorskip('pysat')
+    for instance in generer_corpus(tailles=[6, 12], graine=1, plantees=True):
+        assert resoudre(instance['grille'], moteur='pysat').statut == 'SAT'
+
+@pytest.fixture
+def mesures():
+    """Les statistiques du solveur relevées par le benchmark ne restent pas collectées"""
+    yield
+    instrumentation.activer(False)
+    instrumentation.reinitialiser()
+
+def test_lancer_benchmark(mesures, capsys):
+    corpus = generer_corpus(tailles=[5], niveaux=['facile'], graine=0, plantees=True)
+    bilan = lancer_benchmark(corpus, memoire=False)
+    resultat, = bilan['resultats']
+    assert resultat['valide'] and resultat['nb_clauses'] > 0
+    assert resultat['temps']['generer_dimacs'] is not None
+    if shutil.which('minisat'):
+        assert resultat['statut'] == 'SAT' and resultat['solution_valide']
+    else:
+        assert resultat['statut'] == 'NON_RESOLU'
+
+def _ecrire(chemin, temps, nb_clauses=100):
+    resultat = {'id': 'g', 'temps': temps, 'nb_clauses': nb_clauses, 'nb_litteraux': 300}
+    chemin.write_text(json.dumps({'resultats': [resultat]}))
+    return chemin
+
+def test_comparer(tmp_path):
+    ancien = _ecrire(tmp_path / 'ancien.json', {'generer_dimacs': 1.0, 'appeler_sat_solver': 0.001})
+    nouveau = _ecrire(tmp_path / 'nouveau.json', {'generer_dimacs': 1.5, 'appeler_sat_solver': 0.005}, 200)
+    regressions = comparer(ancien, nouveau)
+    # L'appel au solveur reste sous le plancher: pas une régression
+    assert [(r[0], r[1]) for r in regressions] == [('g', 'generer_dimacs'), ('g', 'nb_clauses')]
+    assert comparer(ancien, ancien) == []
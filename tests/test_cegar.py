@@ -0,0 +1,46 @@
+import random
+
+import pytest
+
+from cegar import alignements_violes, clauses_alignement_eager, resoudre_cegar
+from genere_grille import generer_grille_plantee
+from lightup import est_solution
+from lightup.encodages import generer_clauses
+from lightup.index_grille import IndexGrille
+
+pytest.importorskip('pysat')
+
+CELLULES = ['.'] * 10 + ['#', '#0', '#1', '#2', '#3', '#4']
+
+@pytest.mark.parametrize('segment_entier', [False, True])
+def test_accord_avec_l_encodage_complet(segment_entier):
+    from lightup import resoudre
+    rng = random.Random(0)
+    for _ in range(150):
+        H, L = rng.randint(1, 5), rng.randint(1, 5)
+        grille = [[rng.choice(CELLULES) for _ in range(L)] for _ in range(H)]
+        resultat = resoudre_cegar(grille, segment_entier=segment_entier)
+        assert resultat.statut == resoudre(grille, moteur='pysat').statut, grille
+        if resultat.statut == 'SAT':
+            assert est_solution(grille, resultat.ampoules), grille
+
+def test_grille_plantee():
+    grille = generer_grille_plantee(30, 30, rng=random.Random(0))
+    resultat = resoudre_cegar(grille)
+    assert resultat.statut == 'SAT' and est_solution(grille, resultat.ampoules)
+    assert resultat.iterations >= 1
+    assert resultat.clauses_initiales + resultat.clauses_ajoutees < resultat.clauses_eager
+
+def test_mur_impossible():
+    resultat = resoudre_cegar([['#4', '.']])
+    assert resultat.statut == 'UNSAT' and resultat.ampoules is None and resultat.iterations == 0
+
+def test_alignements_violes():
+    grille = [['.', '.', '.', '#']]
+    index = IndexGrille(grille)
+    var_map, _ = generer_clauses(grille, index)
+    var_case = [var_map.get(index.position(c), 0) for c in range(4)]
+    assert alignements_violes(index, var_case, [0, 2]) == [[-1, -3]]
+    assert sorted(alignements_violes(index, var_case, [0, 2], segment_entier=True)) == [[-2, -3], [-1, -3], [-1, -2]]
+    assert alignements_violes(index, var_case, [0]) == []
+    assert clauses_alignement_eager(index) == 3 * 2
@@ -0,0 +1,39 @@
+import pytest
+
+from lightup.cli import main
+from lightup.grille_compacte import GrilleCompacte
+
+SAT = [['.', '#2', '.'],
+       ['.', '#', '.'],
+       ['.', '#0', '.']]
+UNSAT = [['.', '#1', '.']]
+
+def _ecrire(dossier, grille, nom="grille.txt"):
+    chemin = dossier / nom
+    chemin.write_text('\n'.join(' '.join(ligne) for ligne in grille) + '\n')
+    return str(chemin)
+
+def test_resolution(tmp_path, capsys):
+    pytest.importorskip('pysat')
+    assert main([_ecrire(tmp_path, SAT), '--moteur', 'pysat']) == 0
+    assert capsys.readouterr().out.splitlines() == ['A #2 A', '* # *', '* #0 *']
+    assert main([_ecrire(tmp_path, UNSAT), '--moteur', 'pysat', '--encodage', 'sequentiel/segments']) == 1
+    assert "Pas de solution" in capsys.readouterr().out
+
+def test_grille_binaire(tmp_path, capsys):
+    pytest.importorskip('pysat')
+    nom = str(tmp_path / "grille.lug")
+    GrilleCompacte.depuis_liste(SAT).ecrire_binaire(nom)
+    assert main([nom, '--moteur', 'pysat', '--sans-symetries', '--renforcer']) == 0
+    assert capsys.readouterr().out.splitlines()[0] == 'A #2 A'
+
+def test_verifier(tmp_path, capsys):
+    assert main(['--verifier', _ecrire(tmp_path, [['A', '#2', 'A'], ['.', '#', '.'], ['.', '#0', '.']])]) == 0
+    assert "Solution valide" in capsys.readouterr().out
+    assert main(['--verifier', _ecrire(tmp_path, [['A', '#1', 'A']])]) == 1
+    assert "ERREUR: Mur (0,1) avec chiffre 1 a 2 ampoules adjacentes" in capsys.readouterr().out
+
+@pytest.mark.parametrize('args', [[], ['--verifier'], ['grille.txt', '--moteur', 'glucose'],
+                                  ['grille.txt', '--encodage', 'paires/inconnu'], ['grille.txt', '--timeout']])
+def test_usage(args):
+    assert main(args) == 2
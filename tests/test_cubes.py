@@ -0,0 +1,61 @@
+import random
+import shutil
+import time
+
+import pytest
+
+from cubes import _resoudre_cubes_minisat, _resoudre_cubes_pysat, generer_cubes, resoudre_cubes
+from genere_grille import generer_grille_plantee
+from lightup import est_solution
+from lightup.encodage import ampoules_du_modele, ecrire_cnf, encoder
+
+SAT = [['.', '#2', '.'],
+       ['.', '#', '.'],
+       ['.', '#0', '.']]
+UNSAT = [['.', '.', '.'],
+         ['.', '#1', '.'],
+         ['.', '.', '.']]
+
+def _cnf(grille, dossier):
+    var_map, clauses, nb_vars = encoder(grille, briser_symetries=False, encodage='paires/direct')
+    nom = str(dossier / "grille.cnf")
+    ecrire_cnf(nom, clauses, nb_vars)
+    return nom, var_map, clauses, nb_vars
+
+def _chemins():
+    chemins = []
+    try:
+        import pysat  # noqa: F401
+        chemins.append(pytest.param(lambda nb_vars, clauses, cubes: _resoudre_cubes_pysat(clauses, cubes, None,
+                                                                                         time.perf_counter()),
+                                    id='pysat'))
+    except ImportError:
+        pass
+    if shutil.which('minisat'):
+        chemins.append(pytest.param(lambda nb_vars, clauses, cubes: _resoudre_cubes_minisat(nb_vars, clauses, cubes, 2,
+                                                                                           None, time.perf_counter()),
+                                    id='minisat'))
+    return chemins
+
+@pytest.mark.parametrize('grille, statut', [(SAT, 'SAT'), (UNSAT, 'UNSAT')])
+def test_statut(tmp_path, grille, statut):
+    nom, var_map, _, _ = _cnf(grille, tmp_path)
+    resultat = resoudre_cubes(nom, profondeur=2)
+    assert resultat.statut == statut
+    if statut == 'SAT':
+        assert est_solution(grille, ampoules_du_modele(resultat.modele, var_map))
+
+@pytest.mark.parametrize('chemin', _chemins())
+def test_chemins_grille_plantee(tmp_path, chemin):
+    grille = generer_grille_plantee(30, 30, rng=random.Random(1))
+    _, var_map, clauses, nb_vars = _cnf(grille, tmp_path)
+    cubes = generer_cubes(nb_vars, clauses, 3)
+    assert len(cubes) > 1
+    resultat = chemin(nb_vars, clauses, cubes)
+    assert resultat.statut == 'SAT'
+    assert est_solution(grille, ampoules_du_modele(resultat.modele, var_map))
+
+def test_budget(tmp_path):
+    pytest.importorskip('pysat')
+    nom = _cnf(generer_grille_plantee(60, 60, rng=random.Random(2)), tmp_path)[0]
+    assert resoudre_cubes(nom, budget=0.0).statut == 'INCONNU'
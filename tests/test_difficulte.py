@@ -0,0 +1,44 @@
+import random
+
+import pytest
+
+from difficulte import noter
+from lightup import est_solution
+
+@pytest.mark.parametrize('grille', [
+    [['#4', '#']],
+    [['#3'], ['#']],
+    [['.', '.', '.', '#'], ['.', '.', '#', '#4']],
+    [['#1', '#1'], ['.', '#']],
+])
+def test_grille_impossible(grille):
+    note = noter(grille)
+    assert note.statut == 'UNSAT'
+    assert note.niveau == 1
+
+def test_solution_unique_sans_recherche():
+    grille = [['.', '#2', '.'],
+              ['.', '#', '.'],
+              ['.', '#0', '.']]
+    note = noter(grille)
+    assert note.statut == 'SAT' and note.unique
+    assert sorted(note.ampoules) == [(0, 0), (0, 2)]
+
+def test_recherche_bornee():
+    grille = [['.'] * 6 for _ in range(6)]
+    assert noter(grille, max_noeuds=0).statut == 'INCONNU'
+    note = noter(grille)
+    assert note.niveau == 3 and note.statut == 'SAT'
+    assert est_solution(grille, note.ampoules)
+
+def test_accord_avec_le_solveur():
+    pytest.importorskip('pysat')
+    from lightup import resoudre
+    rng = random.Random(0)
+    for _ in range(300):
+        H, L = rng.randint(1, 5), rng.randint(1, 5)
+        grille = [[rng.choice(['.'] * 6 + ['#', '#0', '#1', '#2', '#3', '#4']) for _ in range(L)] for _ in range(H)]
+        note = noter(grille, max_noeuds=100000)
+        assert note.statut == resoudre(grille, moteur='pysat').statut, grille
+        if note.statut == 'SAT':
+            assert est_solution(grille, note.ampoules), grille
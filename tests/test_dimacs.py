@@ -0,0 +1,66 @@
+import shutil
+
+import pytest
+
+import dimacs
+
+SAT = [['.', '#2', '.'],
+       ['.', '#', '.'],
+       ['.', '#0', '.']]
+UNSAT = [['.', '#1', '.'], ['#0', '.', '#0']]
+
+@pytest.fixture(autouse=True)
+def dossier(tmp_path, monkeypatch, capsys):
+    """output.cnf et solution.txt sont écrits dans un dossier temporaire"""
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+def _lire_cnf(chemin):
+    with open(chemin) as f:
+        lignes = f.read().split('\n')
+    nb_vars, nb_clauses = map(int, lignes[0].split()[2:])
+    clauses = [[int(l) for l in ligne.split()[:-1]] for ligne in lignes[1:] if ligne]
+    assert len(clauses) == nb_clauses
+    return clauses, nb_vars
+
+@pytest.mark.parametrize('briser_symetries', [False, True])
+def test_statuts(dossier, briser_symetries):
+    pytest.importorskip('pysat')
+    from lightup.solveurs import resoudre_pysat
+    for grille, statut in ((SAT, 'SAT'), (UNSAT, 'UNSAT')):
+        var_map, clauses = dimacs.generer_dimacs(grille, briser_symetries=briser_symetries)
+        ecrites, _ = _lire_cnf(dossier / 'output.cnf')
+        assert len(ecrites) >= len(clauses)
+        resultat = resoudre_pysat(ecrites)
+        assert resultat.statut == statut
+        if statut == 'SAT':
+            solution_grille = dimacs.interpreter_solution(resultat.modele, grille, var_map)
+            assert dimacs.verifier_solution(solution_grille)
+            assert solution_grille[0] == ['A', '#2', 'A']
+
+def test_pretraite(dossier):
+    pytest.importorskip('pysat')
+    from lightup.solveurs import resoudre_pysat
+    var_map, clauses, table = dimacs.generer_dimacs_pretraite(SAT)
+    assert var_map == dimacs.generer_dimacs(SAT)[0]
+    reduites, _ = _lire_cnf(dossier / 'output.cnf')
+    modele = table.reconstruire(resoudre_pysat(reduites).modele if reduites else [])
+    assert dimacs.verifier_solution(dimacs.interpreter_solution(modele, SAT, var_map))
+
+def test_mur_impossible():
+    assert dimacs.generer_dimacs([['#4', '.']]) == (None, None)
+    assert dimacs.generer_dimacs_pretraite([['#4', '.']]) == (None, None, None)
+
+def test_verifier_solution():
+    assert not dimacs.verifier_solution([['A', 'A']])
+    assert not dimacs.verifier_solution([[' ', '#']])
+    assert not dimacs.verifier_solution([['A', '*'], ['#0', '#']])
+    assert dimacs.verifier_solution([['A', '*'], ['#1', '#']])
+
+@pytest.mark.skipif(shutil.which('minisat') is None, reason="MiniSAT introuvable")
+def test_appeler_sat_solver(dossier):
+    var_map, _ = dimacs.generer_dimacs(SAT)
+    solution = dimacs.appeler_sat_solver()
+    assert dimacs.verifier_solution(dimacs.interpreter_solution(solution, SAT, var_map))
+    dimacs.generer_dimacs(UNSAT)
+    assert dimacs.appeler_sat_solver() is None
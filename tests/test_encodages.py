@@ -0,0 +1,95 @@
+import itertools
+import random
+
+import pytest
+
+from lightup.encodage import ampoules_du_modele, ecrire_cnf, encoder
+from lightup.encodages import ENCODAGES, clauses_exactement, encoder_variante
+from lightup.index_grille import IndexGrille
+
+CELLULES = ['.'] * 16 + ['#', '#0', '#1', '#2', '#3', '#4']
+
+def _grilles(nombre, graine):
+    """Petites grilles aléatoires, dont des segments d'au moins 5 cases (compteur séquentiel)"""
+    rng = random.Random(graine)
+    for _ in range(nombre):
+        H, L = rng.choice([(1, 6), (2, 5), (5, 2), (3, 3), (2, 3)])
+        yield [[rng.choice(CELLULES) for _ in range(L)] for _ in range(H)]
+
+def _solutions(grille):
+    """Toutes les solutions par force brute, en ensembles de cases (i, j)"""
+    index = IndexGrille(grille)
+    libres = [c for c in range(index.H * index.L) if not index.mur[c]]
+    solutions = set()
+    for choix in itertools.product((0, 1), repeat=len(libres)):
+        ampoules = {c for c, a in zip(libres, choix) if a}
+        comptes = index.segments_allumes(ampoules)
+        if (all(n <= 1 for n in comptes) and all(index.eclairee(c, comptes) for c in libres)
+                and all(sum(v in ampoules for v in index.voisins_mur(k)) == index.chiffre[c]
+                        for k, c in enumerate(index.murs_chiffres))):
+            solutions.add(frozenset(index.position(c) for c in ampoules))
+    return solutions
+
+def _modeles(var_map, clauses):
+    """Tous les modèles projetés sur les variables des cases"""
+    from lightup.solveurs import creer_pysat
+    solveur = creer_pysat(clauses)
+    modeles = set()
+    while solveur.solve():
+        modele = solveur.get_model()
+        modeles.add(frozenset(ampoules_du_modele(modele, var_map)))
+        solveur.add_clause([-l for l in modele if abs(l) in var_map.values()])
+    solveur.delete()
+    return modeles
+
+@pytest.mark.parametrize('encodage', ENCODAGES)
+def test_memes_solutions_que_la_force_brute(encodage):
+    pytest.importorskip('pysat')
+    for grille in _grilles(120, 0):
+        var_map, clauses, nb_vars = encoder(grille, briser_symetries=False, encodage=encodage)
+        if var_map is None:
+            assert not _solutions(grille), grille
+            continue
+        assert max((abs(l) for clause in clauses for l in clause), default=0) <= nb_vars
+        assert _modeles(var_map, clauses) == _solutions(grille), grille
+
+@pytest.mark.parametrize('encodage', ENCODAGES)
+def test_symetries_et_renforcement_gardent_le_statut(encodage):
+    pytest.importorskip('pysat')
+    from lightup.solveurs import resoudre_pysat
+    for grille in _grilles(120, 1):
+        var_map, clauses, _ = encoder(grille, renforcer=True, briser_symetries=True, encodage=encodage)
+        solvable = bool(_solutions(grille))
+        if var_map is None:
+            assert not solvable, grille
+            continue
+        resultat = resoudre_pysat(clauses)
+        assert resultat.statut == ('SAT' if solvable else 'UNSAT'), grille
+        if solvable:
+            assert frozenset(ampoules_du_modele(resultat.modele, var_map)) in _solutions(grille)
+
+@pytest.mark.parametrize('nb', range(5))
+def test_clauses_exactement(nb):
+    variables = list(range(1, nb + 1))
+    for n in range(nb + 1):
+        clauses = clauses_exactement(variables, n)
+        for valeurs in itertools.product((False, True), repeat=nb):
+            satisfaite = all(any(valeurs[abs(l) - 1] == (l > 0) for l in clause) for clause in clauses)
+            assert satisfaite == (sum(valeurs) == n)
+
+def test_encodage_inconnu():
+    with pytest.raises(ValueError):
+        encoder_variante([['.']], 'paires/inconnu')
+
+def test_mur_impossible():
+    assert encoder([['#4', '#']]) == (None, None, 0)
+
+def test_ecrire_cnf_et_modele(tmp_path):
+    var_map, clauses, nb_vars = encoder([['.', '#1', '.']], briser_symetries=False, encodage='paires/direct')
+    nom = tmp_path / "grille.cnf"
+    ecrire_cnf(str(nom), clauses, nb_vars)
+    lignes = nom.read_text().splitlines()
+    assert lignes[0] == f"p cnf {nb_vars} {len(clauses)}"
+    assert [list(map(int, ligne.split()))[:-1] for ligne in lignes[1:]] == clauses
+    # Les variables auxiliaires (au-delà de var_map) sont ignorées
+    assert ampoules_du_modele([var_map[(0, 0)], -var_map[(0, 2)], nb_vars + 1], var_map) == [(0, 0)]
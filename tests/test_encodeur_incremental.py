@@ -0,0 +1,56 @@
+import random
+
+import pytest
+
+from encodeur_incremental import EncodeurIncremental
+from lightup import est_solution
+
+pytest.importorskip('pysat')
+
+def _statut(grille):
+    from lightup import resoudre
+    return resoudre(grille, moteur='pysat', briser_symetries=False).statut
+
+def test_verifier():
+    encodeur = EncodeurIncremental([['.', '#2', '.'],
+                                    ['.', '#', '.'],
+                                    ['.', '#0', '.']])
+    assert encodeur.verifier() == 'unique'
+    assert sorted(encodeur.solution) == [(0, 0), (0, 2)]
+    assert EncodeurIncremental([['.', '.'], ['.', '.']]).verifier() == 'multiple'
+    assert EncodeurIncremental([['.', '#1', '.']]).verifier() == 'aucune'
+
+def test_modifications_comme_un_encodage_neuf():
+    rng = random.Random(0)
+    for _ in range(10):
+        grille = [['.'] * 5 for _ in range(4)]
+        encodeur = EncodeurIncremental(grille)
+        for _ in range(15):
+            i, j = rng.randrange(4), rng.randrange(5)
+            cellule = rng.choice(['.', '.', '#', '#0', '#1', '#2', '#3'])
+            encodeur.modifier(i, j, cellule)
+            grille[i][j] = cellule
+            assert encodeur.grille == grille
+            resultat = encodeur.resoudre()
+            assert ('SAT' if resultat else 'UNSAT') == _statut(grille), grille
+            if resultat:
+                assert est_solution(grille, encodeur.ampoules())
+
+def test_compacter():
+    encodeur = EncodeurIncremental([['.'] * 4 for _ in range(4)])
+    for _ in range(6):
+        encodeur.modifier(1, 1, '#1')
+        encodeur.modifier(1, 1, '.')
+    assert encodeur.nb_groupes_retires <= 2 * len(encodeur.groupes)
+    encodeur.modifier(0, 0, '#0')
+    encodeur.compacter()
+    assert encodeur.nb_groupes_retires == 0
+    assert encodeur.resoudre() and (0, 0) not in encodeur.ampoules()
+
+def test_expliquer():
+    encodeur = EncodeurIncremental([['.', '#1', '.']])
+    explication = encodeur.expliquer()
+    assert ('chiffre', 1) in explication
+    assert encodeur.decrire_explication([('chiffre', 1)]) == ["le mur #1 en (0,1) exige 1 ampoule(s) adjacente(s)"]
+    encodeur.modifier(0, 1, '#2')
+    assert encodeur.expliquer() is None
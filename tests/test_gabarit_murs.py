@@ -0,0 +1,36 @@
+import pytest
+
+from gabarit_murs import GabaritMurs
+from lightup import est_solution
+
+pytest.importorskip('pysat')
+
+DISPOSITION = [['.', '#', '.'],
+               ['.', '#', '.'],
+               ['.', '#', '.']]
+
+def test_numerotations():
+    with GabaritMurs(DISPOSITION) as gabarit:
+        chiffres = {(0, 1): 2, (2, 1): 0}
+        assert gabarit.resoudre(chiffres) is True
+        assert est_solution(gabarit.grille(chiffres), gabarit.ampoules())
+        assert gabarit.grille(chiffres)[0] == ['.', '#2', '.']
+
+        assert gabarit.resoudre({(0, 1): 2, (2, 1): 2}) is False
+        assert gabarit.noyau() == [(0, 1), (2, 1)]
+        assert gabarit.resoudre({(1, 1): 1, (0, 1): 0}) is True
+        assert gabarit.resoudre({}) is True
+        assert gabarit.nb_resolutions == 4
+        # Les sélecteurs déjà créés sont réutilisés
+        assert gabarit.selecteur(0, 1, 2) == gabarit.selecteurs[(0, 1, 2)]
+
+def test_chiffre_impossible():
+    with GabaritMurs(DISPOSITION) as gabarit:
+        assert gabarit.resoudre({(0, 1): 3}) is False
+        assert gabarit.noyau() == [(0, 1)]
+        assert gabarit.nb_resolutions == 0
+
+def test_disposition_des_chiffres_ignoree():
+    with GabaritMurs([['.', '#4', '.'], ['.', '#1', '.']]) as gabarit:
+        assert gabarit.murs == [['.', '#', '.'], ['.', '#', '.']]
+        assert gabarit.resoudre({}) is True
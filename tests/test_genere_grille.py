@@ -0,0 +1,75 @@
+import random
+
+import pytest
+
+from genere_grille import (BudgetAdaptatif, generer_grille_gabarit, generer_grille_insoluble, generer_grille_light_up,
+                           generer_grille_plantee, generer_grille_reparee, grille_est_valide, normaliser_murs,
+                           planter_grille, reparer_grille)
+from lightup import est_solution
+from lightup.solveurs import ResultatSolveur
+
+def _statut(grille):
+    from lightup import resoudre
+    return resoudre(grille, moteur='pysat').statut
+
+@pytest.mark.parametrize('difficulte', ['facile', 'moyen', 'difficile'])
+def test_grilles_plantees(difficulte):
+    rng = random.Random(0)
+    for taille in (1, 5, 20, 50):
+        grille, ampoules = planter_grille(taille, taille + 1, difficulte, rng)
+        texte = grille.vers_liste()
+        assert est_solution(texte, [divmod(c, taille + 1) for c in ampoules])
+        assert grille_est_valide(texte)
+    assert generer_grille_plantee(4, 6, rng=random.Random(1), compacte=True).vers_liste() == \
+        generer_grille_plantee(4, 6, rng=random.Random(1))
+
+def test_normaliser_murs():
+    grille = [['#4', '.'], ['#', '#3']]
+    assert not grille_est_valide(grille)
+    assert normaliser_murs(grille) == 2
+    assert grille == [['#1', '.'], ['#', '#1']] and grille_est_valide(grille)
+    assert normaliser_murs(grille) == 0
+
+def test_reparer_grille():
+    pytest.importorskip('pysat')
+    grille = [['.', '#1', '.'], ['#0', '.', '#0']]
+    assert _statut(grille) == 'UNSAT'
+    statut, appels, modifies = reparer_grille(grille)
+    assert statut == 'SAT' and appels >= 2 and modifies >= 1
+    assert _statut(grille) == 'SAT'
+    assert reparer_grille([['#1', '.']]) == ('SAT', 1, 0)
+
+@pytest.mark.parametrize('generateur', [generer_grille_reparee, generer_grille_gabarit])
+def test_generateurs_solvables(generateur):
+    pytest.importorskip('pysat')
+    rng = random.Random(0)
+    for _ in range(5):
+        grille, appels = generateur(8, 8, 'difficile', rng=rng)
+        assert grille is not None and appels >= 1
+        assert grille_est_valide(grille) and _statut(grille) == 'SAT'
+
+def test_generer_grille_light_up(capsys):
+    pytest.importorskip('pysat')
+    random.seed(0)
+    for strategie in ('reparation', 'gabarit'):
+        grille = generer_grille_light_up(6, 7, strategie=strategie)
+        assert len(grille) == 6 and len(grille[0]) == 7 and _statut(grille) == 'SAT'
+    with pytest.raises(ValueError):
+        generer_grille_light_up(6, 6, 'extreme')
+    with pytest.raises(ValueError):
+        generer_grille_light_up(6, 6, strategie='inconnue')
+
+def test_generer_grille_insoluble(capsys):
+    pytest.importorskip('pysat')
+    random.seed(0)
+    grille, explication = generer_grille_insoluble(7, 7, rng=random.Random(0))
+    assert _statut(grille) == 'UNSAT'
+    assert explication and all(isinstance(phrase, str) for phrase in explication)
+
+def test_budget_adaptatif():
+    budgets = BudgetAdaptatif(base=1.0, minimum=0.2, maximum=10.0)
+    assert budgets.budget(10, 10) == 1.0 and budgets.budget(100, 100) == 10.0
+    for _ in range(5):
+        budgets.observer(10, 10, ResultatSolveur('SAT', temps=0.1))
+    budgets.observer(10, 10, ResultatSolveur('INCONNU', temps=50.0))  # Ignorée
+    assert budgets.budget(10, 10) == pytest.approx(0.4)
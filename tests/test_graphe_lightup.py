@@ -0,0 +1,44 @@
+import os
+
+import pytest
+
+pytest.importorskip('tkinter')
+import graphe_lightup  # noqa: E402
+from graphe_lightup import (COULEUR_ERREUR, COULEUR_MARQUE, COULEUR_MUR, COULEUR_MUR_CHIFFRE, donnees_image,
+                            interpreter_solution, plage_visible)  # noqa: E402
+from lightup import est_solution  # noqa: E402
+
+SAT = [['.', '#2', '.'],
+       ['.', '#', '.'],
+       ['.', '#0', '.']]
+
+def test_resolution():
+    pytest.importorskip('pysat')
+    from lightup.solveurs import resoudre_pysat
+    var_map, nom_fichier = graphe_lightup.generer_dimacs(SAT)
+    try:
+        with open(nom_fichier) as f:
+            clauses = [[int(l) for l in ligne.split()[:-1]] for ligne in f.read().split('\n')[1:] if ligne]
+    finally:
+        os.remove(nom_fichier)
+    solution = interpreter_solution(resoudre_pysat(clauses).modele, SAT, var_map)
+    assert solution[0] == ['A', '#2', 'A'] and solution[1][0] == '.'
+    assert est_solution(SAT, [(i, j) for i, ligne in enumerate(solution) for j, c in enumerate(ligne) if c == 'A'])
+    assert interpreter_solution(None, SAT, var_map) is None
+
+def test_mur_impossible(monkeypatch):
+    messages = []
+    monkeypatch.setattr(graphe_lightup.messagebox, 'showerror', lambda *args: messages.append(args))
+    assert graphe_lightup.generer_dimacs([['#4', '.']]) == (None, None)
+    assert len(messages) == 1
+
+def test_plage_visible():
+    assert plage_visible(0, 99, 10, 0, 50) == (0, 10)
+    assert plage_visible(95, 204, 10, 5, 50) == (9, 20)
+    assert plage_visible(0, 10_000, 10, 0, 50) == (0, 50)
+    assert plage_visible(900, 1000, 10, 0, 50) == (50, 50)
+
+def test_donnees_image():
+    grille = [['#', '#1'], ['.', '*']]
+    donnees = donnees_image(grille, marques={(1, 0)}, cases_erreur={(1, 1)})
+    assert donnees == f"{{{COULEUR_MUR} {COULEUR_MUR_CHIFFRE}}} {{{COULEUR_MARQUE} {COULEUR_ERREUR}}}"
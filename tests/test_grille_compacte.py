@@ -0,0 +1,59 @@
+import pytest
+
+from lightup.grille_compacte import AMPOULE, MUR, MUR_CHIFFRE, GrilleCompacte, code_case, est_binaire, lire_grille
+
+GRILLE = [['.', '#2', '.'],
+          ['#', '.', '#0'],
+          ['#4', '.', '#1']]
+SOLUTION = [['A', '#2', 'A'],
+            ['#', ' ', '#0'],
+            ['#4', ' ', '#1']]
+
+def test_codes():
+    assert [code_case(c) for c in ('.', ' ', '*', 'A', '#', '#0', '#4')] == \
+        [0, 0, 0, AMPOULE, MUR, MUR_CHIFFRE, MUR_CHIFFRE + 4]
+
+@pytest.mark.parametrize('cellule', ['#5', '#12', '#x'])
+def test_mur_chiffre_invalide(cellule):
+    with pytest.raises(ValueError):
+        code_case(cellule)
+    with pytest.raises(ValueError):
+        GrilleCompacte.depuis_liste([['.', cellule]])
+
+def test_aller_retour_texte(tmp_path):
+    nom = tmp_path / "grille.txt"
+    nom.write_text('\n'.join(' '.join(ligne) for ligne in GRILLE) + '\n')
+    grille = GrilleCompacte.lire_texte(nom)
+    assert grille == GrilleCompacte.depuis_liste(GRILLE)
+    assert grille.vers_liste() == GRILLE
+    assert grille.cellule(2, 0) == '#4' and grille.code(0, 1) == MUR_CHIFFRE + 2
+    assert not est_binaire(nom) and lire_grille(nom) == GRILLE
+
+def test_aller_retour_binaire(tmp_path):
+    nom = tmp_path / "grille.lug"
+    GrilleCompacte.depuis_liste(GRILLE).ecrire_binaire(nom)
+    assert est_binaire(nom)
+    assert lire_grille(nom) == GRILLE
+    assert GrilleCompacte.lire_binaire(nom) == GrilleCompacte.ouvrir(nom) == GrilleCompacte.depuis_liste(GRILLE)
+
+def test_binaire_tronque(tmp_path):
+    nom = tmp_path / "grille.lug"
+    GrilleCompacte.depuis_liste(GRILLE).ecrire_binaire(nom)
+    nom.write_bytes(nom.read_bytes()[:-1])
+    with pytest.raises(ValueError):
+        GrilleCompacte.lire_binaire(nom)
+    with pytest.raises(ValueError):
+        GrilleCompacte.ouvrir(nom)
+
+def test_ligne_de_mauvaise_longueur(tmp_path):
+    nom = tmp_path / "grille.txt"
+    nom.write_text(". .\n. . .\n")
+    with pytest.raises(ValueError):
+        GrilleCompacte.lire_texte(nom)
+
+def test_eclairage_et_tableaux():
+    grille = GrilleCompacte.depuis_liste(SOLUTION)
+    assert grille.ampoules() == [0, 2]
+    assert grille.vers_liste(eclairage=True) == SOLUTION
+    assert list(grille.mur()) == [0, 1, 0, 1, 0, 1, 1, 0, 1]
+    assert [c if c < 128 else c - 256 for c in grille.chiffres()] == [-1, 2, -1, -1, -1, 0, 4, -1, 1]
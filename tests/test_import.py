@@ -0,0 +1,34 @@
+import os
+import subprocess
+import sys
+
+from lightup.cli import BUDGET_IMPORT_MS, INTERDITS
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Importe le paquet et les noms chargés à la demande (chronométrés), puis liste les modules interdits
+SONDE = """
+import sys, time
+debut = time.perf_counter()
+import lightup
+lightup.resoudre, lightup.est_solution, lightup.lire_grille, lightup.encoder
+print((time.perf_counter() - debut) * 1000)
+print(' '.join(m for m in sys.modules if m.split('.')[0] in {interdits!r}))
+"""
+
+def _sonder():
+    """(temps d'import de lightup en ms, modules interdits chargés) dans un interpréteur neuf"""
+    environnement = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [RACINE, os.environ.get('PYTHONPATH')])))
+    processus = subprocess.run([sys.executable, '-c', SONDE.format(interdits=INTERDITS)],
+                               capture_output=True, text=True, env=environnement, cwd=RACINE, check=True)
+    lignes = processus.stdout.split('\n')
+    return float(lignes[0]), lignes[1].split()
+
+def test_import_dans_le_budget():
+    # Meilleur de quelques essais: le premier paie les caches de fichiers froids
+    temps = min(_sonder()[0] for _ in range(3))
+    assert temps <= BUDGET_IMPORT_MS, f"import lightup: {temps:.1f} ms (budget {BUDGET_IMPORT_MS:.0f} ms)"
+
+def test_import_sans_modules_interdits():
+    interdits = _sonder()[1]
+    assert not interdits, f"modules interdits chargés: {', '.join(interdits)}"
@@ -0,0 +1,44 @@
+from lightup.grille_compacte import GrilleCompacte
+from lightup.index_grille import IndexGrille
+
+GRILLE = [['.', '.', '#1'],
+          ['.', '#', '.'],
+          ['#0', '.', '.']]
+
+def _segments(index):
+    return [sorted(index.position(c) for c in index.membres_segment(s)) for s in range(index.nb_segments)]
+
+def test_segments():
+    index = IndexGrille(GRILLE)
+    assert index.nb_segments_lignes == 4
+    assert _segments(index) == [[(0, 0), (0, 1)], [(1, 0)], [(1, 2)], [(2, 1), (2, 2)],
+                                [(0, 0), (1, 0)], [(0, 1)], [(2, 1)], [(1, 2), (2, 2)]]
+    for c in range(9):
+        if index.mur[c]:
+            assert index.seg_ligne[c] == index.seg_colonne[c] == -1
+        else:
+            assert c in index.membres_segment(index.seg_ligne[c]) and c in index.membres_segment(index.seg_colonne[c])
+
+def test_directions_et_visibles():
+    index = IndexGrille([['.', '.', '.'], ['.', '.', '.'], ['.', '#', '.']])
+    assert [list(direction) for direction in index.directions(index.case(1, 1))] == [[1], [], [3], [5]]
+    assert sorted(index.visibles(index.case(0, 0))) == [1, 2, 3, 6]
+
+def test_murs_chiffres():
+    index = IndexGrille(GRILLE)
+    assert list(index.murs_chiffres) == [2, 6]
+    assert [index.chiffre[c] for c in index.murs_chiffres] == [1, 0]
+    assert sorted(index.voisins_mur(0)) == [1, 5] and sorted(index.voisins_mur(1)) == [3, 7]
+    assert index.mur_impossible() is None
+    assert IndexGrille([['.', '#3'], ['.', '#']]).mur_impossible() == (0, 1, 3, 1)
+
+def test_eclairage():
+    index = IndexGrille(GRILLE)
+    comptes = index.segments_allumes([index.case(0, 0)])
+    assert [c for c in range(9) if not index.mur[c] and index.eclairee(c, comptes)] == [0, 1, 3]
+
+def test_grille_compacte_identique():
+    texte, compacte = IndexGrille(GRILLE), IndexGrille(GrilleCompacte.depuis_liste(GRILLE))
+    for nom in ('mur', 'chiffre', 'seg_ligne', 'seg_colonne', 'membres', 'debut_segment', 'murs_chiffres',
+                'voisins_blancs'):
+        assert list(getattr(texte, nom)) == list(getattr(compacte, nom)), nom
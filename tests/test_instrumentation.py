@@ -0,0 +1,41 @@
+import json
+
+import pytest
+
+from lightup import instrumentation
+
+@pytest.fixture
+def mesures():
+    instrumentation.reinitialiser()
+    instrumentation.activer()
+    yield instrumentation
+    instrumentation.activer(False)
+    instrumentation.reinitialiser()
+
+def test_inactive_par_defaut():
+    assert not instrumentation.ACTIF
+    with instrumentation.chrono("etape"):
+        instrumentation.compter("n")
+    assert instrumentation.rapport() == {'temps': {}, 'compteurs': {}, 'solveur': []}
+
+def test_collecte(mesures, tmp_path, capsys):
+    for _ in range(3):
+        with mesures.chrono("etape"):
+            mesures.compter("bascules", 2)
+    mesures.enregistrer_solveur({'statut': 'SAT', 'conflits': 4})
+    rapport = mesures.rapport()
+    assert rapport['temps']['etape']['appels'] == 3 and rapport['temps']['etape']['total'] >= 0
+    assert rapport['compteurs'] == {'bascules': 6}
+    assert rapport['solveur'] == [{'statut': 'SAT', 'conflits': 4}]
+
+    nom = tmp_path / "stats.json"
+    mesures.exporter_json(nom)
+    assert json.loads(nom.read_text()) == rapport
+    mesures.afficher_rapport()
+    assert "etape:" in capsys.readouterr().out
+
+def test_chrono_compte_les_exceptions(mesures):
+    with pytest.raises(ValueError):
+        with mesures.chrono("echec"):
+            raise ValueError
+    assert mesures.rapport()['temps']['echec']['appels'] == 1
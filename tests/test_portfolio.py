@@ -0,0 +1,45 @@
+import random
+import shutil
+
+import pytest
+
+import portfolio
+from genere_grille import generer_grille_plantee
+from lightup import est_solution
+from lightup.encodage import ampoules_du_modele, ecrire_cnf, encoder
+
+pytestmark = pytest.mark.skipif(not shutil.which('minisat'), reason="MiniSAT absent")
+
+VARIANTES = [conf for conf in portfolio.CONFIGURATIONS if 'encodage' in conf]
+
+def _cnf(grille, dossier):
+    var_map, clauses, nb_vars = encoder(grille, encodage='paires/direct')
+    nom = str(dossier / "grille.cnf")
+    ecrire_cnf(nom, clauses, nb_vars)
+    return nom, var_map
+
+@pytest.mark.parametrize('conf', VARIANTES, ids=[conf['nom'] for conf in VARIANTES])
+def test_variante_ramenee_au_var_map(tmp_path, conf):
+    grille = generer_grille_plantee(20, 20, rng=random.Random(5))
+    nom, var_map = _cnf(grille, tmp_path)
+    resultat = portfolio.resoudre_portfolio(nom, [conf], grille=grille, var_map=var_map)
+    assert resultat.statut == 'SAT' and resultat.configuration == conf['nom']
+    assert est_solution(grille, ampoules_du_modele(resultat.modele, var_map))
+
+def test_unsat(tmp_path):
+    grille = [['.', '.', '.'], ['.', '#1', '.'], ['.', '.', '.']]
+    nom, var_map = _cnf(grille, tmp_path)
+    assert portfolio.resoudre_portfolio(nom, grille=grille, var_map=var_map).statut == 'UNSAT'
+
+def test_variantes_sans_grille(tmp_path):
+    nom, _ = _cnf([['.', '#1']], tmp_path)
+    with pytest.raises(FileNotFoundError):
+        portfolio.resoudre_portfolio(nom, VARIANTES)
+    assert portfolio.resoudre_portfolio(nom).statut == 'SAT'
+
+def test_journal(tmp_path):
+    nom, _ = _cnf([['.', '#1']], tmp_path)
+    journal = tmp_path / "courses.jsonl"
+    portfolio.resoudre_portfolio(nom, journal=str(journal))
+    gagnants = portfolio.statistiques_journal(str(journal))
+    assert sum(stats['victoires'] for stats in gagnants.values()) == 1
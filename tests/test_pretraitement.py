@@ -0,0 +1,57 @@
+import random
+
+import pytest
+
+from genere_grille import generer_grille_plantee
+from lightup.encodage import encoder
+from pretraitement import pretraiter
+
+def _satisfait(modele, clauses):
+    vrais = set(modele)
+    return all(any(l in vrais for l in clause) for clause in clauses)
+
+def _formules():
+    """CNF aléatoires (3-SAT autour du seuil, avec unitaires et doublons) et encodages de grilles"""
+    rng = random.Random(0)
+    for _ in range(100):
+        nb_vars = rng.randint(3, 12)
+        clauses = [[rng.choice((-1, 1)) * rng.randint(1, nb_vars) for _ in range(rng.choice((1, 2, 3, 3, 3)))]
+                   for _ in range(rng.randint(nb_vars, 5 * nb_vars))]
+        yield clauses + clauses[:3], nb_vars
+    for graine in range(5):
+        _, clauses, nb_vars = encoder(generer_grille_plantee(8, 8, rng=random.Random(graine)), renforcer=True)
+        yield clauses, nb_vars
+    for grille in ([['.', '#1', '.']], [['.', '.', '.'], ['.', '#1', '.'], ['.', '.', '.']]):
+        _, clauses, nb_vars = encoder(grille, renforcer=True)
+        yield clauses, nb_vars
+
+def test_statut_et_reconstruction():
+    pytest.importorskip('pysat')
+    from lightup.solveurs import resoudre_pysat
+    for clauses, nb_vars in _formules():
+        reduites, table, stats = pretraiter(clauses, nb_vars)
+        origine = resoudre_pysat(clauses)
+        assert stats['clauses_avant'] == len(clauses) and stats['clauses_apres'] == len(reduites)
+        if reduites == [[]]:
+            assert origine.statut == 'UNSAT'
+            continue
+        assert max((abs(l) for clause in reduites for l in clause), default=0) == stats['variables_apres']
+        resultat = resoudre_pysat(reduites) if reduites else None
+        assert (resultat.statut if reduites else 'SAT') == origine.statut, clauses
+        if origine.statut == 'SAT':
+            modele = table.reconstruire(resultat.modele if reduites else [])
+            assert len(modele) == nb_vars and _satisfait(modele, clauses)
+
+def test_simplifications():
+    clauses = [[1, 2, 3], [3, 2, 1], [1, -1, 4], [2, 2, 5], [-4], [4, 5, 6], [5, 6, 7, 8], [5, 6]]
+    reduites, table, stats = pretraiter(clauses, 8)
+    # [4, 5, 6] devient [5, 6] une fois 4 fixée: un doublon de plus
+    assert stats['doublons'] == 2 and stats['tautologies'] == 1 and stats['variables_fixees'] == 1
+    assert stats['subsumees'] == 1  # [5, 6, 7, 8] par [5, 6]
+    assert sorted(map(sorted, reduites)) == [[1, 2, 3], [2, 4], [4, 5]]  # 5, 6 renumérotées 4, 5
+    assert table.origine == [0, 1, 2, 3, 5, 6]
+    assert table.reconstruire([1, -2, -3, -4, 5]) == [1, -2, -3, -4, -5, 6, -7, -8]
+
+def test_contradiction():
+    reduites, table, stats = pretraiter([[1], [-1, 2], [-2]], 2)
+    assert reduites == [[]] and stats['clauses_apres'] == 1
@@ -0,0 +1,44 @@
+import random
+
+import pytest
+
+from genere_grille import generer_grille_plantee
+from lightup import est_solution
+from recherche_locale import RechercheLocale, grille_solution, resoudre_recherche_locale
+
+UNSAT = [['.', '.', '.'],
+         ['.', '#1', '.'],
+         ['.', '.', '.']]
+
+@pytest.mark.parametrize('taille', [5, 20, 60])
+def test_grilles_plantees(taille):
+    grille = generer_grille_plantee(taille, taille, rng=random.Random(taille))
+    ampoules, nb_bascules = resoudre_recherche_locale(grille, budget=30, graine=0)
+    assert ampoules is not None and nb_bascules > 0
+    assert est_solution(grille, ampoules)
+    solution = grille_solution(grille, ampoules)
+    assert all(cellule != ' ' for ligne in solution for cellule in ligne)
+
+@pytest.mark.parametrize('grille', [UNSAT, [['#1']]])
+def test_grille_impossible(grille):
+    ampoules, nb_bascules = resoudre_recherche_locale(grille, max_bascules=2000, graine=0)
+    assert ampoules is None
+    assert nb_bascules <= 2000
+
+def test_defauts_tenus_a_jour():
+    rng = random.Random(0)
+    for _ in range(20):
+        grille = generer_grille_plantee(12, 12, rng=rng)
+        recherche = RechercheLocale(grille, rng=random.Random(0))
+        recherche.initialiser()
+        libres = [c for c in range(len(recherche.ampoule)) if not recherche.index.mur[c]]
+        for _ in range(200):
+            c = rng.choice(libres)
+            cout, delta = recherche.cout, recherche.delta(c)
+            recherche.basculer(c)
+            assert recherche.cout == cout + delta
+        defauts = (set(recherche.non_eclairees.elements), set(recherche.conflits.elements),
+                   set(recherche.murs_faux.elements), recherche.cout)
+        recherche.evaluer()
+        assert defauts == (set(recherche.non_eclairees.elements), set(recherche.conflits.elements),
+                           set(recherche.murs_faux.elements), recherche.cout)
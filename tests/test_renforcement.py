@@ -0,0 +1,60 @@
+import random
+
+import pytest
+
+from lightup.encodage import ampoules_du_modele, encoder
+from lightup.index_grille import IndexGrille
+from lightup.renforcement import AMPOULE, INTERDITE, clauses_impliquees, deduire
+
+CELLULES = ['.'] * 12 + ['#', '#0', '#1', '#2', '#3', '#4']
+
+def _toutes_les_solutions(grille):
+    """Ensembles de cases (i, j) de toutes les solutions, par énumération pysat"""
+    from lightup.solveurs import creer_pysat
+    var_map, clauses, _ = encoder(grille, briser_symetries=False, encodage='paires/direct')
+    if var_map is None:
+        return []
+    solveur = creer_pysat(clauses)
+    solutions = []
+    while solveur.solve():
+        modele = solveur.get_model()
+        solutions.append(set(ampoules_du_modele(modele, var_map)))
+        solveur.add_clause([-l for l in modele])
+    solveur.delete()
+    return solutions
+
+def test_deductions_sures():
+    pytest.importorskip('pysat')
+    rng = random.Random(0)
+    for _ in range(300):
+        H, L = rng.randint(1, 5), rng.randint(1, 5)
+        grille = [[rng.choice(CELLULES) for _ in range(L)] for _ in range(H)]
+        solutions = _toutes_les_solutions(grille)
+        etat = deduire(grille)
+        if etat is None:
+            assert not solutions, grille
+            continue
+        index = IndexGrille(grille)
+        for c, valeur in enumerate(etat):
+            if valeur == AMPOULE:
+                assert all(index.position(c) in s for s in solutions), grille
+            elif valeur == INTERDITE:
+                assert all(index.position(c) not in s for s in solutions), grille
+
+def test_deductions_connues():
+    grille = [['.', '#2', '.'],
+              ['.', '#', '.'],
+              ['.', '#0', '.']]
+    index = IndexGrille(grille)
+    etat = deduire(grille, index)
+    assert etat[index.case(0, 0)] == etat[index.case(0, 2)] == AMPOULE
+    assert etat[index.case(2, 0)] == etat[index.case(2, 2)] == INTERDITE
+    var_map, _, _ = encoder(grille, briser_symetries=False, encodage='paires/direct')
+    assert [var_map[(0, 0)]] in clauses_impliquees(grille, var_map)
+    assert [-var_map[(2, 2)]] in clauses_impliquees(grille, var_map)
+
+def test_grille_contradictoire():
+    grille = [['.', '#1', '.']]
+    assert deduire(grille) is None
+    var_map, _, _ = encoder(grille, briser_symetries=False, encodage='paires/direct')
+    assert clauses_impliquees(grille, var_map) == [[]]
@@ -0,0 +1,83 @@
+import asyncio
+import random
+import shutil
+import time
+
+import pytest
+
+from genere_grille import generer_grille_plantee
+from lightup import est_solution
+from resolution_async import SolveurAsync
+
+SAT = [['.', '#2', '.'],
+       ['.', '#', '.'],
+       ['.', '#0', '.']]
+UNSAT = [['.', '#1', '.']]
+
+def _moteurs():
+    moteurs = []
+    try:
+        import pysat  # noqa: F401
+        moteurs.append('pysat')
+    except ImportError:
+        pass
+    if shutil.which('minisat'):
+        moteurs.append('minisat')
+    return moteurs
+
+pytestmark = pytest.mark.parametrize('moteur', _moteurs() or [pytest.param(None, marks=pytest.mark.skip('aucun moteur'))])
+
+def _grande_grille():
+    return generer_grille_plantee(200, 200, rng=random.Random(0))
+
+def test_statuts(moteur):
+    async def scenario():
+        solveur = SolveurAsync(moteur=moteur)
+        return await solveur.resoudre(SAT), await solveur.resoudre(UNSAT)
+    sat, unsat = asyncio.run(scenario())
+    assert sat.statut == 'SAT' and est_solution(SAT, sat.ampoules)
+    assert unsat.statut == 'UNSAT' and unsat.ampoules is None
+
+def test_timeout_couvre_l_encodage(moteur):
+    grille = _grande_grille()
+
+    async def scenario():
+        debut = time.perf_counter()
+        resultat = await SolveurAsync(moteur=moteur).resoudre(grille, timeout=0.01)
+        return resultat, time.perf_counter() - debut
+    resultat, duree = asyncio.run(scenario())
+    assert resultat.statut == 'INCONNU'
+    assert duree < 0.2
+
+def test_annulation(moteur):
+    grille = _grande_grille()
+
+    async def scenario():
+        tache = asyncio.ensure_future(SolveurAsync(moteur=moteur).resoudre(grille))
+        await asyncio.sleep(0.01)
+        tache.cancel()
+        debut = time.perf_counter()
+        with pytest.raises(asyncio.CancelledError):
+            await tache
+        return time.perf_counter() - debut
+    assert asyncio.run(scenario()) < 0.2
+
+def test_flux(moteur):
+    grilles = [SAT, UNSAT] * 4
+
+    async def source():
+        for grille in grilles:
+            yield grille
+
+    async def scenario():
+        solveur = SolveurAsync(concurrence=2, moteur=moteur)
+        tous = {numero: resultat async for numero, resultat in solveur.resoudre_flux(source())}
+        flux = solveur.resoudre_flux(grilles)
+        premier = await flux.__anext__()
+        await flux.aclose()
+        return tous, premier
+    tous, premier = asyncio.run(scenario())
+    assert sorted(tous) == list(range(len(grilles)))
+    for numero, resultat in tous.items():
+        assert resultat.statut == ('SAT' if grilles[numero] is SAT else 'UNSAT')
+    assert premier[0] in range(len(grilles))
@@ -0,0 +1,68 @@
+import json
+
+import pytest
+
+from lightup import selection_encodage
+from lightup.encodages import ENCODAGES
+from lightup.selection_encodage import (CARACTERISTIQUES, Politique, caracteristiques, choisir_encodage, entrainer,
+                                        evaluer, mesurer)
+
+GRILLE = [['.', '.', '.', '.', '.', '#1'],
+          ['.', '#', '.', '.', '.', '.'],
+          ['#0', '.', '.', '.', '.', '.']]
+
+def test_caracteristiques():
+    caract = caracteristiques(GRILLE)
+    assert set(caract) == set(CARACTERISTIQUES)
+    assert caract['cases'] == 18 and caract['densite_murs'] == pytest.approx(3 / 18)
+    assert caract['ratio_chiffres'] == pytest.approx(2 / 3)
+    assert caract['saturation'] == pytest.approx(1 / 4)  # 1 ampoule pour 4 voisins libres
+    assert caract['longueur_max'] == 5 and caract['part_longs'] > 0
+
+def test_politique_par_defaut():
+    encodage, regle = Politique().choisir(caracteristiques(GRILLE))
+    assert encodage in ENCODAGES and 'saturation' in regle
+    assert choisir_encodage(GRILLE) == encodage
+    assert Politique({'encodage': 'paires/direct'}).choisir({}) == ('paires/direct', 'toujours')
+
+def _mesures():
+    """Corpus synthétique: paires/direct gagne sur les petites grilles, sequentiel/segments sur les grandes"""
+    mesures = []
+    for taille in (5, 10, 20, 100, 200, 400):
+        for numero in range(2):
+            caract = dict.fromkeys(CARACTERISTIQUES, 0.5)
+            caract['cases'] = taille * taille
+            petite = taille < 50
+            temps = dict.fromkeys(ENCODAGES, 1.0)
+            temps['paires/direct' if petite else 'sequentiel/segments'] = 0.1
+            mesures.append({'id': f"{taille}-{numero}", 'taille': taille, 'difficulte': 'moyen', 'plantee': False,
+                            'caracteristiques': caract, 'temps': temps})
+    return mesures
+
+def test_entrainer_et_evaluer(tmp_path):
+    mesures = _mesures()
+    politique = entrainer(mesures)
+    assert politique.arbre['caracteristique'] == 'cases'
+    assert politique.choisir({**mesures[0]['caracteristiques'], 'cases': 25})[0] == 'paires/direct'
+    assert politique.choisir({**mesures[0]['caracteristiques'], 'cases': 160000})[0] == 'sequentiel/segments'
+    assert all(ligne['ratio'] == pytest.approx(1.0) for ligne in evaluer(politique, mesures).values())
+
+    nom = str(tmp_path / "politique.json")
+    politique.sauvegarder(nom)
+    assert Politique.charger(nom).arbre == politique.arbre
+    assert politique.decrire()[0].startswith('cases <')
+
+def test_journal(tmp_path, monkeypatch):
+    nom = tmp_path / "journal.jsonl"
+    monkeypatch.setattr(selection_encodage, 'JOURNAL', str(nom))
+    encodage = choisir_encodage(GRILLE)
+    entree = json.loads(nom.read_text())
+    assert entree['encodage'] == encodage and entree['caracteristiques']['cases'] == 18
+
+def test_mesurer():
+    pytest.importorskip('pysat')
+    corpus = [{'id': 0, 'taille': 3, 'difficulte': 'facile', 'grille': [['.', '#1', '.']]},
+              {'id': 1, 'taille': 6, 'difficulte': 'moyen', 'grille': GRILLE}]
+    mesures = mesurer(corpus, moteur='pysat')
+    assert [m['id'] for m in mesures] == [0, 1]
+    assert all(set(m['temps']) == set(ENCODAGES) for m in mesures)
@@ -0,0 +1,55 @@
+import shutil
+import sys
+
+import pytest
+
+from lightup import est_solution
+from solveur_incremental import SolveurIncremental, VerificateurCompletude, grille_puzzle
+
+GRILLE = [['.', '#2', '.'],
+          ['.', '#', '.'],
+          ['.', '#0', '.']]
+
+def _modes():
+    modes = []
+    try:
+        import pysat  # noqa: F401
+        modes.append('pysat')
+    except ImportError:
+        pass
+    if shutil.which('minisat'):
+        modes.append('minisat')
+    return modes or [pytest.param(None, marks=pytest.mark.skip('aucun solveur'))]
+
+@pytest.fixture(params=_modes())
+def mode(request, monkeypatch):
+    if request.param == 'minisat':
+        monkeypatch.setitem(sys.modules, 'pysat.solvers', None)  # Sans pysat: MiniSAT en ligne de commande
+    return request.param
+
+def test_hypotheses(mode):
+    with SolveurIncremental([[1, 2], [-1, 3]]) as solveur:
+        assert solveur.incremental == (mode == 'pysat')
+        assert solveur.resoudre() is True
+        assert solveur.resoudre([1, -3]) is False and set(solveur.noyau()) <= {1, -3}
+        assert solveur.resoudre([-2]) is True and 1 in solveur.modele() and 3 in solveur.modele()
+        activation = solveur.nouvelle_variable()
+        assert activation == 4
+        solveur.ajouter_clause([-activation, -1])
+        assert solveur.resoudre([activation, -2]) is False
+        assert solveur.resoudre([-activation, -2]) is True
+
+def test_completude(mode):
+    verificateur = VerificateurCompletude(GRILLE)
+    assert verificateur.verifier([(0, 0)]) == (True, [])
+    assert est_solution(GRILLE, verificateur.solution())
+    completable, echecs = verificateur.verifier([(1, 0)])
+    assert completable is False and ('ampoule', (1, 0)) in echecs
+    assert verificateur.verifier([], sans_ampoule=[(0, 2)])[0] is False
+    assert verificateur.verifier([(0, 1)]) == (False, [('ampoule', (0, 1))])  # Un mur
+
+def test_grille_puzzle():
+    assert grille_puzzle([['A', '#1', '*'], ['.', '#', '.']]) == [['.', '#1', '.'], ['.', '#', '.']]
+
+def test_grille_impossible():
+    assert VerificateurCompletude([['#3', '.']]).verifier([]) == (False, [])
@@ -0,0 +1,79 @@
+import random
+import shutil
+
+import pytest
+
+from genere_grille import generer_grille_plantee
+from lightup import est_solution
+from lightup.encodages import ENCODAGES
+from lightup.solveurs import ResultatSolveur, analyser_stats_minisat, lire_modele, moteur_par_defaut, resoudre
+
+SAT = [['.', '#2', '.'],
+       ['.', '#', '.'],
+       ['.', '#0', '.']]
+UNSAT = [['.', '.', '.'],
+         ['.', '#1', '.'],
+         ['.', '.', '.']]
+
+SORTIE_MINISAT = """restarts              : 3
+conflicts             : 120            (1200 /sec)
+decisions             : 456            (0.00 % random) (4560 /sec)
+propagations          : 7890           (78900 /sec)
+Memory used           : 11.5 MB
+CPU time              : 0.1 s
+
+SATISFIABLE
+"""
+
+def _moteurs():
+    moteurs = []
+    try:
+        import pysat  # noqa: F401
+        moteurs.append('pysat')
+    except ImportError:
+        pass
+    if shutil.which('minisat'):
+        moteurs.append('minisat')
+    return moteurs or [pytest.param(None, marks=pytest.mark.skip('aucun moteur'))]
+
+@pytest.mark.parametrize('moteur', _moteurs())
+@pytest.mark.parametrize('encodage', ('auto',) + ENCODAGES)
+def test_statuts(moteur, encodage):
+    sat = resoudre(SAT, moteur, encodage=encodage)
+    assert sat.statut == 'SAT' and est_solution(SAT, sat.ampoules)
+    assert sat.encodage in ENCODAGES and (encodage == 'auto' or sat.encodage == encodage)
+    unsat = resoudre(UNSAT, moteur, encodage=encodage)
+    assert unsat.statut == 'UNSAT' and unsat.ampoules is None
+
+@pytest.mark.parametrize('moteur', _moteurs())
+def test_grille_plantee(moteur):
+    grille = generer_grille_plantee(40, 40, rng=random.Random(0))
+    resultat = resoudre(grille, moteur, renforcer=True)
+    assert resultat.statut == 'SAT' and est_solution(grille, resultat.ampoules)
+    assert resultat.temps > 0
+
+def test_mur_impossible():
+    resultat = resoudre([['#3', '.'], ['.', '#']], 'pysat')
+    assert resultat.statut == 'UNSAT' and resultat.ampoules is None
+
+def test_moteur_par_defaut():
+    assert moteur_par_defaut() == ('minisat' if shutil.which('minisat') else 'pysat')
+
+def test_analyser_stats_minisat():
+    assert analyser_stats_minisat(SORTIE_MINISAT) == {'redemarrages': 3, 'conflits': 120, 'decisions': 456,
+                                                      'propagations': 7890, 'temps_cpu': 0.1, 'memoire_mo': 11.5}
+
+@pytest.mark.parametrize('contenu, attendu', [
+    ("SAT\n1 -2 3 0\n", ('SAT', [1, -2, 3])),
+    ("UNSAT\n", ('UNSAT', None)),
+    ("INDET\n", ('INCONNU', None)),
+    ("", ('INCONNU', None)),
+])
+def test_lire_modele(tmp_path, contenu, attendu):
+    nom = tmp_path / "solution.txt"
+    nom.write_text(contenu)
+    assert lire_modele(nom) == attendu
+
+def test_resultat_vers_dict():
+    resultat = ResultatSolveur('SAT', [1, -2], {'conflits': 4}, temps=0.5)
+    assert resultat.vers_dict() == {'statut': 'SAT', 'temps': 0.5, 'conflits': 4}
@@ -0,0 +1,59 @@
+import random
+
+import pytest
+
+from lightup.encodage import ampoules_du_modele, encoder
+from lightup.grille_compacte import GrilleCompacte
+from lightup.symetries import clauses_symetries, detecter_symetries, transformations
+
+CELLULES = ['.'] * 10 + ['#', '#0', '#1', '#2', '#3', '#4']
+
+def _grille_symetrique(rng, n):
+    """Grille n x n invariante par rotation de 90° (donc aussi de 180°)"""
+    grille = [['.'] * n for _ in range(n)]
+    for i in range(n):
+        for j in range(n):
+            if (i, j) <= min((j, n - 1 - i), (n - 1 - i, n - 1 - j), (n - 1 - j, i)):
+                cellule = rng.choice(CELLULES)
+                for a, b in ((i, j), (j, n - 1 - i), (n - 1 - i, n - 1 - j), (n - 1 - j, i)):
+                    grille[a][b] = cellule
+    return grille
+
+def _solutions(var_map, clauses):
+    from lightup.solveurs import creer_pysat
+    solveur = creer_pysat(clauses)
+    solutions = set()
+    while solveur.solve():
+        modele = solveur.get_model()
+        solutions.add(frozenset(ampoules_du_modele(modele, var_map)))
+        solveur.add_clause([-l for l in modele if abs(l) in var_map.values()])
+    solveur.delete()
+    return solutions
+
+def test_detection():
+    grille = [['.', '#1', '.'],
+              ['#', '.', '#'],
+              ['.', '#1', '.']]
+    assert set(detecter_symetries(grille)) == {'rotation180', 'miroir_horizontal', 'miroir_vertical'}
+    assert set(detecter_symetries(GrilleCompacte.depuis_liste(grille))) == set(detecter_symetries(grille))
+    assert set(detecter_symetries([['.', '#1'], ['.', '.']])) == {'antitransposition'}
+    assert transformations(2, 2)['antitransposition'][1](0, 1) == (0, 1)
+    assert detecter_symetries([['.', '#1', '#'], ['.', '.', '.']]) == {}
+
+def test_un_representant_par_classe():
+    pytest.importorskip('pysat')
+    rng = random.Random(0)
+    for _ in range(60):
+        grille = _grille_symetrique(rng, rng.randint(2, 4))
+        symetries = detecter_symetries(grille)
+        assert {'rotation90', 'rotation180', 'rotation270'} <= set(symetries)
+        var_map, clauses, nb_vars = encoder(grille, briser_symetries=False, encodage='paires/direct')
+        if var_map is None:
+            continue
+        toutes = _solutions(var_map, clauses)
+        symetriques, _ = clauses_symetries(grille, var_map, symetries, premiere_aux=nb_vars + 1)
+        gardees = _solutions(var_map, clauses + symetriques)
+        assert gardees <= toutes and bool(gardees) == bool(toutes), grille
+        for solution in toutes:
+            classe = {solution} | {frozenset(image(i, j) for i, j in solution) for image in symetries.values()}
+            assert classe & gardees, grille
@@ -0,0 +1,46 @@
+import random
+
+import pytest
+
+from lightup.grille_compacte import GrilleCompacte
+from lightup.verification import grille_avec_ampoules, lister_erreurs_solution
+
+np = pytest.importorskip('numpy')
+from lightup.verificateur_numpy import lister_erreurs_numpy, verifier_lot, verifier_solution_numpy  # noqa: E402
+
+CELLULES = ['.'] * 8 + ['#', '#0', '#1', '#2', '#3', '#4']
+
+def _solutions_aleatoires(nombre, H, L, graine):
+    """Grilles avec des ampoules tirées au hasard: valides ou non"""
+    rng = random.Random(graine)
+    for _ in range(nombre):
+        grille = [[rng.choice(CELLULES) for _ in range(L)] for _ in range(H)]
+        ampoules = [(i, j) for i in range(H) for j in range(L) if grille[i][j] == '.' and rng.random() < 0.3]
+        yield grille_avec_ampoules(grille, ampoules)
+
+def test_meme_resultat_que_le_verificateur_python():
+    for solution in _solutions_aleatoires(200, 5, 6, 0):
+        attendu = sorted(lister_erreurs_solution(solution))
+        assert sorted(lister_erreurs_numpy(solution)) == attendu
+        assert sorted(lister_erreurs_numpy(solution.vers_liste(eclairage=True))) == attendu
+
+def test_solution_connue():
+    solution = [['A', '#2', 'A'],
+                ['*', '#', '*'],
+                ['*', '#0', '*']]
+    assert verifier_solution_numpy(solution) == (True, [])
+    assert verifier_solution_numpy(GrilleCompacte.depuis_liste(solution)) == (True, [])
+
+def test_lot():
+    solutions = list(_solutions_aleatoires(50, 4, 4, 1))
+    solutions.append(GrilleCompacte.depuis_liste([['A', '#1', '#', 'A'],
+                                                  ['#1', '#', '#', '#'],
+                                                  ['#', '.', 'A', '#'],
+                                                  ['#', '#', '#', '#']]))
+    valides, nombres = verifier_lot(solutions)
+    assert valides.shape == (len(solutions),) and valides[-1]
+    for k, solution in enumerate(solutions):
+        erreurs = lister_erreurs_solution(solution)
+        assert valides[k] == (not erreurs)
+        assert nombres['mur_chiffre'][k] == sum(1 for e in erreurs if e[0] == 'mur_chiffre')
+        assert nombres['non_eclairee'][k] == sum(1 for e in erreurs if e[0] == 'non_eclairee')
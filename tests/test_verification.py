@@ -0,0 +1,43 @@
+import pytest
+
+from lightup.grille_compacte import GrilleCompacte
+from lightup.verification import (decrire_erreur, est_solution, grille_avec_ampoules, lister_erreurs,
+                                  lister_erreurs_solution)
+
+GRILLE = [['.', '#2', '.'],
+          ['.', '#', '.'],
+          ['.', '#0', '.']]
+AMPOULES = [(0, 0), (0, 2)]
+
+def test_solution_valide():
+    assert est_solution(GRILLE, AMPOULES)
+    assert est_solution(GrilleCompacte.depuis_liste(GRILLE), AMPOULES)
+    assert lister_erreurs(GRILLE, AMPOULES) == []
+
+def test_categories_d_erreurs():
+    erreurs = lister_erreurs(GRILLE, [(0, 0), (2, 0)])
+    assert ('ampoules_alignees', (0, 0), (2, 0)) in erreurs
+    assert ('ampoules_alignees', (2, 0), (0, 0)) in erreurs
+    assert ('mur_chiffre', (0, 1), 2, 1) in erreurs
+    assert ('mur_chiffre', (2, 1), 0, 1) in erreurs
+    assert {('non_eclairee', (i, 2)) for i in range(3)} <= set(erreurs)
+
+def test_grille_solution_texte():
+    # Format de interpreter_solution: l'éclairage est lu tel quel (' ' = non éclairée)
+    solution = [['A', '#2', 'A'],
+                ['*', '#', ' '],
+                ['*', '#0', '*']]
+    assert lister_erreurs_solution(solution) == [('non_eclairee', (1, 2))]
+
+def test_grille_avec_ampoules_ne_modifie_pas_l_originale():
+    compacte = GrilleCompacte.depuis_liste(GRILLE)
+    solution = grille_avec_ampoules(compacte, AMPOULES)
+    assert solution.ampoules() == [0, 2] and compacte.ampoules() == []
+
+@pytest.mark.parametrize('erreur, message', [
+    (('non_eclairee', (1, 2)), "Case (1,2) non éclairée"),
+    (('ampoules_alignees', (0, 0), (2, 0)), "Ampoules (0,0) et (2,0) s'éclairent mutuellement"),
+    (('mur_chiffre', (0, 1), 2, 1), "Mur (0,1) avec chiffre 2 a 1 ampoules adjacentes"),
+])
+def test_decrire_erreur(erreur, message):
+    assert decrire_erreur(erreur) == message